@@ -0,0 +1,322 @@
+"""
+Aggregate analytics over tournament logs and session histories.
+
+Reads any number of tournament_log.json files, legacy session_history.json files and
+session_history.db stores (files, folders or glob patterns) and reports per-photo win
+rates, position bias and the decision-time distribution.
+
+JSON files are parsed one match/session at a time from fixed-size chunks, and the counters
+are NumPy arrays updated per batch, so memory stays bounded by the number of distinct
+photos and the batch size, not by the size of the logs.
+
+    python -m src.analytics ~/photos/logs session_history.db
+    python -m src.analytics "logs/**/*.json" --top 50 --json
+"""
+import argparse
+import glob
+import json
+import os
+import re
+
+import numpy as np
+
+from src.session_store import SessionStore
+
+CHUNK_SIZE = 1 << 20    # Bytes read from a JSON file at a time
+BATCH_SIZE = 1 << 16    # Matches buffered before the NumPy counters are updated
+MAX_CHOICES = 4
+# Decision-time histogram: log-spaced bins from 50 ms to 10 min, plus under/overflow bins
+TIME_BINS = np.concatenate(([0.0], np.logspace(np.log10(0.05), np.log10(600.0), 60), [np.inf]))
+
+_WS = re.compile(r"[\s,]*")
+_SCALAR_END = frozenset(", ]\t\n\r")
+
+
+def iter_json_array(f, key=None, chunk_size=CHUNK_SIZE):
+    """
+    Yields the items of a JSON array one by one without loading the file.
+    With key, the array is the value of that key (e.g. "matches" of a tournament log),
+    otherwise the file itself must be an array.
+    """
+    decoder = json.JSONDecoder()
+    buf = f.read(chunk_size)
+    eof = not buf
+    start = re.compile(r'"%s"\s*:\s*\[' % re.escape(key)) if key else re.compile(r"\s*\[")
+    while True:
+        m = start.search(buf) if key else start.match(buf)
+        if m:
+            pos = m.end()
+            break
+        if eof or not key:
+            return
+        # Keep a tail in case the key is split between chunks
+        more = f.read(chunk_size)
+        eof = not more
+        buf = buf[-len(key) - 16:] + more
+    while True:
+        pos = _WS.match(buf, pos).end()
+        if pos < len(buf) and buf[pos] == "]":
+            return
+        try:
+            if pos >= len(buf):
+                raise ValueError
+            item, end = decoder.raw_decode(buf, pos)
+            if not eof and not isinstance(item, (dict, list, str)) and (end == len(buf) or buf[end] not in _SCALAR_END):
+                raise ValueError  # A number or literal cut by the chunk ("1." of "1.5") continues in the next one
+        except ValueError:
+            if eof:
+                if pos >= len(buf):
+                    return
+                raise
+            more = f.read(chunk_size)
+            eof = not more
+            buf = buf[pos:] + more
+            pos = 0
+            continue
+        yield item
+        pos = end
+        if pos > chunk_size:
+            buf, pos = buf[pos:], 0
+
+
+class LogAnalyzer:
+    """
+    Accumulates statistics over matches and sessions.
+    Matches are buffered as integer ids and flushed into the counters with np.bincount /
+    np.histogram, so adding a match is a few list appends.
+    """
+
+    def __init__(self, batch_size=BATCH_SIZE):
+        self.batch_size = batch_size
+        self.photo_ids = {}
+        self.photos = []
+        self.appearances = np.zeros(0, dtype=np.int64)
+        self.wins = np.zeros(0, dtype=np.int64)
+        # positions[k - 1, i]: matches with k photos won by the photo at position i
+        self.positions = np.zeros((MAX_CHOICES, MAX_CHOICES), dtype=np.int64)
+        self.time_hist = np.zeros(len(TIME_BINS) - 1, dtype=np.int64)
+        self.time_sum = 0.0
+        self.time_sq_sum = 0.0
+        self.time_min = np.inf
+        self.time_max = 0.0
+        self.selection_counts = {}
+        self.num_matches = 0
+        self.num_sessions = 0
+        self.num_undos = 0
+        self.files = 0
+        self._appear_buf = []
+        self._win_buf = []
+        self._pos_buf = []
+        self._time_buf = []
+
+    def _photo_id(self, photo):
+        pid = self.photo_ids.get(photo)
+        if pid is None:
+            pid = self.photo_ids[photo] = len(self.photos)
+            self.photos.append(photo)
+        return pid
+
+    def add_match(self, entry):
+        choices = entry.get("choices") or []
+        winner = entry.get("winner")
+        for photo in choices:
+            self._appear_buf.append(self._photo_id(photo))
+        if winner is not None:
+            self._win_buf.append(self._photo_id(winner))
+            if not choices:
+                self._appear_buf.append(self.photo_ids[winner])
+            elif 2 <= len(choices) <= MAX_CHOICES and winner in choices:
+                self._pos_buf.append((len(choices) - 1) * MAX_CHOICES + choices.index(winner))
+        t = entry.get("decision_time")
+        if isinstance(t, (int, float)):
+            self._time_buf.append(t)
+        self.num_matches += 1
+        if len(self._appear_buf) >= self.batch_size:
+            self.flush()
+
+    def add_session(self, session):
+        self.num_sessions += 1
+        stats = session.get("stats") or {}
+        self.num_undos += stats.get("num_undos", 0) or 0
+        for key, count in (stats.get("selection_counts") or {}).items():
+            self.selection_counts[key] = self.selection_counts.get(key, 0) + count
+        for entry in session.get("match_log") or []:
+            self.add_match(entry)
+
+    def flush(self):
+        n = len(self.photos)
+        if len(self.appearances) < n:
+            grow = n - len(self.appearances)
+            self.appearances = np.concatenate((self.appearances, np.zeros(grow, dtype=np.int64)))
+            self.wins = np.concatenate((self.wins, np.zeros(grow, dtype=np.int64)))
+        if self._appear_buf:
+            self.appearances += np.bincount(np.asarray(self._appear_buf, dtype=np.int64), minlength=n)
+        if self._win_buf:
+            self.wins += np.bincount(np.asarray(self._win_buf, dtype=np.int64), minlength=n)
+        if self._pos_buf:
+            counts = np.bincount(np.asarray(self._pos_buf, dtype=np.int64), minlength=MAX_CHOICES * MAX_CHOICES)
+            self.positions += counts.reshape(MAX_CHOICES, MAX_CHOICES)
+        if self._time_buf:
+            times = np.asarray(self._time_buf, dtype=np.float64)
+            times = times[np.isfinite(times) & (times >= 0)]
+            if len(times):
+                self.time_hist += np.histogram(times, bins=TIME_BINS)[0]
+                self.time_sum += float(times.sum())
+                self.time_sq_sum += float(np.dot(times, times))
+                self.time_min = min(self.time_min, float(times.min()))
+                self.time_max = max(self.time_max, float(times.max()))
+        self._appear_buf, self._win_buf, self._pos_buf, self._time_buf = [], [], [], []
+
+    # --- Inputs ---
+
+    def add_path(self, path):
+        """
+        Adds a tournament log, a legacy JSON session history or a SQLite session store
+        (opened read-only).
+        """
+        if path.endswith(".db"):
+            store = SessionStore(path, read_only=True)
+            try:
+                for session in store.sessions(with_payload=True):
+                    self.add_session(session)
+            finally:
+                store.close()
+        else:
+            with open(path, "r", encoding="utf-8") as f:
+                first = f.read(1)
+                while first and first.isspace():
+                    first = f.read(1)
+                f.seek(0)
+                if first == "[":
+                    for session in iter_json_array(f):
+                        self.add_session(session)
+                elif first == "{":
+                    for entry in iter_json_array(f, "matches"):
+                        self.add_match(entry)
+        self.files += 1
+
+    # --- Report ---
+
+    def time_percentile(self, q):
+        """
+        Decision-time percentile estimated from the histogram (linear within the bin).
+        """
+        total = self.time_hist.sum()
+        if not total:
+            return 0.0
+        cumulative = np.cumsum(self.time_hist)
+        target = q / 100.0 * total
+        idx = int(np.searchsorted(cumulative, target))
+        below = cumulative[idx - 1] if idx else 0
+        lo = max(TIME_BINS[idx], self.time_min)
+        hi = min(TIME_BINS[idx + 1], self.time_max)
+        return float(lo + (hi - lo) * (target - below) / self.time_hist[idx])
+
+    def summary(self, top=20, min_appearances=1):
+        self.flush()
+        apps = self.appearances
+        rates = np.divide(self.wins, apps, out=np.zeros(len(apps)), where=apps > 0)
+        eligible = np.flatnonzero(apps >= max(1, min_appearances))
+        # Best win rate first, more appearances breaking ties
+        order = eligible[np.lexsort((-apps[eligible], -rates[eligible]))][:top]
+        position_bias = {}
+        for k in range(2, MAX_CHOICES + 1):
+            row = self.positions[k - 1, :k]
+            total = int(row.sum())
+            if total:
+                position_bias[str(k)] = {
+                    "matches": total,
+                    "share": [round(float(c) / total, 4) for c in row],
+                    # Chi-square statistic against uniform 1/k choice
+                    "chi2": round(float(((row - total / k) ** 2 / (total / k)).sum()), 2),
+                }
+        timed = int(self.time_hist.sum())
+        mean = self.time_sum / timed if timed else 0.0
+        return {
+            "files": self.files,
+            "sessions": self.num_sessions,
+            "matches": self.num_matches,
+            "photos": len(self.photos),
+            "undos": self.num_undos,
+            "top_photos": [
+                {"photo": self.photos[i], "wins": int(self.wins[i]), "appearances": int(apps[i]), "win_rate": round(float(rates[i]), 4)}
+                for i in order
+            ],
+            "position_bias": position_bias,
+            "selection_counts": self.selection_counts,
+            "decision_time": {
+                "count": timed,
+                "mean": round(mean, 3),
+                "std": round(float(np.sqrt(max(0.0, self.time_sq_sum / timed - mean * mean))), 3) if timed else 0.0,
+                "min": round(self.time_min, 3) if timed else 0.0,
+                "p50": round(self.time_percentile(50), 3),
+                "p90": round(self.time_percentile(90), 3),
+                "p99": round(self.time_percentile(99), 3),
+                "max": round(self.time_max, 3),
+            },
+        }
+
+
+def expand_paths(patterns):
+    """
+    Expands files, folders (searched recursively for .json/.db) and glob patterns.
+    """
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            for dirpath, _, filenames in os.walk(pattern):
+                paths.extend(os.path.join(dirpath, name) for name in sorted(filenames) if name.endswith((".json", ".db")))
+        elif os.path.exists(pattern):
+            paths.append(pattern)
+        else:
+            matches = sorted(glob.glob(pattern, recursive=True))
+            if not matches:
+                print(f"Skipping '{pattern}': no such file or folder")
+            paths.extend(matches)
+    return list(dict.fromkeys(paths))
+
+
+def print_summary(s):
+    print(f"{s['files']} files, {s['sessions']} sessions, {s['matches']} matches, {s['photos']} photos, {s['undos']} undos")
+    t = s["decision_time"]
+    print(f"\nDecision time ({t['count']} timed): mean {t['mean']:.2f}s, std {t['std']:.2f}s, "
+          f"p50 {t['p50']:.2f}s, p90 {t['p90']:.2f}s, p99 {t['p99']:.2f}s, max {t['max']:.2f}s")
+    if s["position_bias"]:
+        print("\nPosition bias (share of wins by position):")
+        for k, b in s["position_bias"].items():
+            shares = "  ".join(f"{share:.1%}" for share in b["share"])
+            print(f"  {k} choices, {b['matches']} matches: {shares}  (chi2 {b['chi2']})")
+    if s["selection_counts"]:
+        print("Selection keys: " + ", ".join(f"{k}={v}" for k, v in s["selection_counts"].items()))
+    if s["top_photos"]:
+        print("\nTop photos by win rate:")
+        for i, p in enumerate(s["top_photos"], 1):
+            print(f"{i:>4}. {p['win_rate']:.1%} ({p['wins']}/{p['appearances']})  {p['photo']}")
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Aggregate statistics over tournament logs and session histories.")
+    p.add_argument("paths", nargs="+", help="Log files, folders or glob patterns (.json logs/histories, .db stores).")
+    p.add_argument("--top", type=int, default=20, help="Number of photos in the win-rate table.")
+    p.add_argument("--min-appearances", type=int, default=1, help="Ignore photos that appeared fewer times.")
+    p.add_argument("--json", action="store_true", help="Print the summary as compact JSON.")
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    analyzer = LogAnalyzer()
+    for path in expand_paths(args.paths):
+        try:
+            analyzer.add_path(path)
+        except Exception as e:
+            print(f"Skipping '{path}': {e}")
+    summary = analyzer.summary(top=args.top, min_appearances=args.min_appearances)
+    if args.json:
+        print(json.dumps(summary, ensure_ascii=False, separators=(",", ":")))
+    else:
+        print_summary(summary)
+
+
+if __name__ == "__main__":
+    main()
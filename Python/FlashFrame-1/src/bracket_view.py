@@ -0,0 +1,295 @@
+import os
+import tkinter as tk
+from collections import OrderedDict
+from PIL import Image, ImageTk
+
+THUMB_SIZE = 40          # Thumbnail edge in the bracket nodes (px)
+THUMB_CACHE_SIZE = 512   # Thumbnails kept in memory besides the ones on screen
+COLUMN_WIDTH = 230
+ROW_HEIGHT = 64
+HEADER_HEIGHT = 24
+NODE_PADDING = 6
+
+
+class ThumbnailCache:
+    """
+    LRU cache of small PhotoImages. JPEGs are decoded with draft(), so a thumbnail never
+    needs the full-resolution image in memory.
+    """
+
+    def __init__(self, size=THUMB_SIZE, capacity=THUMB_CACHE_SIZE):
+        self.size = size
+        self.capacity = capacity
+        self.images = OrderedDict()
+
+    def get(self, path):
+        photo = self.images.get(path)
+        if photo is not None:
+            self.images.move_to_end(path)
+            return photo
+        try:
+            with Image.open(path) as img:
+                img.draft("RGB", (self.size, self.size))
+                img.thumbnail((self.size, self.size))
+                photo = ImageTk.PhotoImage(img)
+        except Exception as e:
+            print(f"Thumbnail error for '{path}': {e}")
+            return None
+        self.images[path] = photo
+        if len(self.images) > self.capacity:
+            self.images.popitem(last=False)
+        return photo
+
+
+class BracketView(tk.Frame):
+    """
+    Graphical tournament tree on a scrollable canvas.
+    Every (bracket section, round) is a column and every match a node in it, so a node's
+    position is known without any layout pass. Only the nodes inside the visible region
+    are drawn; add_match() and truncate() update the view as decisions are made or undone.
+    Strategies with a bracket() are shown with show_bracket() instead: pending matches
+    included and every winner linked to its next match.
+    """
+
+    def __init__(self, parent, thumbnails=None, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.thumbnails = thumbnails or ThumbnailCache()
+        self.columns = []        # Matches per column
+        self.column_titles = []
+        self.column_keys = []
+        self.column_index = {}   # (section, round) -> column
+        self.order = []          # (column, row) of every match in the order they were added
+        self.drawn = {}          # (column, row) -> (canvas item ids, PhotoImages on screen)
+        self.drawn_headers = {}  # column -> canvas item id
+        self.max_rows = 0
+        self.links = False       # Bracket mode: winners are linked to their match in the next round
+        self.player_rows = []    # Bracket mode: per column, photo -> row of its match
+
+        self.canvas = tk.Canvas(self, background="white", highlightthickness=0)
+        xbar = tk.Scrollbar(self, orient=tk.HORIZONTAL, command=self._xview)
+        ybar = tk.Scrollbar(self, orient=tk.VERTICAL, command=self._yview)
+        self.canvas.configure(xscrollcommand=xbar.set, yscrollcommand=ybar.set)
+        self.canvas.grid(row=0, column=0, sticky="nsew")
+        ybar.grid(row=0, column=1, sticky="ns")
+        xbar.grid(row=1, column=0, sticky="ew")
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        self.canvas.bind("<Configure>", lambda e: self.refresh())
+        self.canvas.bind("<MouseWheel>", self._on_wheel)
+        self.canvas.bind("<Shift-MouseWheel>", lambda e: self._xview("scroll", -1 if e.delta > 0 else 1, "units"))
+        self.canvas.bind("<Button-4>", lambda e: self._yview("scroll", -1, "units"))
+        self.canvas.bind("<Button-5>", lambda e: self._yview("scroll", 1, "units"))
+
+    # --- Model ---
+
+    def add_match(self, entry, draw=True):
+        """
+        Appends one match_log entry; draws it only if it is in the visible region.
+        """
+        key = (entry.get("bracket") or "", entry["round"])
+        col = self.column_index.get(key)
+        if col is None:
+            col = self.column_index[key] = len(self.columns)
+            self.columns.append([])
+            self.column_keys.append(key)
+            self.column_titles.append(self._column_title(key))
+        row = len(self.columns[col])
+        self.columns[col].append(entry)
+        self.order.append((col, row))
+        if row + 1 > self.max_rows:
+            self.max_rows = row + 1
+        if not draw:
+            return
+        self._update_scrollregion()
+        if self._is_visible(col, row):
+            self._draw_node(col, row)
+            self._draw_header(col)
+
+    def truncate(self, count):
+        """
+        Removes the matches after the first `count` (used after an undo).
+        """
+        while len(self.order) > count:
+            col, row = self.order.pop()
+            self.columns[col].pop()
+            self._erase_node((col, row))
+            if not self.columns[col] and col == len(self.columns) - 1:
+                self.columns.pop()
+                del self.column_index[self.column_keys.pop()]
+                self.column_titles.pop()
+                header = self.drawn_headers.pop(col, None)
+                if header is not None:
+                    self.canvas.delete(header)
+        self.max_rows = max((len(c) for c in self.columns), default=0)
+        self._update_scrollregion()
+
+    def show_bracket(self, bracket):
+        """
+        Shows a strategy's bracket(): {section: [[{"players": [...], "winner": w}, ...] per round]},
+        with w None for pending matches. Meant to be called again after every decision or undo:
+        while the rounds stay the same only the columns that changed (and the column linking
+        into them) are redrawn; when a round starts or is undone the view is rebuilt.
+        """
+        keys, columns = [], []
+        for section, rounds in bracket.items():
+            for rnd, matches in enumerate(rounds, 1):
+                keys.append((section, rnd))
+                columns.append([{"choices": m["players"], "winner": m["winner"], "bracket": section, "round": rnd}
+                                for m in matches])
+        if keys != self.column_keys:
+            self.clear()
+            self.column_keys = keys
+            self.column_index = {key: col for col, key in enumerate(keys)}
+            self.column_titles = [self._column_title(key) for key in keys]
+            stale = set()
+        else:
+            stale = set()
+            for col, (old, new) in enumerate(zip(self.columns, columns)):
+                if old != new:
+                    stale.update((col - 1, col))
+        self.links = True
+        self.columns = columns
+        self.player_rows = [{path: row for row, entry in enumerate(col) for path in entry["choices"]} for col in columns]
+        self.max_rows = max((len(c) for c in columns), default=0)
+        for key in [k for k in self.drawn if k[0] in stale]:
+            self._erase_node(key)
+        self._update_scrollregion()
+        self.refresh()
+
+    def clear(self):
+        """
+        Removes every match and everything drawn.
+        """
+        self.canvas.delete("all")
+        self.columns, self.column_titles, self.column_keys = [], [], []
+        self.column_index, self.drawn, self.drawn_headers = {}, {}, {}
+        self.order, self.player_rows = [], []
+        self.max_rows = 0
+        self.links = False
+
+    def load(self, entries):
+        """
+        Adds a whole match log at once and draws the visible part once.
+        """
+        for entry in entries:
+            self.add_match(entry, draw=False)
+        self._update_scrollregion()
+        self.refresh()
+
+    # --- Viewport ---
+
+    def _xview(self, *args):
+        self.canvas.xview(*args)
+        self.refresh()
+
+    def _yview(self, *args):
+        self.canvas.yview(*args)
+        self.refresh()
+
+    def _on_wheel(self, event):
+        self._yview("scroll", -1 if event.delta > 0 else 1, "units")
+
+    def _visible_range(self):
+        x0 = self.canvas.canvasx(0)
+        y0 = self.canvas.canvasy(0)
+        x1 = x0 + self.canvas.winfo_width()
+        y1 = y0 + self.canvas.winfo_height()
+        cols = range(max(0, int(x0 // COLUMN_WIDTH)), int(x1 // COLUMN_WIDTH) + 1)
+        rows = range(max(0, int((y0 - HEADER_HEIGHT) // ROW_HEIGHT)), int((y1 - HEADER_HEIGHT) // ROW_HEIGHT) + 1)
+        return cols, rows
+
+    def _is_visible(self, col, row):
+        cols, rows = self._visible_range()
+        return col in cols and row in rows
+
+    def refresh(self):
+        """
+        Draws the nodes that came into view and deletes the ones that left it.
+        """
+        cols, rows = self._visible_range()
+        for key in [k for k in self.drawn if k[0] not in cols or k[1] not in rows]:
+            self._erase_node(key)
+        for col in [c for c in self.drawn_headers if c not in cols]:
+            self.canvas.delete(self.drawn_headers.pop(col))
+        for col in cols:
+            if col >= len(self.columns):
+                break
+            self._draw_header(col)
+            for row in rows:
+                if row >= len(self.columns[col]):
+                    break
+                if (col, row) not in self.drawn:
+                    self._draw_node(col, row)
+
+    def _update_scrollregion(self):
+        width = max(1, len(self.columns)) * COLUMN_WIDTH
+        height = HEADER_HEIGHT + max(1, self.max_rows) * ROW_HEIGHT
+        self.canvas.configure(scrollregion=(0, 0, width, height))
+
+    # --- Drawing ---
+
+    def _column_title(self, key):
+        section = f"{key[0]} " if key[0] else ""
+        return f"{section}Round {key[1]}"
+
+    def _draw_header(self, col):
+        if col in self.drawn_headers:
+            return
+        self.drawn_headers[col] = self.canvas.create_text(
+            col * COLUMN_WIDTH + NODE_PADDING, 4, anchor="nw",
+            text=self.column_titles[col], font=("Arial", 10, "bold"))
+
+    def _draw_node(self, col, row):
+        entry = self.columns[col][row]
+        x = col * COLUMN_WIDTH + NODE_PADDING
+        y = HEADER_HEIGHT + row * ROW_HEIGHT + NODE_PADDING // 2
+        items, photos = [], []
+        pending = entry["winner"] is None
+        items.append(self.canvas.create_rectangle(
+            x, y, x + COLUMN_WIDTH - 2 * NODE_PADDING, y + ROW_HEIGHT - NODE_PADDING,
+            outline="#999999", fill="white" if pending else "#f4f4f4", dash=(3, 2) if pending else None))
+        choices = entry.get("choices") or [entry["winner"]]
+        tx = x + 3
+        for path in choices[:4]:
+            photo = self.thumbnails.get(path)
+            cy = y + (ROW_HEIGHT - NODE_PADDING) // 2
+            if photo is not None:
+                photos.append(photo)
+                items.append(self.canvas.create_image(tx, cy, anchor="w", image=photo))
+            if path == entry["winner"]:
+                items.append(self.canvas.create_rectangle(
+                    tx - 2, cy - THUMB_SIZE // 2 - 2, tx + THUMB_SIZE + 2, cy + THUMB_SIZE // 2 + 2,
+                    outline="#2e8b57", width=2))
+            tx += THUMB_SIZE + 4
+        if len(choices) <= 2:
+            items.append(self.canvas.create_text(
+                tx + 2, y + 4, anchor="nw", width=COLUMN_WIDTH - (tx - x) - 2 * NODE_PADDING,
+                text="Pending" if pending else os.path.basename(entry["winner"]), font=("Arial", 8)))
+        if self.links and not pending:
+            items.extend(self._draw_link(col, y, entry))
+        # The PhotoImages are kept with the node: the LRU may drop them while they are on screen
+        self.drawn[(col, row)] = (items, photos)
+
+    def _draw_link(self, col, y, entry):
+        """
+        Line from a match to the match its winner plays next in the same section.
+        """
+        nxt = self.column_index.get((entry["bracket"], entry["round"] + 1))
+        if nxt is None:
+            return []
+        row = self.player_rows[nxt].get(entry["winner"])
+        if row is None:
+            return []
+        x0 = (col + 1) * COLUMN_WIDTH - NODE_PADDING
+        x1 = nxt * COLUMN_WIDTH + NODE_PADDING
+        y0 = y + (ROW_HEIGHT - NODE_PADDING) // 2
+        y1 = HEADER_HEIGHT + row * ROW_HEIGHT + NODE_PADDING // 2 + (ROW_HEIGHT - NODE_PADDING) // 2
+        xm = (x0 + x1) // 2
+        return [self.canvas.create_line(x0, y0, xm, y0, xm, y1, x1, y1, fill="#2e8b57")]
+
+    def _erase_node(self, key):
+        node = self.drawn.pop(key, None)
+        if node is not None:
+            for item in node[0]:
+                self.canvas.delete(item)
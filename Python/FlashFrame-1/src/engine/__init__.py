@@ -0,0 +1,34 @@
+from src.engine.base import TournamentStrategy
+from src.engine.elimination import SingleElimination, OneRound
+from src.engine.double_elimination import DoubleElimination
+from src.engine.round_robin import RoundRobin
+from src.engine.rating import AdaptiveRanking
+from src.engine.merge_sort import MergeSortRanking
+
+# Tournament type name -> strategy class ("Custom" brackets play as single elimination for now)
+STRATEGIES = {
+    SingleElimination.name: SingleElimination,
+    DoubleElimination.name: DoubleElimination,
+    RoundRobin.name: RoundRobin,
+    OneRound.name: OneRound,
+    "Custom": SingleElimination,
+    AdaptiveRanking.name: AdaptiveRanking,
+    MergeSortRanking.name: MergeSortRanking,
+}
+
+
+def create_strategy(tournament_type, items, **options):
+    """
+    Creates the strategy for a tournament type name (falls back to single elimination).
+    """
+    return STRATEGIES.get(tournament_type, SingleElimination)(items, **options)
+
+
+def strategy_from_state(state):
+    """
+    Restores a strategy saved with to_state(), or returns None if the state is unknown.
+    """
+    for cls in STRATEGIES.values():
+        if state and state.get("engine") == cls.name:
+            return cls.from_state(state)
+    return None
@@ -0,0 +1,126 @@
+import random
+
+
+class TournamentStrategy:
+    """
+    UI-free tournament engine. A strategy only works with indices into `items`:
+    next_match() returns the photos of the current match, advance(decision) records the
+    index of the winner within that match. Shuffles use a seeded random.Random, so a
+    strategy is fully determined by (items, options, seed, decision_log); that is what
+    undo and save/restore rely on.
+    """
+
+    name = ""
+    pairwise = False  # True when every match has exactly two photos
+    section = None    # Bracket section of the current match, for strategies that have several
+
+    def __init__(self, items, num_choices=2, top_n=None, seed=None, shuffle=True):
+        self.items = list(items)
+        self.num_choices = 2 if self.pairwise else max(2, num_choices)
+        self.top_n = top_n if top_n and top_n < len(self.items) else None
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.shuffle = shuffle
+        self.decision_log = []
+        self._reset()
+
+    # --- To implement in strategies ---
+
+    def _reset(self):
+        """
+        Builds the initial state (called again before a replay).
+        """
+        raise NotImplementedError
+
+    def _current(self):
+        """
+        Returns the item indices of the current match, or None when finished.
+        """
+        raise NotImplementedError
+
+    def _apply(self, decision):
+        """
+        Applies the winner index of the current match to the state.
+        """
+        raise NotImplementedError
+
+    def _ranking(self):
+        """
+        Returns item indices best first.
+        """
+        raise NotImplementedError
+
+    @property
+    def round(self):
+        return 1
+
+    @property
+    def match_number(self):
+        """
+        0-based number of the current match within the round.
+        """
+        return self.decisions
+
+    @property
+    def total_matches(self):
+        """
+        Number of matches in the current round (or in the whole tournament).
+        """
+        raise NotImplementedError
+
+    # --- Public API ---
+
+    @property
+    def decisions(self):
+        return len(self.decision_log)
+
+    def is_finished(self):
+        return self._current() is None
+
+    def next_match(self):
+        current = self._current()
+        if current is None:
+            return None
+        return [self.items[i] for i in current]
+
+    def advance(self, decision):
+        current = self._current()
+        if current is None:
+            raise RuntimeError("Tournament is already finished")
+        if not 0 <= decision < len(current):
+            raise IndexError(f"Decision {decision} is out of range for a match of {len(current)}")
+        self._apply(decision)
+        self.decision_log.append(decision)
+
+    def undo(self):
+        """
+        Reverts the last decision by replaying the earlier ones from the initial state.
+        """
+        if not self.decision_log:
+            return False
+        replay = self.decision_log[:-1]
+        self._reset()
+        for decision in replay:
+            self._apply(decision)
+        self.decision_log = replay
+        return True
+
+    def ranking(self):
+        order = self._ranking()
+        if self.top_n:
+            order = order[:self.top_n]
+        return [self.items[i] for i in order]
+
+    # --- Persistence ---
+
+    def options(self):
+        return {"num_choices": self.num_choices, "top_n": self.top_n, "seed": self.seed, "shuffle": self.shuffle}
+
+    def to_state(self):
+        return {"engine": self.name, "items": self.items, "options": self.options(), "decision_log": self.decision_log}
+
+    @classmethod
+    def from_state(cls, state):
+        strategy = cls(state["items"], **state["options"])
+        for decision in state["decision_log"]:
+            strategy.advance(decision)
+        return strategy
@@ -0,0 +1,163 @@
+import random
+
+from src.engine.base import TournamentStrategy
+
+WINNERS = "Winners"
+LOSERS = "Losers"
+GRAND_FINAL = "Grand Final"
+
+
+class DoubleElimination(TournamentStrategy):
+    """
+    Real double elimination: a photo is out after its second loss.
+    Winners bracket rounds alternate with losers bracket rounds; the photos that lose in the
+    winners bracket drop into the next losers round, interleaved with the losers bracket
+    survivors. When both brackets are down to one photo they meet in the grand final; if the
+    losers bracket photo wins, both have one loss and a second final is played (bracket reset).
+
+    Losses are an indexed array and every round is a plain list of indices, so each round
+    is built and played in linear time. bracket() returns the played and pending matches
+    of every section for the tree view.
+    """
+
+    name = "Double Elimination"
+    pairwise = True
+
+    def _reset(self):
+        self.rng = random.Random(self.seed)
+        players = list(range(len(self.items)))
+        if self.shuffle:
+            self.rng.shuffle(players)
+        self.losses = [0] * len(self.items)
+        self.winners_alive = []   # Photos without a loss after the last winners round
+        self.losers_alive = []    # Photos with one loss after the last losers round
+        self.dropped = []         # Losers of the last winners round, waiting for the losers bracket
+        self.eliminated = []      # Photos in order of their second loss
+        self.history = []         # (section, round, a, b, winner) of every played match
+        self.champion = None
+        self.runner_up = None
+        self.level = 0
+        self.section_rounds = {WINNERS: 0, LOSERS: 0, GRAND_FINAL: 0}
+        self._start_round(WINNERS, players)
+
+    # --- Rounds ---
+
+    def _start_round(self, section, players):
+        """
+        Pairs the players in order; a photo left alone gets a bye and leads the next round
+        (so the same photo does not get two byes in a row).
+        """
+        self.level += 1
+        self.section_rounds[section] += 1
+        self._section = section
+        self.pairs = [(players[k], players[k + 1]) for k in range(0, len(players) - 1, 2)]
+        self.pos = 0
+        self.round_winners = [players[-1]] if len(players) % 2 else []
+        if not self.pairs:
+            self._finish_round()
+
+    def _finish_round(self):
+        section = self._section
+        if section == WINNERS:
+            self.winners_alive = self.round_winners
+            # Dropped photos alternate with losers bracket survivors, so they do not meet each other first
+            pool = []
+            survivors, dropped = self.losers_alive, self.dropped
+            for k in range(max(len(survivors), len(dropped))):
+                if k < len(survivors):
+                    pool.append(survivors[k])
+                if k < len(dropped):
+                    pool.append(dropped[k])
+            self.dropped = []
+            self._start_round(LOSERS, pool)
+        elif section == LOSERS:
+            self.losers_alive = self.round_winners
+            if len(self.winners_alive) > 1:
+                self._start_round(WINNERS, self.winners_alive)
+            elif len(self.losers_alive) > 1:
+                self._start_round(LOSERS, self.losers_alive)
+            elif self.losers_alive:
+                self._start_round(GRAND_FINAL, self.winners_alive + self.losers_alive)
+            else:
+                self._finish(self.winners_alive[0] if self.winners_alive else None, None)
+
+    def _finish(self, champion, runner_up):
+        self.champion = champion
+        self.runner_up = runner_up
+        self.pairs = []
+        self.pos = 0
+
+    # --- Strategy hooks ---
+
+    def _current(self):
+        if self.pos >= len(self.pairs):
+            return None
+        return list(self.pairs[self.pos])
+
+    def _apply(self, decision):
+        a, b = self.pairs[self.pos]
+        winner, loser = (a, b) if decision == 0 else (b, a)
+        section = self._section
+        self.history.append((section, self.section_rounds[section], a, b, winner))
+        self.losses[loser] += 1
+        self.pos += 1
+        if section == GRAND_FINAL:
+            if self.losses[loser] >= 2:
+                self._finish(winner, loser)
+            else:
+                # The losers bracket photo won: bracket reset, both now have one loss
+                self._start_round(GRAND_FINAL, [a, b])
+            return
+        if section == WINNERS:
+            self.dropped.append(loser)
+        else:
+            self.eliminated.append(loser)
+        self.round_winners.append(winner)
+        if self.pos == len(self.pairs):
+            self._finish_round()
+
+    def _ranking(self):
+        if self.champion is not None:
+            top = [self.champion] + ([self.runner_up] if self.runner_up is not None else [])
+            return top + self.eliminated[::-1]
+        # Unfinished: fewer losses first, later eliminations before earlier ones
+        alive = [i for i in range(len(self.items)) if self.losses[i] < 2]
+        alive.sort(key=lambda i: self.losses[i])
+        return alive + self.eliminated[::-1]
+
+    # --- Public API ---
+
+    @property
+    def section(self):
+        return None if self.champion is not None else self._section
+
+    @property
+    def round(self):
+        return self.level
+
+    @property
+    def match_number(self):
+        return self.pos
+
+    @property
+    def total_matches(self):
+        return len(self.pairs)
+
+    def bracket(self):
+        """
+        Returns {section: [[match, ...] per round]} with match = {"players": [a, b], "winner": w},
+        where w is None for the pending matches of the current round.
+        """
+        result = {WINNERS: [], LOSERS: [], GRAND_FINAL: []}
+        for section, rnd, a, b, winner in self.history:
+            rounds = result[section]
+            while len(rounds) < rnd:
+                rounds.append([])
+            rounds[rnd - 1].append({"players": [self.items[a], self.items[b]], "winner": self.items[winner]})
+        if self.champion is None:
+            rounds = result[self._section]
+            while len(rounds) < self.section_rounds[self._section]:
+                rounds.append([])
+            for a, b in self.pairs[self.pos:]:
+                rounds[-1].append({"players": [self.items[a], self.items[b]], "winner": None})
+        return result
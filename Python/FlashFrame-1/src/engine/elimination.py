@@ -0,0 +1,99 @@
+import random
+
+from src.engine.base import TournamentStrategy
+
+
+class SingleElimination(TournamentStrategy):
+    """
+    Photos play in groups of num_choices; only the winner of each group goes to the next round.
+    A photo left alone at the end of a round gets a bye. With Top N the tournament stops
+    as soon as N or fewer photos remain.
+    """
+
+    name = "Single Elimination"
+    shuffles = True  # Shuffle the field before every round (when the shuffle option is on)
+
+    def _reset(self):
+        self.rng = random.Random(self.seed)
+        self.wins = [0] * len(self.items)
+        self.players = list(range(len(self.items)))
+        self.level = 1
+        self.result = None
+        self._start_round()
+
+    def _start_round(self):
+        if self.shuffle and self.shuffles:
+            self.rng.shuffle(self.players)
+        self.pos = 0
+        self.round_winners = []
+        self._skip_byes()
+
+    def _skip_byes(self):
+        if self.result is not None:
+            return
+        remaining = len(self.players) - self.pos
+        if remaining >= 2:
+            return
+        if remaining == 1:
+            self.round_winners.append(self.players[self.pos])
+            self.pos += 1
+        if self._round_finished():
+            return
+        self.players = self.round_winners
+        self.level += 1
+        self._start_round()
+
+    def _round_finished(self):
+        winners = self.round_winners
+        if len(winners) <= 1 or (self.top_n and len(winners) <= self.top_n):
+            self.result = sorted(winners, key=lambda i: -self.wins[i])
+            return True
+        return False
+
+    def _current(self):
+        if self.result is not None:
+            return None
+        return self.players[self.pos:self.pos + self.num_choices]
+
+    def _apply(self, decision):
+        match = self._current()
+        winner = match[decision]
+        self.wins[winner] += 1
+        self.round_winners.append(winner)
+        self.pos += len(match)
+        self._on_match(match, winner)
+        self._skip_byes()
+
+    def _on_match(self, match, winner):
+        pass
+
+    def _ranking(self):
+        if self.result is not None:
+            return self.result
+        return sorted(self.players, key=lambda i: -self.wins[i])
+
+    @property
+    def round(self):
+        return self.level
+
+    @property
+    def match_number(self):
+        return self.pos // self.num_choices
+
+    @property
+    def total_matches(self):
+        return len(self.players) // self.num_choices
+
+
+class OneRound(SingleElimination):
+    """
+    A single pass over all photos in their original order; the round winners are the result
+    (with Top N: the first N by wins).
+    """
+
+    name = "One Round"
+    shuffles = False
+
+    def _round_finished(self):
+        self.result = sorted(self.round_winners, key=lambda i: -self.wins[i])
+        return True
@@ -0,0 +1,131 @@
+from src.engine.base import TournamentStrategy
+
+
+def merge_sort_budget(n):
+    """
+    Worst-case number of matches for the bottom-up merge below (about n*log2(n) - n).
+    Merging runs of a and b photos takes at most a+b-1 matches.
+    """
+    lengths, total = [1] * n, 0
+    while len(lengths) > 1:
+        merged = [lengths[k] + lengths[k + 1] for k in range(0, len(lengths) - 1, 2)]
+        total += sum(merged) - len(merged)
+        if len(lengths) % 2:
+            merged.append(lengths[-1])
+        lengths = merged
+    return total
+
+
+class MergeSortRanking(TournamentStrategy):
+    """
+    Full ranking by a bottom-up merge sort whose comparisons are the user's decisions.
+    Reaches a total order in at most ~n*log2(n) pairwise matches (Round Robin needs n(n-1)/2).
+    The whole sort state (pending runs, merged runs, merge cursor) is plain lists of
+    indices, so it can be saved and resumed exactly.
+    """
+
+    name = "Merge Sort Ranking"
+    pairwise = True
+
+    def _reset(self):
+        self.max_decisions = merge_sort_budget(len(self.items))
+        self.runs = [[i] for i in range(len(self.items))]  # Sorted runs of the current pass, best first
+        self.pos = 0                                       # Next run of self.runs to merge
+        self.next_runs = []                                # Runs merged during the current pass
+        self.merge = None                                  # {"left", "right", "i", "j", "out"}
+        self.level = 1
+        self.finished = False
+        self._start_next_merge()
+
+    # --- Public API ---
+
+    @property
+    def round(self):
+        return self.level
+
+    @property
+    def total_matches(self):
+        return self.max_decisions
+
+    def _current(self):
+        if self.finished:
+            return None
+        m = self.merge
+        return [m["left"][m["i"]], m["right"][m["j"]]]
+
+    def _ranking(self):
+        # Before the sort completes this is only a partial order
+        if self.finished:
+            order = self.next_runs[0] if self.next_runs else list(range(len(self.items)))
+        else:
+            order = [i for run in self.next_runs for i in run]
+            if self.merge:
+                m = self.merge
+                order += m["out"] + m["left"][m["i"]:] + m["right"][m["j"]:]
+            order += [i for run in self.runs[self.pos:] for i in run]
+        return order
+
+    # --- Internals ---
+
+    def _apply(self, decision):
+        m = self.merge
+        if decision == 0:
+            m["out"].append(m["left"][m["i"]])
+            m["i"] += 1
+        else:
+            m["out"].append(m["right"][m["j"]])
+            m["j"] += 1
+        if m["i"] == len(m["left"]) or m["j"] == len(m["right"]):
+            # One side is exhausted: the rest of the other side is already in order
+            m["out"].extend(m["left"][m["i"]:])
+            m["out"].extend(m["right"][m["j"]:])
+            self.next_runs.append(m["out"])
+            self.merge = None
+            self._start_next_merge()
+
+    def _start_next_merge(self):
+        while self.merge is None:
+            remaining = len(self.runs) - self.pos
+            if remaining >= 2:
+                left, right = self.runs[self.pos], self.runs[self.pos + 1]
+                self.pos += 2
+                self.merge = {"left": left, "right": right, "i": 0, "j": 0, "out": []}
+                return
+            if remaining == 1:
+                # Odd run out: carried to the next pass unchanged
+                self.next_runs.append(self.runs[self.pos])
+                self.pos += 1
+            if len(self.next_runs) <= 1:
+                self.finished = True
+                return
+            self.runs, self.next_runs, self.pos = self.next_runs, [], 0
+            self.level += 1
+
+    # --- Persistence ---
+
+    def to_state(self):
+        # Runs and merge cursor are saved as they are, so a restore needs no replay
+        return {
+            "engine": self.name,
+            "items": self.items,
+            "options": self.options(),
+            "runs": self.runs,
+            "pos": self.pos,
+            "next_runs": self.next_runs,
+            "merge": self.merge,
+            "level": self.level,
+            "finished": self.finished,
+            "decision_log": self.decision_log,
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        engine = cls(state["items"], **state["options"])
+        engine.runs = state["runs"]
+        engine.pos = state["pos"]
+        engine.next_runs = state["next_runs"]
+        engine.merge = state["merge"]
+        engine.level = state["level"]
+        engine.finished = state["finished"]
+        engine.decision_log = state["decision_log"]
+        return engine
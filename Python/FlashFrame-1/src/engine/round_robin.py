@@ -0,0 +1,62 @@
+import random
+
+from src.engine.base import TournamentStrategy
+
+
+class RoundRobin(TournamentStrategy):
+    """
+    Every photo meets every other photo once; the ranking is by number of wins.
+    Pairings come from the circle method, computed per match in O(1), so no
+    n*(n-1)/2 match list is ever stored.
+    """
+
+    name = "Round Robin"
+    pairwise = True
+
+    def _reset(self):
+        self.order = list(range(len(self.items)))
+        random.Random(self.seed).shuffle(self.order)
+        if len(self.order) % 2:
+            self.order.append(None)  # Bye
+        self.slots = len(self.order) // 2
+        self.rounds = len(self.order) - 1
+        self.wins = [0] * len(self.items)
+        self.t = 0  # Index into the schedule (rounds * slots entries, byes included)
+        self._skip_byes()
+
+    def _player(self, r, i):
+        if i == 0:
+            return self.order[0]
+        return self.order[1 + (i - 1 + r) % self.rounds]
+
+    def _pair(self, t):
+        r, s = divmod(t, self.slots)
+        return self._player(r, s), self._player(r, len(self.order) - 1 - s)
+
+    def _skip_byes(self):
+        while self.t < self.rounds * self.slots and None in self._pair(self.t):
+            self.t += 1
+
+    def _current(self):
+        if self.t >= self.rounds * self.slots:
+            return None
+        return list(self._pair(self.t))
+
+    def _apply(self, decision):
+        self.wins[self._pair(self.t)[decision]] += 1
+        self.t += 1
+        self._skip_byes()
+
+    def _ranking(self):
+        return sorted(range(len(self.items)), key=lambda i: -self.wins[i])
+
+    @property
+    def round(self):
+        if self.rounds < 1:
+            return 1
+        return min(self.t // self.slots, self.rounds - 1) + 1
+
+    @property
+    def total_matches(self):
+        n = len(self.items)
+        return n * (n - 1) // 2
@@ -0,0 +1,100 @@
+"""
+Headless simulation harness for the tournament strategies.
+
+Plays synthetic tournaments where every photo has a hidden quality and the simulated
+user picks the best photo of each match (optionally with gaussian noise), then reports
+throughput and the number of decisions/comparisons per tournament for each strategy.
+
+    python -m src.engine.simulate --photos 256 --decisions 1000000
+    python -m src.engine.simulate --strategy "Merge Sort Ranking" --photos 10000 --noise 0.05
+"""
+import argparse
+import math
+import random
+import time
+
+from src.engine import STRATEGIES
+
+
+def run_tournament(strategy_cls, num_photos, num_choices=2, top_n=None, noise=0.0, seed=0):
+    """
+    Plays one tournament to the end.
+    Returns (decisions, comparisons, winner_is_best).
+    """
+    rng = random.Random(seed)
+    quality = [rng.random() for _ in range(num_photos)]
+    strategy = strategy_cls(range(num_photos), num_choices=num_choices, top_n=top_n, seed=seed)
+    decisions = comparisons = 0
+    while True:
+        match = strategy.next_match()
+        if match is None:
+            break
+        if noise:
+            scores = [quality[i] + rng.gauss(0.0, noise) for i in match]
+        else:
+            scores = [quality[i] for i in match]
+        strategy.advance(max(range(len(match)), key=scores.__getitem__))
+        decisions += 1
+        comparisons += len(match) - 1
+    ranking = strategy.ranking()
+    best = max(range(num_photos), key=quality.__getitem__)
+    return decisions, comparisons, bool(ranking) and ranking[0] == best
+
+
+def benchmark(strategy_cls, num_photos, total_decisions, num_choices=2, top_n=None, noise=0.0, seed=0):
+    """
+    Plays tournaments until at least total_decisions decisions were made.
+    """
+    decisions = comparisons = tournaments = correct = 0
+    start = time.perf_counter()
+    while decisions < total_decisions:
+        d, c, ok = run_tournament(strategy_cls, num_photos, num_choices, top_n, noise, seed + tournaments)
+        if d == 0:
+            break
+        decisions += d
+        comparisons += c
+        tournaments += 1
+        correct += ok
+    elapsed = time.perf_counter() - start
+    return {
+        "strategy": strategy_cls.name,
+        "tournaments": tournaments,
+        "decisions": decisions,
+        "seconds": elapsed,
+        "decisions_per_sec": decisions / elapsed if elapsed else 0.0,
+        "decisions_per_tournament": decisions / tournaments if tournaments else 0.0,
+        "comparisons_per_tournament": comparisons / tournaments if tournaments else 0.0,
+        "winner_accuracy": correct / tournaments if tournaments else 0.0,
+    }
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Simulate tournament strategies without the GUI.")
+    p.add_argument("--strategy", default="all", help="Strategy name or 'all'.")
+    p.add_argument("--photos", type=int, default=256, help="Photos per tournament.")
+    p.add_argument("--decisions", type=int, default=1_000_000, help="Decisions to simulate per strategy.")
+    p.add_argument("--choices", type=int, default=2, choices=(2, 4), help="Photos per match.")
+    p.add_argument("--top-n", type=int, default=None, help="Stop at a Top N where supported.")
+    p.add_argument("--noise", type=float, default=0.0, help="Std-dev of the simulated user's noise.")
+    p.add_argument("--seed", type=int, default=0)
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.strategy == "all":
+        classes = list(dict.fromkeys(STRATEGIES.values()))
+    else:
+        classes = [STRATEGIES[args.strategy]]
+    print(f"{args.photos} photos, n*log2(n) = {args.photos * math.log2(max(args.photos, 2)):.0f}")
+    header = f"{'strategy':<22}{'dec/s':>12}{'dec/tourn':>12}{'cmp/tourn':>12}{'winner ok':>11}{'tourn':>8}"
+    print(header)
+    print("-" * len(header))
+    for cls in classes:
+        r = benchmark(cls, args.photos, args.decisions, args.choices, args.top_n, args.noise, args.seed)
+        print(f"{r['strategy']:<22}{r['decisions_per_sec']:>12,.0f}{r['decisions_per_tournament']:>12,.1f}"
+              f"{r['comparisons_per_tournament']:>12,.1f}{r['winner_accuracy']:>11.1%}{r['tournaments']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+from collections import OrderedDict
+from PIL import Image
+
+MASTER_SIZE = (1024, 1024)  # Decoded "master" resolution the match photos are scaled from
+MASTER_CACHE_SIZE = 16      # Masters kept in memory (current match, undo and the last few)
+
+
+class MasterImageCache:
+    """
+    LRU cache of medium-resolution decoded photos. Every photo file is read once; showing it
+    at another size (window resize, undo, 2/4 choices) only rescales the master in memory.
+    JPEGs are decoded with draft(), close to MASTER_SIZE instead of at full resolution.
+    """
+
+    def __init__(self, size=MASTER_SIZE, capacity=MASTER_CACHE_SIZE):
+        self.size = size
+        self.capacity = capacity
+        self.masters = OrderedDict()
+
+    def get(self, path):
+        return self._entry(path)[0]
+
+    def _entry(self, path):
+        """
+        Returns (master, original_size); the original size bounds how large the photo is shown.
+        """
+        entry = self.masters.get(path)
+        if entry is not None:
+            self.masters.move_to_end(path)
+            return entry
+        with Image.open(path) as img:
+            original_size = img.size
+            img.draft("RGB", self.size)
+            if img.mode not in ("RGB", "RGBA", "L"):
+                img = img.convert("RGBA" if "transparency" in img.info else "RGB")
+            img.thumbnail(self.size, Image.Resampling.LANCZOS)
+            img.load()
+            entry = (img, original_size)
+        self.masters[path] = entry
+        if len(self.masters) > self.capacity:
+            self.masters.popitem(last=False)
+        return entry
+
+    def scaled(self, path, box):
+        """
+        Returns the photo fitted into box (width, height), keeping the aspect ratio.
+        Like thumbnail(), it is never shown larger than the original file.
+        """
+        master, (w, h) = self._entry(path)
+        scale = min(box[0] / w, box[1] / h, 1.0)
+        size = (max(1, round(w * scale)), max(1, round(h * scale)))
+        if size == master.size:
+            return master
+        return master.resize(size, Image.Resampling.LANCZOS, reducing_gap=2.0)
+
+    def clear(self):
+        self.masters.clear()
@@ -0,0 +1,215 @@
+import os
+import json
+import sqlite3
+import hashlib
+import datetime
+from pathlib import Path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    folder TEXT,
+    tournament_type TEXT,
+    num_decisions INTEGER NOT NULL DEFAULT 0,
+    total_decision_time REAL NOT NULL DEFAULT 0,
+    num_undos INTEGER NOT NULL DEFAULT 0,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_timestamp ON sessions (timestamp);
+CREATE INDEX IF NOT EXISTS idx_sessions_folder ON sessions (folder, timestamp);
+CREATE TABLE IF NOT EXISTS photo_results (
+    session_id INTEGER NOT NULL REFERENCES sessions (id),
+    photo TEXT NOT NULL,
+    appearances INTEGER NOT NULL,
+    wins INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_photo_results_photo ON photo_results (photo);
+CREATE INDEX IF NOT EXISTS idx_photo_results_session ON photo_results (session_id);
+CREATE TABLE IF NOT EXISTS legacy_imports (
+    digest TEXT PRIMARY KEY,
+    imported_at TEXT NOT NULL
+);
+"""
+
+PHOTO_RESULTS_INSERT = "INSERT INTO photo_results (session_id, photo, appearances, wins) VALUES (?, ?, ?, ?)"
+
+
+def count_photo_results(match_log):
+    """
+    Returns {photo: [appearances, wins]} for a match log.
+    """
+    results = {}
+    for entry in match_log:
+        for photo in entry.get("choices", []):
+            results.setdefault(photo, [0, 0])[0] += 1
+        winner = entry.get("winner")
+        if winner is not None:
+            results.setdefault(winner, [1, 0])[1] += 1
+    return results
+
+
+class SessionStore:
+    """
+    Append-only session history backed by SQLite.
+    Every append is a single transaction, so a crash never loses earlier sessions,
+    and aggregate queries run in SQL without loading the whole history.
+    With read_only=True an existing store is opened for queries only: nothing is created,
+    migrated or imported, and the file is never modified.
+    """
+
+    def __init__(self, db_path, legacy_json_path=None, read_only=False):
+        self.db_path = db_path
+        if read_only:
+            if not os.path.isfile(db_path):
+                raise FileNotFoundError(f"Session store not found: {db_path}")
+            self.conn = sqlite3.connect(Path(db_path).resolve().as_uri() + "?mode=ro", uri=True)
+            return
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        if legacy_json_path and os.path.exists(legacy_json_path):
+            self.import_legacy_json(legacy_json_path)
+
+    def close(self):
+        self.conn.close()
+
+    def append(self, session):
+        """
+        Appends one session dict (timestamp, folder, tournament_type, match_log, stats).
+        """
+        with self.conn:
+            session_id = self._insert_session(session)
+            self.conn.executemany(PHOTO_RESULTS_INSERT, self._photo_rows(session_id, session))
+        return session_id
+
+    def _insert_session(self, session):
+        """
+        Inserts the sessions row inside the caller's transaction and returns its id.
+        """
+        stats = session.get("stats", {})
+        match_log = session.get("match_log", [])
+        timestamp = session.get("timestamp") or datetime.datetime.now().isoformat(timespec="seconds")
+        cur = self.conn.execute(
+            "INSERT INTO sessions (timestamp, folder, tournament_type, num_decisions,"
+            " total_decision_time, num_undos, payload) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                timestamp,
+                session.get("folder"),
+                session.get("tournament_type"),
+                stats.get("num_decisions", len(match_log)),
+                stats.get("total_decision_time", 0.0),
+                stats.get("num_undos", 0),
+                json.dumps(session, ensure_ascii=False, separators=(",", ":")),
+            ),
+        )
+        return cur.lastrowid
+
+    @staticmethod
+    def _photo_rows(session_id, session):
+        results = count_photo_results(session.get("match_log", []))
+        return [(session_id, photo, counts[0], counts[1]) for photo, counts in results.items()]
+
+    def import_legacy_json(self, json_path):
+        """
+        Moves sessions from the old rewrite-the-whole-file JSON history into the store.
+        All sessions go in one transaction that also records the file's SHA-1, and the file
+        is renamed only after the commit: a crash either imports nothing or leaves a file
+        that the next open recognises and just renames, so sessions are never duplicated.
+        """
+        try:
+            with open(json_path, "rb") as f:
+                data = f.read()
+            history = json.loads(data)
+        except Exception as e:
+            print(f"Error reading legacy session history: {e}")
+            return 0
+        digest = hashlib.sha1(data).hexdigest()
+        imported = 0
+        with self.conn:
+            if not self.conn.execute("SELECT 1 FROM legacy_imports WHERE digest = ?", (digest,)).fetchone():
+                photo_rows = []
+                for session in history:
+                    # Old entries used time.ctime(); keep them sortable by converting to ISO format
+                    try:
+                        ts = datetime.datetime.strptime(session.get("timestamp", ""), "%a %b %d %H:%M:%S %Y")
+                        session["timestamp"] = ts.isoformat(timespec="seconds")
+                    except ValueError:
+                        pass
+                    photo_rows.extend(self._photo_rows(self._insert_session(session), session))
+                self.conn.executemany(PHOTO_RESULTS_INSERT, photo_rows)
+                self.conn.execute(
+                    "INSERT INTO legacy_imports (digest, imported_at) VALUES (?, ?)",
+                    (digest, datetime.datetime.now().isoformat(timespec="seconds")),
+                )
+                imported = len(history)
+        os.replace(json_path, json_path + ".imported")
+        return imported
+
+    def _where(self, folder=None, since=None, until=None, alias=""):
+        clauses, params = [], []
+        if folder is not None:
+            clauses.append(f"{alias}folder = ?")
+            params.append(folder)
+        if since is not None:
+            clauses.append(f"{alias}timestamp >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append(f"{alias}timestamp < ?")
+            params.append(until)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def count(self, folder=None, since=None, until=None):
+        where, params = self._where(folder, since, until)
+        return self.conn.execute(f"SELECT COUNT(*) FROM sessions{where}", params).fetchone()[0]
+
+    def sessions(self, folder=None, since=None, until=None, with_payload=False):
+        """
+        Iterates over sessions in timestamp order without loading them all at once.
+        """
+        where, params = self._where(folder, since, until)
+        columns = "id, timestamp, folder, tournament_type, num_decisions, total_decision_time, num_undos"
+        if with_payload:
+            columns += ", payload"
+        cur = self.conn.execute(f"SELECT {columns} FROM sessions{where} ORDER BY timestamp, id", params)
+        for row in cur:
+            session = {
+                "id": row[0],
+                "timestamp": row[1],
+                "folder": row[2],
+                "tournament_type": row[3],
+                "num_decisions": row[4],
+                "total_decision_time": row[5],
+                "num_undos": row[6],
+            }
+            if with_payload:
+                session.update(json.loads(row[7]))
+            yield session
+
+    def average_decision_time(self, folder=None, since=None, until=None):
+        """
+        Returns the average seconds per decision over the selected sessions (0.0 if none).
+        """
+        where, params = self._where(folder, since, until)
+        total_time, total_decisions = self.conn.execute(
+            f"SELECT SUM(total_decision_time), SUM(num_decisions) FROM sessions{where}", params
+        ).fetchone()
+        return (total_time / total_decisions) if total_decisions else 0.0
+
+    def photo_win_rates(self, folder=None, since=None, until=None, min_appearances=1, limit=None):
+        """
+        Returns [(photo, wins, appearances, win_rate)] sorted by win rate, best first.
+        """
+        where, params = self._where(folder, since, until, alias="s.")
+        sql = (
+            "SELECT r.photo, SUM(r.wins) AS wins, SUM(r.appearances) AS apps"
+            " FROM photo_results r JOIN sessions s ON s.id = r.session_id"
+            f"{where} GROUP BY r.photo HAVING apps >= ?"
+            " ORDER BY CAST(wins AS REAL) / apps DESC, apps DESC"
+        )
+        params.append(min_appearances)
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [(photo, wins, apps, wins / apps) for photo, wins, apps in self.conn.execute(sql, params)]
@@ -31,8 +31,9 @@ DEFAULT_NUM_CHOICES = 2
 # Settings file for export/import
 SETTINGS_FILE = "tournament_settings.json"
 
-# Session history file
-SESSION_HISTORY_FILE = "session_history.json"
+# Session history store (SQLite, append-only) and the old JSON file it migrates from
+SESSION_HISTORY_FILE = "session_history.db"
+LEGACY_SESSION_HISTORY_FILE = "session_history.json"
 
 # Add new tournament types and settings
 TOURNAMENT_TYPES = [
@@ -40,5 +41,7 @@ TOURNAMENT_TYPES = [
     "Double Elimination",
     "Round Robin",
     "One Round",
-    "Custom"
+    "Custom",
+    "Adaptive Rating",
+    "Merge Sort Ranking"
 ]
\ No newline at end of file
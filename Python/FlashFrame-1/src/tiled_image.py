@@ -0,0 +1,215 @@
+import math
+import tkinter as tk
+from collections import OrderedDict
+from PIL import Image, ImageTk
+
+TILE_SIZE = 256          # Tile edge on screen (px)
+TILE_CACHE_SIZE = 192    # Rendered tiles kept in memory
+REFINE_DELAY = 200       # ms without interaction before the visible tiles are redrawn with LANCZOS
+MIN_ZOOM = 0.01
+MAX_ZOOM = 8.0
+
+
+class TiledImage:
+    """
+    Multi-resolution pyramid of one image, split into screen tiles.
+    Level k is the image reduced 2**k times; levels are built on first use (JPEG levels 1-3
+    are decoded directly at that scale with draft(), so a zoomed-out view never decodes
+    the full image). A tile is resized from the nearest finer level with resize(box=...),
+    so only the pixels of that tile are touched. Rendered tiles are kept in a bounded LRU.
+    """
+
+    def __init__(self, path, tile_size=TILE_SIZE, cache_size=TILE_CACHE_SIZE):
+        self.path = path
+        self.tile_size = tile_size
+        self.cache_size = cache_size
+        with Image.open(path) as img:
+            self.size = img.size
+            self.format = img.format
+        self.max_level = max(0, int(math.log2(max(1, min(self.size)))))
+        self.levels = {}
+        self.tiles = OrderedDict()
+
+    def _open(self):
+        img = Image.open(self.path)
+        if img.mode not in ("RGB", "RGBA", "L"):
+            img = img.convert("RGBA" if "transparency" in img.info or img.mode in ("LA", "PA") else "RGB")
+        return img
+
+    def level_size(self, level):
+        w, h = self.size
+        return max(1, w >> level), max(1, h >> level)
+
+    def level(self, level):
+        """
+        Returns the pyramid level image, building it (and nothing finer than needed) on first use.
+        """
+        img = self.levels.get(level)
+        if img is not None:
+            return img
+        if level == 0:
+            img = self._open()
+            img.load()
+        elif self.format == "JPEG" and level <= 3 and 0 not in self.levels:
+            img = Image.open(self.path)
+            img.draft("RGB", self.level_size(level))
+            img = img.convert("RGB")
+            if img.size != self.level_size(level):
+                img = img.resize(self.level_size(level), Image.Resampling.BILINEAR)
+        else:
+            finer = self.level(level - 1)
+            img = finer.reduce(2) if min(finer.size) >= 2 else finer.copy()
+        self.levels[level] = img
+        return img
+
+    def level_for_zoom(self, zoom):
+        """
+        Coarsest level that still has at least as many pixels as the screen at this zoom.
+        """
+        if zoom >= 1.0:
+            return 0
+        return min(self.max_level, int(math.floor(math.log2(1.0 / zoom))))
+
+    def display_size(self, zoom):
+        return max(1, int(self.size[0] * zoom)), max(1, int(self.size[1] * zoom))
+
+    def grid(self, zoom):
+        """
+        Returns (columns, rows) of screen tiles at this zoom.
+        """
+        w, h = self.display_size(zoom)
+        return math.ceil(w / self.tile_size), math.ceil(h / self.tile_size)
+
+    def tile(self, zoom, tx, ty, fast=False):
+        """
+        Returns the screen tile (tx, ty) at this zoom as a PIL image.
+        fast=True uses NEAREST resampling for interaction; the LANCZOS tile replaces it later.
+        """
+        key = (zoom, tx, ty, fast)
+        tile = self.tiles.get(key)
+        if tile is not None:
+            self.tiles.move_to_end(key)
+            return tile
+        level = self.level_for_zoom(zoom)
+        src = self.level(level)
+        scale = zoom * (1 << level)  # Screen pixels per level pixel
+        dw, dh = self.display_size(zoom)
+        x0, y0 = tx * self.tile_size, ty * self.tile_size
+        x1, y1 = min(dw, x0 + self.tile_size), min(dh, y0 + self.tile_size)
+        box = (x0 / scale, y0 / scale, min(src.size[0], x1 / scale), min(src.size[1], y1 / scale))
+        resample = Image.Resampling.NEAREST if fast else Image.Resampling.LANCZOS
+        tile = src.resize((x1 - x0, y1 - y0), resample, box=box)
+        self.tiles[key] = tile
+        if len(self.tiles) > self.cache_size:
+            self.tiles.popitem(last=False)
+        return tile
+
+
+class TiledImageViewer(tk.Frame):
+    """
+    Zoom/pan viewer for a TiledImage. Only the tiles in the visible canvas region are drawn;
+    while the user zooms or pans they are drawn with fast resampling and refined after
+    REFINE_DELAY ms of inactivity.
+    """
+
+    def __init__(self, parent, image, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.image = image
+        self.zoom = 1.0
+        self.drawn = {}  # (tx, ty) -> (canvas item, PhotoImage, fast)
+        self.refine_job = None
+
+        self.canvas = tk.Canvas(self, background="#202020", highlightthickness=0)
+        vbar = tk.Scrollbar(self, orient=tk.VERTICAL, command=self._yview)
+        hbar = tk.Scrollbar(self, orient=tk.HORIZONTAL, command=self._xview)
+        self.canvas.configure(yscrollcommand=vbar.set, xscrollcommand=hbar.set)
+        self.canvas.grid(row=0, column=0, sticky="nsew")
+        vbar.grid(row=0, column=1, sticky="ns")
+        hbar.grid(row=1, column=0, sticky="ew")
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        self.canvas.bind("<Configure>", lambda e: self.render(fast=True))
+        self.canvas.bind("<ButtonPress-1>", lambda e: self.canvas.scan_mark(e.x, e.y))
+        self.canvas.bind("<B1-Motion>", self._on_drag)
+        self.canvas.bind("<MouseWheel>", lambda e: self.zoom_by(1.25 if e.delta > 0 else 0.8, e.x, e.y))
+        self.canvas.bind("<Button-4>", lambda e: self.zoom_by(1.25, e.x, e.y))
+        self.canvas.bind("<Button-5>", lambda e: self.zoom_by(0.8, e.x, e.y))
+
+    def fit(self, width, height):
+        """
+        Sets the zoom so the whole image fits into width x height (never above 100%).
+        """
+        w, h = self.image.size
+        self.set_zoom(min(1.0, width / w, height / h))
+
+    def set_zoom(self, zoom, anchor_x=None, anchor_y=None):
+        zoom = max(MIN_ZOOM, min(MAX_ZOOM, zoom))
+        if anchor_x is None:
+            anchor_x, anchor_y = self.canvas.winfo_width() / 2, self.canvas.winfo_height() / 2
+        # Keep the image point under the anchor in place
+        ix = (self.canvas.canvasx(anchor_x)) / self.zoom
+        iy = (self.canvas.canvasy(anchor_y)) / self.zoom
+        self.zoom = zoom
+        self.clear()
+        dw, dh = self.image.display_size(zoom)
+        self.canvas.configure(scrollregion=(0, 0, dw, dh))
+        if dw > 1:
+            self.canvas.xview_moveto(max(0.0, (ix * zoom - anchor_x) / dw))
+        if dh > 1:
+            self.canvas.yview_moveto(max(0.0, (iy * zoom - anchor_y) / dh))
+        self.render(fast=True)
+
+    def zoom_by(self, factor, anchor_x=None, anchor_y=None):
+        self.set_zoom(self.zoom * factor, anchor_x, anchor_y)
+
+    def clear(self):
+        self.canvas.delete("all")
+        self.drawn.clear()
+
+    def _xview(self, *args):
+        self.canvas.xview(*args)
+        self.render(fast=True)
+
+    def _yview(self, *args):
+        self.canvas.yview(*args)
+        self.render(fast=True)
+
+    def _on_drag(self, event):
+        self.canvas.scan_dragto(event.x, event.y, gain=1)
+        self.render(fast=True)
+
+    def render(self, fast=False):
+        """
+        Draws the missing visible tiles and deletes the ones out of view.
+        A fast render schedules a refine pass with LANCZOS.
+        """
+        try:
+            size = self.image.tile_size
+            cols, rows = self.image.grid(self.zoom)
+            x0, y0 = self.canvas.canvasx(0), self.canvas.canvasy(0)
+            x1, y1 = x0 + self.canvas.winfo_width(), y0 + self.canvas.winfo_height()
+            visible_x = range(max(0, int(x0 // size)), min(cols, int(x1 // size) + 1))
+            visible_y = range(max(0, int(y0 // size)), min(rows, int(y1 // size) + 1))
+            for key in [k for k in self.drawn if k[0] not in visible_x or k[1] not in visible_y]:
+                self.canvas.delete(self.drawn.pop(key)[0])
+            for ty in visible_y:
+                for tx in visible_x:
+                    drawn = self.drawn.get((tx, ty))
+                    if drawn is not None and (fast or not drawn[2]):
+                        continue
+                    photo = ImageTk.PhotoImage(self.image.tile(self.zoom, tx, ty, fast=fast))
+                    item = self.canvas.create_image(tx * size, ty * size, anchor="nw", image=photo)
+                    if drawn is not None:
+                        self.canvas.delete(drawn[0])
+                    self.drawn[(tx, ty)] = (item, photo, fast)
+            if fast:
+                if self.refine_job is not None:
+                    self.after_cancel(self.refine_job)
+                self.refine_job = self.after(REFINE_DELAY, self._refine)
+        except Exception as e:
+            print(f"Tile render error: {e}")
+
+    def _refine(self):
+        self.refine_job = None
+        self.render(fast=False)
@@ -6,6 +6,9 @@ from PIL import Image, ImageTk
 import json
 import time
 import datetime
+from src.session_store import SessionStore
+from src.engine import create_strategy
+from src.bracket_view import BracketView
 
 KEY_LEFT = 'd'
 KEY_RIGHT = 'f'
@@ -28,13 +31,16 @@ if not os.path.exists(EMERGENCY_SAVE_FOLDER):
 DEFAULT_TOURNAMENT_TYPE = "Single Elimination"
 DEFAULT_NUM_CHOICES = 2
 SETTINGS_FILE = "tournament_settings.json"
-SESSION_HISTORY_FILE = "session_history.json"
+SESSION_HISTORY_FILE = "session_history.db"
+LEGACY_SESSION_HISTORY_FILE = "session_history.json"
 TOURNAMENT_TYPES = [
     "Single Elimination",
     "Double Elimination",
     "Round Robin",
     "One Round",
-    "Custom"
+    "Custom",
+    "Adaptive Rating",
+    "Merge Sort Ranking"
 ]
 
 class PhotoTournament:
@@ -58,8 +64,7 @@ class PhotoTournament:
         self.shuffle = True
         self.seeding = False
         self.custom_bracket = None
-        self.round_robin_matches = []
-        self.double_elim_losers = []
+        self.strategy = None
         self.finalists = []
         self.log_window = None
         self.top_n_enabled = False
@@ -210,46 +215,9 @@ class PhotoTournament:
                 print(f"Error loading saved state: {e}")
 
     def start_round(self):
-        if self.tournament_type == "Single Elimination":
-            self.start_single_elimination()
-        elif self.tournament_type == "Double Elimination":
-            self.start_double_elimination()
-        elif self.tournament_type == "Round Robin":
-            self.start_round_robin()
-        elif self.tournament_type == "One Round":
-            self.start_one_round()
-        elif self.tournament_type == "Custom":
-            self.start_custom_bracket()
-
-    def start_single_elimination(self):
-        self.round = 1
-        self.match_number = 0
-        self.winners = []
-        self.history.clear()
-        self.next_match()
-
-    def start_double_elimination(self):
-        self.round = 1
-        self.match_number = 0
-        self.winners = []
-        self.history.clear()
-        self.next_match()
-
-    def start_round_robin(self):
-        self.round = 1
-        self.match_number = 0
-        self.winners = []
-        self.history.clear()
-        self.next_match()
-
-    def start_one_round(self):
-        self.round = 1
-        self.match_number = 0
-        self.winners = []
-        self.history.clear()
-        self.next_match()
-
-    def start_custom_bracket(self):
+        top_n = self.top_n_value if self.top_n_enabled else None
+        self.strategy = create_strategy(self.tournament_type, self.photo_paths, num_choices=self.num_choices,
+                                        top_n=top_n, shuffle=self.shuffle)
         self.round = 1
         self.match_number = 0
         self.winners = []
@@ -261,18 +229,22 @@ class PhotoTournament:
         self.match_label.config(text=f"Match: {self.match_number}")
 
     def update_progress(self):
-        progress = (self.match_number / len(self.photo_paths)) * 100
+        total = self.strategy.total_matches
+        progress = (self.match_number / total) * 100 if total else 100
         self.progress['value'] = progress
 
     def next_match(self):
-        if self.match_number * 2 >= len(self.photo_paths):
+        choices = self.strategy.next_match()
+        if choices is None:
+            self.winners = self.strategy.ranking()
             self.show_winner()
             return
-        self.current_choices = self.photo_paths[self.match_number * 2:self.match_number * 2 + 2]
+        self.current_choices = choices
+        self.round = self.strategy.round
+        self.match_number = self.strategy.match_number
         self.display_current_choices()
         self.update_info()
         self.update_progress()
-        self.match_number += 1
         self.match_start_time = time.time()
 
     def display_current_choices(self):
@@ -308,17 +280,11 @@ class PhotoTournament:
             json.dump(state, f)
 
     def undo(self):
-        if not self.match_log:
+        if not self.match_log or not self.strategy.undo():
             return
-        last_match = self.match_log.pop()
-        self.round = last_match["round"]
-        self.match_number = last_match["match"]
+        self.match_log.pop()
         self.winners = self.winners[:-1]
-        self.photo_paths = self.photo_paths[:len(self.winners) * 2]
-        self.current_choices = self.photo_paths[self.match_number * 2:self.match_number * 2 + 2]
-        self.display_current_choices()
-        self.update_info()
-        self.update_progress()
+        self.next_match()
 
     def on_key_press(self, event):
         key = event.char
@@ -342,12 +308,17 @@ class PhotoTournament:
             self.make_choice_by_index(3)
 
     def make_choice_by_index(self, index):
+        if index >= len(self.current_choices):
+            return
         winner_photo = self.current_choices[index]
+        section = self.strategy.section
+        self.strategy.advance(index)
         self.winners.append(winner_photo)
         self.match_log.append({
             "round": self.round,
             "match": self.match_number,
-            "winner": winner_photo
+            "winner": winner_photo,
+            "bracket": section
         })
         self.next_match()
 
@@ -370,31 +341,34 @@ class PhotoTournament:
 
     def append_session_history(self):
         try:
-            if os.path.exists(SESSION_HISTORY_FILE):
-                with open(SESSION_HISTORY_FILE, "r") as f:
-                    history = json.load(f)
-            else:
-                history = []
-
-            history.append({
-                "timestamp": datetime.datetime.now().isoformat(),
-                "round": self.round,
-                "match_number": self.match_number,
-                "winners": self.winners,
-                "photo_paths": self.photo_paths,
-                "current_choices": self.current_choices,
-                "match_log": self.match_log,
-                "stats": self.stats
-            })
-
-            with open(SESSION_HISTORY_FILE, "w") as f:
-                json.dump(history, f)
+            store = SessionStore(SESSION_HISTORY_FILE, legacy_json_path=LEGACY_SESSION_HISTORY_FILE)
+            try:
+                store.append({
+                    "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+                    "folder": os.path.dirname(self.all_photos[0]) if self.all_photos else None,
+                    "tournament_type": self.tournament_type,
+                    "round": self.round,
+                    "match_number": self.match_number,
+                    "winners": self.winners,
+                    "photo_paths": self.photo_paths,
+                    "current_choices": self.current_choices,
+                    "match_log": self.match_log,
+                    "stats": self.stats
+                })
+            finally:
+                store.close()
         except Exception as e:
             messagebox.showerror("Error", f"Error saving session history: {e}")
 
     def show_tree(self):
-        # Tree view implementation here
-        pass
+        tree_win = tk.Toplevel(self.root)
+        tree_win.title("Tournament Tree")
+        view = BracketView(tree_win)
+        view.pack(fill=tk.BOTH, expand=True)
+        if hasattr(self.strategy, "bracket"):
+            view.show_bracket(self.strategy.bracket())
+        else:
+            view.load(self.match_log)
 
     def open_settings(self):
         # Settings window implementation here
@@ -27,14 +27,16 @@
 #     - __init__                  : Main initialization
 #     - load_valid_images         : Load only valid images
 #     - build_ui                  : Build main UI
-#     - on_resize                 : Handle window resize
+#     - on_resize                 : Handle window resize (debounced)
+#     - apply_resize              : Rescale photos to the new size
 #     - on_close                  : Save state and close
 #     - schedule_autosave         : Schedule auto-save
 #     - auto_save                 : Auto-save state
 #     - manual_save               : Manual save to emergency folder
 #     - check_for_saved_state     : Offer to restore session
-#     - start_round               : Start a new round
+#     - start_round               : Create the tournament engine
 #     - update_info               : Update round/match info
+#     - total_matches             : Matches in the current round
 #     - update_progress           : Update progress bar
 #     - next_match                : Load next match
 #     - display_current_choices   : Show current images
@@ -43,12 +45,16 @@
 #     - on_key_press              : Handle key presses
 #     - make_choice               : Process a choice
 #     - make_choice_by_index      : Process button choice
-#     - view_original             : Show original image with zoom
+#     - view_original             : Show original image with tiled zoom/pan
 #     - save_log_to_files         : Save tournament log
 #     - append_session_history    : Save session history
-#     - show_tree                 : Show tournament tree/log
+#     - show_tree                 : Show tournament tree (canvas bracket view)
+#     - append_to_log_views       : Add a match to the open tree/log windows
+#     - truncate_log_views        : Drop undone matches from the open tree/log windows
 #     - open_settings             : Open settings window
 #     - import_settings           : Import settings from file
+#     - format_log_entry          : One log window line
+#     - show_log_window           : Show tournament log and winners
 #     - show_winner               : Show final winner
 #     - restart                   : Restart tournament
 #
@@ -57,7 +63,7 @@
 # -----------------------------------------------------------------------------
 
 import os
-import random
+import sys
 import tkinter as tk
 from tkinter import messagebox, filedialog, ttk
 from PIL import Image, ImageTk
@@ -65,6 +71,16 @@ import json
 import time
 import datetime
 
+# UI-free helpers (session store, tournament engine) live in the FlashFrame-1 package next to this script
+FLASHFRAME_PACKAGE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "FlashFrame-1")
+if FLASHFRAME_PACKAGE_DIR not in sys.path:
+    sys.path.insert(0, FLASHFRAME_PACKAGE_DIR)
+from src.session_store import SessionStore
+from src.engine import create_strategy, strategy_from_state
+from src.bracket_view import BracketView
+from src.tiled_image import TiledImage, TiledImageViewer
+from src.image_cache import MasterImageCache
+
 # ------------------------------
 # ===== Quick Settings =====
 # ------------------------------
@@ -84,6 +100,7 @@ FINAL_PHOTO_SIZE = (500, 500)   # Size for the final image
 
 # Progress bar settings
 PROGRESS_BAR_LENGTH = 300       # Length of progress bar
+RESIZE_DEBOUNCE = 150           # ms after the last <Configure> before the photos are rescaled
 
 # Auto-save settings
 AUTO_SAVE_INTERVAL = 5000      # Auto-save interval in milliseconds (5 seconds)
@@ -105,8 +122,9 @@ DEFAULT_NUM_CHOICES = 2                         # Number of choices per match (2
 # Settings file for export/import
 SETTINGS_FILE = "tournament_settings.json"
 
-# Session history file
-SESSION_HISTORY_FILE = "session_history.json"
+# Session history store (SQLite, append-only) and the old JSON file it migrates from
+SESSION_HISTORY_FILE = "session_history.db"
+LEGACY_SESSION_HISTORY_FILE = "session_history.json"
 
 # Add new tournament types and settings
 TOURNAMENT_TYPES = [
@@ -114,7 +132,9 @@ TOURNAMENT_TYPES = [
     "Double Elimination",
     "Round Robin",
     "One Round",  # Новий тип
-    "Custom"
+    "Custom",
+    "Adaptive Rating",    # Glicko rating + most informative pairing, ~n*log2(n) decisions
+    "Merge Sort Ranking"  # Complete order by merge sort, ~n*log2(n) decisions
 ]
 
 # ------------------------------
@@ -150,10 +170,15 @@ class PhotoTournament:
         self.seeding = False
         self.custom_bracket = None
         # TODO: Implement custom bracket logic if needed
-        self.round_robin_matches = []
-        self.double_elim_losers = []
         self.finalists = []
+        self.strategy = None            # UI-free engine for the selected tournament type (src.engine)
+        self.saved_engine_state = None  # Engine state from the auto-save, used once on restore
         self.log_window = None
+        self.masters = MasterImageCache()  # Decoded photos, rescaled on resize instead of re-read
+        self.resize_job = None
+        self.log_text = None      # Text widget of the log window (appended to incrementally)
+        self.tree_window = None
+        self.bracket_view = None  # Canvas bracket view of the tree window
         # Initialize Top N selection attributes
         self.top_n_enabled = False
         self.top_n_value = 1
@@ -279,17 +304,29 @@ class PhotoTournament:
     def on_resize(self, event):
         """
         Called when the window is resized.
-        Dynamically scales images while maintaining their aspect ratio.
+        Debounced: the photos are rescaled once the window size stops changing.
         """
         try:
             if event.widget == self.root:
-                if abs(event.width - self.last_width) > 50:
-                    self.last_width = event.width
-                    scale = event.width / 800  # Base width is 800
-                    new_width = int(PHOTO_SIZE[0] * scale)
-                    new_height = int(PHOTO_SIZE[1] * scale)
-                    self.photo_size = (new_width, new_height)
-                    self.display_current_choices()
+                if self.resize_job is not None:
+                    self.root.after_cancel(self.resize_job)
+                self.resize_job = self.root.after(RESIZE_DEBOUNCE, self.apply_resize, event.width)
+        except Exception as e:
+            print(f"Resize error: {e}")
+
+    def apply_resize(self, width):
+        """
+        Scales the displayed images to the new window width, keeping their aspect ratio.
+        """
+        try:
+            self.resize_job = None
+            if abs(width - self.last_width) > 10:
+                self.last_width = width
+                scale = width / 800  # Base width is 800
+                new_width = int(PHOTO_SIZE[0] * scale)
+                new_height = int(PHOTO_SIZE[1] * scale)
+                self.photo_size = (new_width, new_height)
+                self.display_current_choices()
         except Exception as e:
             print(f"Resize error: {e}")
 
@@ -326,7 +363,8 @@ class PhotoTournament:
             "match_log": self.match_log,
             "stats": self.stats,
             "tournament_type": self.tournament_type,
-            "num_choices": self.num_choices
+            "num_choices": self.num_choices,
+            "engine_state": self.strategy.to_state() if self.strategy else None
         }
         try:
             with open(AUTO_SAVE_FILE, "w", encoding="utf-8") as f:
@@ -350,7 +388,8 @@ class PhotoTournament:
             "match_log": self.match_log,
             "stats": self.stats,
             "tournament_type": self.tournament_type,
-            "num_choices": self.num_choices
+            "num_choices": self.num_choices,
+            "engine_state": self.strategy.to_state() if self.strategy else None
         }
         timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
         emergency_file = os.path.join(EMERGENCY_SAVE_FOLDER, f"manual_save_{timestamp}.json")
@@ -379,6 +418,7 @@ class PhotoTournament:
                     self.stats = state.get("stats", self.stats)
                     self.tournament_type = state.get("tournament_type", DEFAULT_TOURNAMENT_TYPE)
                     self.num_choices = state.get("num_choices", DEFAULT_NUM_CHOICES)
+                    self.saved_engine_state = state.get("engine_state")
                     for widget in self.root.winfo_children():
                         widget.destroy()
                     self.build_ui()
@@ -388,27 +428,18 @@ class PhotoTournament:
 
     def start_round(self):
         """
-        Prepares and starts a new round, supporting multiple tournament types and Top N.
+        Creates the tournament engine for the selected type (or restores it from the auto-save)
+        and loads the first match. All bracket logic lives in src.engine.
         """
         try:
-            if self.shuffle and self.tournament_type not in ("Round Robin", "One Round"):
-                random.shuffle(self.photo_paths)
-            self.match_number = 0
+            self.strategy = strategy_from_state(self.saved_engine_state)
+            self.saved_engine_state = None
+            if self.strategy is None:
+                top_n = self.top_n_value if self.top_n_enabled else None
+                self.strategy = create_strategy(self.tournament_type, self.photo_paths, num_choices=self.num_choices,
+                                                top_n=top_n, shuffle=self.shuffle)
             self.winners = []
             self.history.clear()
-            # Prepare round robin matches if needed
-            if self.tournament_type == "Round Robin":
-                self.round_robin_matches = []
-                for i in range(len(self.photo_paths)):
-                    for j in range(i+1, len(self.photo_paths)):
-                        self.round_robin_matches.append([self.photo_paths[i], self.photo_paths[j]])
-                random.shuffle(self.round_robin_matches)
-            # One Round: всі фото по 2/4, але лише 1 раунд
-            if self.tournament_type == "One Round":
-                self.round = 1
-            # TODO: Add support for additional tournament types if needed
-            self.update_info()
-            self.update_progress()
             self.next_match()
         except Exception as e:
             messagebox.showerror("Round Error", f"Error starting round:\n{e}")
@@ -418,18 +449,28 @@ class PhotoTournament:
         Updates the info label showing the current round and match number.
         """
         try:
-            total_matches = len(self.photo_paths) // self.num_choices
+            total_matches = self.total_matches()
             text = f"Round {self.round} | Match {self.match_number+1} of {total_matches}"
+            if self.strategy is not None and self.strategy.section:
+                text = f"{self.strategy.section} | {text}"
             self.info_label.config(text=text)
         except Exception as e:
             print(f"Error updating info: {e}")
 
+    def total_matches(self):
+        """
+        Returns the number of matches in the current round (whole tournament for ranking types).
+        """
+        if self.strategy:
+            return self.strategy.total_matches
+        return len(self.photo_paths) // self.num_choices
+
     def update_progress(self):
         """
         Updates the progress bar.
         """
         try:
-            total_matches = len(self.photo_paths) // self.num_choices
+            total_matches = self.total_matches()
             value = (self.match_number / total_matches) * 100 if total_matches else 100
             self.progress['value'] = value
             self.root.update_idletasks()
@@ -438,110 +479,19 @@ class PhotoTournament:
 
     def next_match(self):
         """
-        Loads the next set of images for the current match, supporting multiple tournament types and Top N.
+        Loads the next set of images from the tournament engine, or shows the result when it is finished.
         """
         try:
-            if self.tournament_type == "Round Robin":
-                if self.match_number >= len(self.round_robin_matches):
-                    # Determine winner by most wins
-                    win_counts = {}
-                    for entry in self.match_log:
-                        win_counts[entry['winner']] = win_counts.get(entry['winner'], 0) + 1
-                    sorted_winners = sorted(win_counts.items(), key=lambda x: -x[1])
-                    self.photo_paths = [w[0] for w in sorted_winners]
-                    self.show_winner()
-                    return
-                self.current_choices = self.round_robin_matches[self.match_number]
-                self.display_current_choices()
-                self.match_number += 1
-                self.update_info()
-                self.update_progress()
-                self.match_start_time = time.time()
+            choices = self.strategy.next_match()
+            if choices is None:
+                # Ranked result (winner first, or Top N)
+                self.photo_paths = self.strategy.ranking()
+                self.show_winner()
                 return
-
-            # Double Elimination logic (simplified)
-            if self.tournament_type == "Double Elimination":
-                # TODO: Improve double elimination logic for losers bracket and finals
-                total = len(self.photo_paths)
-                if self.match_number * self.num_choices >= total:
-                    remainder = total - self.match_number * self.num_choices
-                    if remainder > 0:
-                        self.winners.extend(self.photo_paths[-remainder:])
-                    if len(self.winners) == 1:
-                        self.photo_paths = self.winners.copy()
-                        self.show_winner()
-                        return
-                    # Losers go to losers bracket
-                    self.double_elim_losers.extend([p for p in self.photo_paths if p not in self.winners])
-                    self.photo_paths = self.winners.copy()
-                    self.round += 1
-                    self.start_round()
-                    return
-                start = self.match_number * self.num_choices
-                self.current_choices = self.photo_paths[start:start+self.num_choices]
-                self.display_current_choices()
-                self.match_number += 1
-                self.update_info()
-                self.update_progress()
-                self.match_start_time = time.time()
-                return
-
-            # One Round: тільки один раунд, потім вибираємо Top N
-            if self.tournament_type == "One Round":
-                total = len(self.photo_paths)
-                if self.match_number * self.num_choices >= total:
-                    remainder = total - self.match_number * self.num_choices
-                    if remainder > 0:
-                        self.winners.extend(self.photo_paths[-remainder:])
-                    # Top N логіка
-                    if self.top_n_enabled:
-                        # Підрахунок кількості перемог для кожного фото
-                        win_counts = {}
-                        for entry in self.match_log:
-                            win_counts[entry['winner']] = win_counts.get(entry['winner'], 0) + 1
-                        sorted_winners = sorted(win_counts.items(), key=lambda x: -x[1])
-                        self.photo_paths = [w[0] for w in sorted_winners[:self.top_n_value]]
-                    else:
-                        self.photo_paths = self.winners.copy()
-                    self.show_winner()
-                    return
-                start = self.match_number * self.num_choices
-                self.current_choices = self.photo_paths[start:start+self.num_choices]
-                self.display_current_choices()
-                self.match_number += 1
-                self.update_info()
-                self.update_progress()
-                self.match_start_time = time.time()
-                return
-
-            # Single Elimination and Custom
-            total = len(self.photo_paths)
-            if self.match_number * self.num_choices >= total:
-                remainder = total - self.match_number * self.num_choices
-                if remainder > 0:
-                    self.winners.extend(self.photo_paths[-remainder:])
-                # Top N логіка
-                if self.top_n_enabled and len(self.winners) > self.top_n_value:
-                    win_counts = {}
-                    for entry in self.match_log:
-                        win_counts[entry['winner']] = win_counts.get(entry['winner'], 0) + 1
-                    sorted_winners = sorted(win_counts.items(), key=lambda x: -x[1])
-                    self.photo_paths = [w[0] for w in sorted_winners[:self.top_n_value]]
-                    self.show_winner()
-                    return
-                if len(self.winners) == 1 or (self.top_n_enabled and len(self.winners) <= self.top_n_value):
-                    self.photo_paths = self.winners.copy()
-                    self.show_winner()
-                    return
-                self.photo_paths = self.winners.copy()
-                self.round += 1
-                self.start_round()
-                return
-
-            start = self.match_number * self.num_choices
-            self.current_choices = self.photo_paths[start:start+self.num_choices]
+            self.current_choices = choices
+            self.round = self.strategy.round
+            self.match_number = self.strategy.match_number
             self.display_current_choices()
-            self.match_number += 1
             self.update_info()
             self.update_progress()
             self.match_start_time = time.time()
@@ -551,16 +501,20 @@ class PhotoTournament:
     def display_current_choices(self):
         """
         Displays the current set of images.
-        Uses the thumbnail method to preserve aspect ratio.
+        Images are scaled from decoded masters (aspect ratio preserved), so the files are read once.
         Handles exceptions if a widget is missing.
         """
+        # Clear labels not used by this match (pairwise engines with 4 labels)
+        for lbl in self.image_labels[len(self.current_choices):]:
+            if lbl.winfo_exists():
+                lbl.config(image="")
+                lbl.image = None
         for i, path in enumerate(self.current_choices):
             try:
                 if not self.image_labels[i].winfo_exists():
                     print(f"Widget for index {i} does not exist. Skipping update for this widget.")
                     continue
-                img = Image.open(path)
-                img.thumbnail(self.photo_size, Image.Resampling.LANCZOS)
+                img = self.masters.scaled(path, self.photo_size)
                 photo_img = ImageTk.PhotoImage(img)
                 self.image_labels[i].config(image=photo_img)
                 self.image_labels[i].image = photo_img  # Keep reference
@@ -580,7 +534,8 @@ class PhotoTournament:
                 "photo_paths": self.photo_paths.copy(),
                 "current_choices": self.current_choices.copy(),
                 "match_log": self.match_log.copy(),
-                "stats": self.stats.copy()
+                "stats": self.stats.copy(),
+                "engine_decisions": self.strategy.decisions if self.strategy else 0
             }
             self.history.append(snapshot)
         except Exception as e:
@@ -603,6 +558,10 @@ class PhotoTournament:
             self.current_choices = snapshot["current_choices"]
             self.match_log = snapshot["match_log"]
             self.stats = snapshot["stats"]
+            if self.strategy:
+                while self.strategy.decisions > snapshot["engine_decisions"]:
+                    self.strategy.undo()
+            self.truncate_log_views()
             self.display_current_choices()
             self.update_info()
             self.update_progress()
@@ -634,13 +593,6 @@ class PhotoTournament:
         Updates statistics and logs the result.
         """
         try:
-            self.save_state()  # Save state for undo
-            decision_time = time.time() - self.match_start_time
-            self.stats["total_decision_time"] += decision_time
-            self.stats["num_decisions"] += 1
-            if key in self.stats["selection_counts"]:
-                self.stats["selection_counts"][key] += 1
-
             # Map key to index for current_choices
             index = 0
             if self.num_choices == 2:
@@ -648,16 +600,31 @@ class PhotoTournament:
             elif self.num_choices == 4:
                 mapping = {KEY_LEFT: 0, KEY_RIGHT: 1, KEY_OPTION3: 2, KEY_OPTION4: 3}
                 index = mapping.get(key, 0)
+            if index >= len(self.current_choices):
+                return  # Pairwise match shown with 4 choice keys
+            if self.strategy.next_match() != self.current_choices:
+                return  # Previous choice is still being processed
+
+            self.save_state()  # Save state for undo
+            decision_time = time.time() - self.match_start_time
+            self.stats["total_decision_time"] += decision_time
+            self.stats["num_decisions"] += 1
+            if key in self.stats["selection_counts"]:
+                self.stats["selection_counts"][key] += 1
+
             winner_photo = self.current_choices[index]
             log_entry = {
                 "round": self.round,
                 "match": self.match_number,
                 "choices": self.current_choices,
                 "winner": winner_photo,
-                "decision_time": decision_time
+                "decision_time": decision_time,
+                "bracket": self.strategy.section
             }
             self.match_log.append(log_entry)
             self.winners.append(winner_photo)
+            self.strategy.advance(index)
+            self.append_to_log_views(log_entry)
             self.root.after(300, self.next_match)
         except Exception as e:
             messagebox.showerror("Choice Error", f"Error processing choice:\n{e}")
@@ -679,59 +646,32 @@ class PhotoTournament:
     def view_original(self, image_path):
         """
         Opens a new window to display the original image with zoom controls.
+        The image is shown as tiles of a lazily built pyramid (src.tiled_image), so zooming
+        only resamples the visible part. Mouse wheel zooms, dragging pans.
         """
         if not os.path.exists(image_path):
             messagebox.showerror("Error", f"File '{image_path}' not found.")
             return
         try:
+            image = TiledImage(image_path)
             top = tk.Toplevel(self.root)
             top.title("View Original")
-            img = Image.open(image_path)
+            top.geometry("1000x750")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load image:\n{e}")
             return
 
-        frame = tk.Frame(top)
-        frame.pack(fill=tk.BOTH, expand=True)
-        canvas = tk.Canvas(frame)
-        canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        vbar = tk.Scrollbar(frame, orient=tk.VERTICAL, command=canvas.yview)
-        vbar.pack(side=tk.RIGHT, fill=tk.Y)
-        hbar = tk.Scrollbar(top, orient=tk.HORIZONTAL, command=canvas.xview)
-        hbar.pack(side=tk.BOTTOM, fill=tk.X)
-        canvas.configure(yscrollcommand=vbar.set, xscrollcommand=hbar.set)
-
-        zoom_factor = 1.0
-
-        def update_image():
-            nonlocal zoom_factor, img, canvas
-            try:
-                w, h = img.size
-                new_size = (int(w * zoom_factor), int(h * zoom_factor))
-                resized = img.resize(new_size, Image.Resampling.LANCZOS)
-                photo_img = ImageTk.PhotoImage(resized)
-                canvas.delete("all")
-                canvas.create_image(0, 0, anchor="nw", image=photo_img)
-                canvas.image = photo_img
-                canvas.config(scrollregion=(0, 0, new_size[0], new_size[1]))
-            except Exception as e:
-                messagebox.showerror("Zoom Error", f"Failed to update zoomed image:\n{e}")
-
-        def zoom_in():
-            nonlocal zoom_factor
-            zoom_factor *= 1.25
-            update_image()
-
-        def zoom_out():
-            nonlocal zoom_factor
-            zoom_factor /= 1.25
-            update_image()
+        viewer = TiledImageViewer(top, image)
+        viewer.pack(fill=tk.BOTH, expand=True)
 
         zoom_frame = tk.Frame(top)
         zoom_frame.pack(pady=5)
-        tk.Button(zoom_frame, text="Zoom In", command=zoom_in).pack(side=tk.LEFT, padx=5)
-        tk.Button(zoom_frame, text="Zoom Out", command=zoom_out).pack(side=tk.LEFT, padx=5)
-        update_image()
+        tk.Button(zoom_frame, text="Zoom In", command=lambda: viewer.zoom_by(1.25)).pack(side=tk.LEFT, padx=5)
+        tk.Button(zoom_frame, text="Zoom Out", command=lambda: viewer.zoom_by(0.8)).pack(side=tk.LEFT, padx=5)
+        tk.Button(zoom_frame, text="Fit", command=lambda: viewer.fit(viewer.canvas.winfo_width(), viewer.canvas.winfo_height())).pack(side=tk.LEFT, padx=5)
+        tk.Button(zoom_frame, text="100%", command=lambda: viewer.set_zoom(1.0)).pack(side=tk.LEFT, padx=5)
+        top.update_idletasks()
+        viewer.fit(viewer.canvas.winfo_width(), viewer.canvas.winfo_height())
 
     def save_log_to_files(self):
         """
@@ -748,55 +688,89 @@ class PhotoTournament:
                     f.write(f"{i+1}. {winner}\n")
                 if self.photo_paths:
                     f.write("\nFinal Winner: " + self.photo_paths[0] + "\n")
+            # Compact JSON: these logs are read back in bulk by src.analytics
             with open("tournament_log.json", "w", encoding="utf-8") as f_json:
                 json.dump({
                     "matches": self.match_log,
                     "winners": self.photo_paths
-                }, f_json, ensure_ascii=False, indent=4)
+                }, f_json, ensure_ascii=False, separators=(",", ":"))
         except Exception as e:
             messagebox.showerror("Log Save Error", f"Failed to save tournament log:\n{e}")
 
     def append_session_history(self):
         """
-        Appends the current session (match log and statistics) to the session history file.
+        Appends the current session (match log and statistics) to the session history store.
         """
         session = {
-            "timestamp": time.ctime(),
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "folder": os.path.dirname(self.all_photos[0]) if self.all_photos else None,
+            "tournament_type": self.tournament_type,
             "match_log": self.match_log,
             "stats": self.stats
         }
-        history = []
-        if os.path.exists(SESSION_HISTORY_FILE):
-            try:
-                with open(SESSION_HISTORY_FILE, "r", encoding="utf-8") as f:
-                    history = json.load(f)
-            except Exception as e:
-                print(f"Error reading session history: {e}")
-                history = []
-        history.append(session)
         try:
-            with open(SESSION_HISTORY_FILE, "w", encoding="utf-8") as f:
-                json.dump(history, f, ensure_ascii=False, indent=4)
+            store = SessionStore(SESSION_HISTORY_FILE, legacy_json_path=LEGACY_SESSION_HISTORY_FILE)
+            try:
+                store.append(session)
+            finally:
+                store.close()
         except Exception as e:
             messagebox.showerror("Session History Error", f"Failed to save session history:\n{e}")
 
     def show_tree(self):
         """
-        Opens a new window displaying a simple text-based tournament tree based on the match log.
+        Opens the tournament tree: a canvas bracket view that draws only the visible matches
+        and is updated as decisions are made. Strategies with a bracket() (double elimination)
+        show their pending matches and links between rounds.
         """
         try:
-            tree_win = tk.Toplevel(self.root)
-            tree_win.title("Tournament Tree")
-            text_area = tk.Text(tree_win, width=80, height=20)
-            text_area.pack(fill=tk.BOTH, expand=True)
-            tree_text = f"Tournament Tree (Round {self.round})\n"
-            tree_text += "----------------------------\n"
-            for entry in self.match_log:
-                tree_text += f"R{entry['round']} M{entry['match']}: {entry['choices']} -> Winner: {entry['winner']}\n"
-            text_area.insert(tk.END, tree_text)
+            if self.tree_window and tk.Toplevel.winfo_exists(self.tree_window):
+                self.tree_window.lift()
+                return
+            self.tree_window = tk.Toplevel(self.root)
+            self.tree_window.title(f"Tournament Tree - {self.tournament_type}")
+            self.tree_window.geometry("900x600")
+            self.bracket_view = BracketView(self.tree_window)
+            self.bracket_view.pack(fill=tk.BOTH, expand=True)
+            if hasattr(self.strategy, "bracket"):
+                self.bracket_view.show_bracket(self.strategy.bracket())
+            else:
+                self.bracket_view.load(self.match_log)
         except Exception as e:
             messagebox.showerror("Tree Error", f"Error displaying tournament tree:\n{e}")
 
+    def append_to_log_views(self, entry):
+        """
+        Adds one match to the tree and log windows if they are open (no full rebuild).
+        """
+        try:
+            if self.tree_window and tk.Toplevel.winfo_exists(self.tree_window):
+                if hasattr(self.strategy, "bracket"):
+                    self.bracket_view.show_bracket(self.strategy.bracket())
+                else:
+                    self.bracket_view.add_match(entry)
+            if self.log_window and tk.Toplevel.winfo_exists(self.log_window):
+                self.log_text.insert("log_end", self.format_log_entry(entry))
+        except Exception as e:
+            print(f"Error updating log views: {e}")
+
+    def truncate_log_views(self):
+        """
+        Removes matches that are no longer in match_log (after an undo) from the open windows.
+        """
+        try:
+            count = len(self.match_log)
+            if self.tree_window and tk.Toplevel.winfo_exists(self.tree_window):
+                if hasattr(self.strategy, "bracket"):
+                    self.bracket_view.show_bracket(self.strategy.bracket())
+                else:
+                    self.bracket_view.truncate(count)
+            if self.log_window and tk.Toplevel.winfo_exists(self.log_window):
+                # Log lines start on line 3, after the two header lines
+                self.log_text.delete(f"{count + 3}.0", "log_end")
+        except Exception as e:
+            print(f"Error updating log views: {e}")
+
     def open_settings(self):
         """
         Opens a settings window for adjusting configuration, with advanced options.
@@ -960,9 +934,16 @@ class PhotoTournament:
         else:
             messagebox.showinfo("Settings", "No settings file found.")
 
+    def format_log_entry(self, entry):
+        """
+        Returns one line of the log window for a match_log entry.
+        """
+        return f"Round {entry['round']}, Match {entry['match']}: {entry['choices']} -> Winner: {entry['winner']} (Time: {entry['decision_time']:.2f}s)\n"
+
     def show_log_window(self):
         """
         Opens a window to view the tournament log and numbered winners.
+        New matches are appended to it while it is open.
         """
         try:
             if self.log_window and tk.Toplevel.winfo_exists(self.log_window):
@@ -970,16 +951,17 @@ class PhotoTournament:
                 return
             self.log_window = tk.Toplevel(self.root)
             self.log_window.title("Tournament Log & Winners")
-            text_area = tk.Text(self.log_window, width=100, height=30)
-            text_area.pack(fill=tk.BOTH, expand=True)
+            self.log_text = tk.Text(self.log_window, width=100, height=30)
+            self.log_text.pack(fill=tk.BOTH, expand=True)
             # Build log text
-            log_text = "Tournament Log\n====================\n"
-            for idx, entry in enumerate(self.match_log):
-                log_text += f"Round {entry['round']}, Match {entry['match']}: {entry['choices']} -> Winner: {entry['winner']} (Time: {entry['decision_time']:.2f}s)\n"
-            log_text += "\nWinners (Ranked):\n-----------------\n"
-            for i, winner in enumerate(self.photo_paths):
-                log_text += f"{i+1}. {winner}\n"
-            text_area.insert(tk.END, log_text)
+            self.log_text.insert(tk.END, "Tournament Log\n====================\n")
+            self.log_text.insert(tk.END, "".join(self.format_log_entry(entry) for entry in self.match_log))
+            # New log lines go in front of this mark, i.e. before the winners list
+            self.log_text.mark_set("log_end", tk.END + "-1c")
+            self.log_text.mark_gravity("log_end", tk.LEFT)
+            winners = "".join(f"{i+1}. {winner}\n" for i, winner in enumerate(self.photo_paths))
+            self.log_text.insert(tk.END, "\nWinners (Ranked):\n-----------------\n" + winners)
+            self.log_text.mark_gravity("log_end", tk.RIGHT)
             # TODO: Add export button for log or advanced log filtering
         except Exception as e:
             messagebox.showerror("Log Error", f"Failed to show log:\n{e}")
@@ -1015,6 +997,13 @@ class PhotoTournament:
         """
         try:
             self.photo_paths = self.all_photos.copy()
+            self.strategy = None
+            # The tree and log windows show the old tournament
+            for window in (self.tree_window, self.log_window):
+                if window and tk.Toplevel.winfo_exists(window):
+                    window.destroy()
+            self.tree_window = self.bracket_view = None
+            self.log_window = self.log_text = None
             for widget in self.root.winfo_children():
                 widget.destroy()
             self.build_ui()
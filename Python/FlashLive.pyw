@@ -19,13 +19,19 @@
 # -----------------------------------------------------------------------------
 # Program Structure Overview (for quick navigation)
 # - GlobalConfig: Configuration management (JSON/YAML)
-# - RecognitionEngine: Video capture, gesture/face recognition, overlay
-# - LogicEngine: Maps recognition results to actions/macros
+# - StageMetrics / FrameSlot / FrameBus: Pipeline metrics, latest-frame notifier, ring of frame buffers (shared memory)
+# - FrameSource: Webcam/video file, image sequence and synthetic frame sources (paced/unpaced)
+# - AdaptiveScheduler: Downscaled detection, ROI tracking and resolution tuning for target_fps
+# - RecognitionEngine: Capture thread, inference workers, results channel, overlay
+# - VideoPresenter: BGR frame -> reused Tk PhotoImage via a preallocated PPM buffer
+# - LogicEngine: Event-driven (gesture, expression) dispatch table with debounce, action thread
 # - MacroEngine: Macro execution for gestures/expressions
 # - AutomationEngine: Automation script runner
-# - PluginManager: Dynamic plugin loader and runner
+# - PluginManager: Manifest scan, lazy import, time budgets, isolated plugins in worker processes (flashlive_plugin_worker.py, SharedMemory frames)
 # - FlashLiveAPI: API for plugins/macros/external scripts
+# - SessionRecorder / replay_session: Background .npz session recording and offline replay
 # - SessionManager: Session/profile/history management
+# - StageTimer / run_benchmark: Headless benchmark (--benchmark) with per-stage wall/CPU time
 # - FlashLiveApp (tk.Tk): Main GUI, settings, video, status, update loop
 # -----------------------------------------------------------------------------
 import tkinter as tk
@@ -36,10 +42,44 @@ import numpy as np
 import json
 import yaml
 import time
+import queue
+import os
+import glob
+import sys
+import argparse
+import contextlib
+import secrets
+import multiprocessing
+import subprocess
+from multiprocessing import shared_memory
+from multiprocessing.connection import Client, Listener
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
+from flashlive_plugin_worker import import_plugin_module, attach_shared_memory
 
 # TODO: Додати імпорт сторонніх бібліотек для розпізнавання жестів/обличчя (наприклад, mediapipe, face_recognition, pyautogui, etc.)
 
 # ----------------- Глобальні змінні та конфігурація -----------------
+RESULTS_QUEUE_SIZE = 64      # Результати розпізнавання з мітками часу (найстаріші відкидаються)
+ACTION_QUEUE_SIZE = 32       # Дії (макроси/сценарії), що чекають виконання
+PLUGIN_TIMEOUT_MS = 50       # Бюджет часу одного виклику плагіна за замовчуванням
+PLUGIN_STARTUP_TIMEOUT_MS = 10000  # Запуск процесу ізольованого плагіна (не входить у бюджет виклику)
+PLUGIN_MAX_TIMEOUTS = 5      # Тайм-аутів поспіль, після яких плагін вимикається
+PLUGIN_QUEUE_SIZE = 4        # Результати, що чекають плагінів (найстаріші відкидаються)
+RECORD_QUEUE_SIZE = 256      # Результати, що чекають запису на диск (найстаріші відкидаються)
+RECORD_CHUNK_FRAMES = 512    # Кадрів в одному чанку .npz
+RECORD_MAX_HANDS = 2
+RECORD_MAX_LANDMARKS = 21
+CAPTURE_REOPEN_AFTER = 100   # Невдалих read() поспіль, після яких камера перевідкривається
+VIDEO_SIZE = (800, 600)      # Розмір відеопанелі (px)
+GUI_INTERVAL_MS = 30         # Період оновлення GUI
+FRAME_BUS_SLOTS = 8          # Буферів у кільці кадрів (показ, розпізнавання, плагіни, експорт)
+DISPLAY_BUDGET_MS = 8.0      # Бюджет часу на показ одного кадру (конвертація + передача в Tk)
+ADAPTIVE_START_SCALE = 0.5   # Початковий масштаб кадру для детекції рук/обличчя
+ADAPTIVE_MIN_SCALE = 0.25
+ADAPTIVE_COOLDOWN = 15       # Кадрів між змінами масштабу/частоти детекції
+ROI_MARGIN = 0.2             # Запас навколо області інтересу (частка розміру)
+ROI_MAX_MISSES = 3           # Кадрів без об'єкта в ROI, після яких область відкидається
+
 class GlobalConfig:
     def __init__(self, config_path="flashlive_config.json"):
         self.config_path = config_path
@@ -57,11 +97,18 @@ class GlobalConfig:
             "media_player": "default",
             "media_type": "audio",
             "media_control_mode": "global",
-            "export_format": "json",
-            "export_path": "flashlive_export.json",
+            "export_format": "npz",
+            "export_path": "flashlive_sessions",
             "export_frequency": 10,
             "plugins": {},
+            "plugin_dir": "plugins",
             "developer_mode": False,
+            "inference_workers": 1,
+            "frame_bus_shared": False,
+            "target_fps": 15,
+            "gesture_debounce_ms": 150,
+            "gesture_release_ms": 300,
+            "redetect_interval": 10,
             "sessions": [],
             "profiles": {},
             "active_profile": "default"
@@ -91,58 +138,709 @@ class GlobalConfig:
         except Exception as e:
             print("Config save error:", e)
 
+# ----------------- Конвеєр кадрів: метрики та слот останнього кадру -----------------
+class StageMetrics:
+    # FPS і затримка етапу конвеєра (експоненційне згладжування), для режиму розробника
+    def __init__(self, alpha=0.1):
+        self.alpha = alpha
+        self.count = 0
+        self.fps = 0.0
+        self.latency_ms = 0.0
+        self._last_tick = None
+        self._lock = threading.Lock()
+
+    def tick(self, latency=None):
+        now = time.perf_counter()
+        with self._lock:
+            self.count += 1
+            if self._last_tick is not None and now > self._last_tick:
+                fps = 1.0 / (now - self._last_tick)
+                self.fps = fps if self.count == 2 else self.fps + self.alpha * (fps - self.fps)
+            self._last_tick = now
+            if latency is not None:
+                ms = latency * 1000.0
+                self.latency_ms = ms if self.count == 1 else self.latency_ms + self.alpha * (ms - self.latency_ms)
+
+    def snapshot(self):
+        with self._lock:
+            return {"fps": round(self.fps, 1), "latency_ms": round(self.latency_ms, 1), "count": self.count}
+
+class FrameSlot:
+    # Номер останнього кадру в FrameBus: захоплення його оновлює, а воркер розпізнавання
+    # бере найновіший ще не взятий номер. Пропущені кадри рахуються як відкинуті.
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._seq = 0
+        self._timestamp = 0.0
+        self._taken = 0
+        self._closed = False
+        self.dropped = 0
+
+    def put(self, seq, timestamp):
+        with self._cond:
+            self._seq = seq
+            self._timestamp = timestamp
+            self._cond.notify()
+
+    def take(self, timeout=0.5):
+        # Повертає (seq, timestamp) або None, якщо нового кадру немає
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._closed or self._seq > self._taken, timeout):
+                return None
+            if self._closed:
+                return None
+            self.dropped += self._seq - self._taken - 1
+            self._taken = self._seq
+            return self._seq, self._timestamp
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+class FrameBus:
+    # Кільце попередньо виділених буферів кадрів (за потреби — у SharedMemory для інших процесів).
+    # Захоплення копіює кадр у найстаріший незакріплений слот і отримує номер seq; споживачі
+    # (розпізнавання, показ, плагіни, експорт) беруть кадр за seq через acquire/release і читають
+    # його напряму з кільця, без копіювання. Закріплений слот не перезаписується (back-pressure);
+    # якщо закріплені всі слоти, новий кадр відкидається і рахується в dropped.
+    # Заголовок у тому ж блоці пам'яті: seq і мітка часу кожного слоту, кількість закріплень, лічильники.
+    # first_seq — останній seq попереднього кільця, щоб номери кадрів лише зростали при зміні розміру.
+    def __init__(self, shape, dtype=np.uint8, slots=FRAME_BUS_SLOTS, shared=False, first_seq=0):
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.slots = slots
+        self.shm = None
+        self.owner = True
+        if shared:
+            self.lock = multiprocessing.get_context("spawn").Lock()
+            self.shm = shared_memory.SharedMemory(create=True, size=self._size())
+            buffer = self.shm.buf
+        else:
+            self.lock = threading.Lock()
+            buffer = bytearray(self._size())
+        self._bind(buffer)
+        self.seqs[:] = 0
+        self.counters[:] = 0
+        self.counters[0] = first_seq
+
+    def _frame_bytes(self):
+        return int(np.prod(self.shape)) * self.dtype.itemsize
+
+    def _size(self):
+        return self.slots * self._frame_bytes() + self.slots * 3 * 8 + 3 * 8
+
+    def _bind(self, buffer):
+        offset = self.slots * self._frame_bytes()
+        self.frames = np.ndarray((self.slots,) + self.shape, dtype=self.dtype, buffer=buffer)
+        self.seqs = np.ndarray(self.slots, dtype=np.int64, buffer=buffer, offset=offset)
+        self.stamps = np.ndarray(self.slots, dtype=np.float64, buffer=buffer, offset=offset + self.slots * 8)
+        self.pins = np.ndarray(self.slots, dtype=np.int64, buffer=buffer, offset=offset + self.slots * 16)
+        # published (останній seq), dropped (усі слоти закріплені), overwritten (кадр уже витіснено)
+        self.counters = np.ndarray(3, dtype=np.int64, buffer=buffer, offset=offset + self.slots * 24)
+
+    def descriptor(self):
+        # Передається в multiprocessing.Process(args=...) для FrameBus.attach() в іншому процесі
+        return {"name": self.shm.name, "shape": self.shape, "dtype": self.dtype.str, "slots": self.slots, "lock": self.lock}
+
+    @classmethod
+    def attach(cls, descriptor):
+        bus = cls.__new__(cls)
+        bus.shape = tuple(descriptor["shape"])
+        bus.dtype = np.dtype(descriptor["dtype"])
+        bus.slots = descriptor["slots"]
+        bus.lock = descriptor["lock"]
+        bus.shm = attach_shared_memory(descriptor["name"])
+        bus.owner = False
+        bus._bind(bus.shm.buf)
+        return bus
+
+    def publish(self, frame, timestamp):
+        # Повертає seq кадру або 0, якщо вільного слоту немає
+        with self.lock:
+            free = np.flatnonzero(self.pins == 0)
+            if not len(free):
+                self.counters[1] += 1
+                return 0
+            slot = int(free[np.argmin(self.seqs[free])])
+            self.seqs[slot] = -1  # Слот пишеться: acquire його не знайде
+        np.copyto(self.frames[slot], frame)
+        with self.lock:
+            seq = int(self.counters[0]) + 1
+            self.seqs[slot] = seq
+            self.stamps[slot] = timestamp
+            self.counters[0] = seq
+        return seq
+
+    def latest_seq(self):
+        return int(self.counters[0])
+
+    def acquire(self, seq=None):
+        # Закріплює кадр: (seq, timestamp, view тільки для читання) або None, якщо кадр уже витіснено
+        with self.lock:
+            if self.seqs is None:
+                return None  # Кільце вже закрите
+            if seq is None:
+                seq = int(self.counters[0])
+            slots = np.flatnonzero(self.seqs == seq) if seq > 0 else ()
+            if not len(slots):
+                if seq > 0:
+                    self.counters[2] += 1
+                return None
+            slot = int(slots[0])
+            self.pins[slot] += 1
+            timestamp = float(self.stamps[slot])
+        view = self.frames[slot].view()
+        view.flags.writeable = False
+        return seq, timestamp, view
+
+    def release(self, seq):
+        with self.lock:
+            if self.seqs is None:
+                return
+            slots = np.flatnonzero(self.seqs == seq)
+            if len(slots) and self.pins[slots[0]] > 0:
+                self.pins[slots[0]] -= 1
+
+    @contextlib.contextmanager
+    def read(self, seq=None):
+        item = self.acquire(seq)
+        try:
+            yield item
+        finally:
+            if item is not None:
+                self.release(item[0])
+
+    def stats(self):
+        with self.lock:
+            return {"published": int(self.counters[0]), "dropped": int(self.counters[1]),
+                    "overwritten": int(self.counters[2]), "pinned": int((self.pins > 0).sum())}
+
+    def close(self, only_idle=False):
+        # only_idle: не закривати, поки якийсь кадр закріплений. Повертає True, якщо кільце закрите
+        with self.lock:
+            if only_idle and self.pins is not None and self.pins.any():
+                return False
+            # Масиви-види мають зникнути до закриття блоку пам'яті; acquire після close повертає None
+            self.frames = self.seqs = self.stamps = self.pins = self.counters = None
+        if self.shm is not None:
+            self.shm.close()
+            if self.owner:
+                self.shm.unlink()
+            self.shm = None
+        return True
+
+# ----------------- Джерела кадрів -----------------
+class FrameSource:
+    # Базове джерело: read() -> (ok, frame). paced=True віддає кадри з частотою запису (fps),
+    # paced=False — якнайшвидше (для бенчмарків). finished стає True, коли кадри скінчились.
+    live = False
+
+    def __init__(self, fps=30.0, paced=True):
+        self.fps = fps or 30.0
+        self.paced = paced
+        self.finished = False
+        self._next_time = None
+
+    def _pace(self):
+        if not self.paced:
+            return
+        now = time.perf_counter()
+        if self._next_time is None or now - self._next_time > 1.0:
+            self._next_time = now  # Початок або велике відставання: не "наздоганяємо" пачкою кадрів
+        elif self._next_time > now:
+            time.sleep(self._next_time - now)
+        self._next_time += 1.0 / self.fps
+
+    def read(self):
+        raise NotImplementedError
+
+    def reopen(self):
+        pass
+
+    def release(self):
+        pass
+
+class CaptureSource(FrameSource):
+    # Веб-камера (індекс) або відеофайл через cv2.VideoCapture
+    def __init__(self, source, paced=True):
+        self.source = source
+        self.live = isinstance(source, int)
+        self.cap = cv2.VideoCapture(source)
+        self._buffer = None  # cv2 декодує наступні кадри в той самий масив
+        fps = self.cap.get(cv2.CAP_PROP_FPS)
+        # Камера сама задає темп; файл без pacing читався б миттєво
+        super().__init__(fps=fps if fps and fps > 0 else 30.0, paced=paced and not self.live)
+
+    def read(self):
+        self._pace()
+        ret, frame = self.cap.read() if self._buffer is None else self.cap.read(self._buffer)
+        if ret:
+            self._buffer = frame
+        elif not self.live:
+            self.finished = True
+        return ret, frame
+
+    def reopen(self):
+        self.cap.release()
+        self.cap = cv2.VideoCapture(self.source)
+
+    def release(self):
+        self.cap.release()
+
+class ImageSequenceSource(FrameSource):
+    # Послідовність зображень: тека або glob-шаблон, у порядку імен файлів
+    EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff")
+
+    def __init__(self, pattern, fps=30.0, paced=True, loop=False):
+        super().__init__(fps=fps, paced=paced)
+        if os.path.isdir(pattern):
+            paths = [os.path.join(pattern, n) for n in os.listdir(pattern) if n.lower().endswith(self.EXTENSIONS)]
+        else:
+            paths = glob.glob(pattern)
+        self.paths = sorted(paths)
+        self.loop = loop
+        self.index = 0
+
+    def read(self):
+        if self.index >= len(self.paths):
+            if not self.loop or not self.paths:
+                self.finished = True
+                return False, None
+            self.index = 0
+        self._pace()
+        frame = cv2.imread(self.paths[self.index], cv2.IMREAD_COLOR)
+        self.index += 1
+        return frame is not None, frame
+
+class SyntheticSource(FrameSource):
+    # Генератор тестових кадрів без камери: градієнт і рухомий прямокутник
+    def __init__(self, width=640, height=480, fps=30.0, paced=True, frames=None):
+        super().__init__(fps=fps, paced=paced)
+        self.width, self.height = width, height
+        self.frames = frames
+        self.count = 0
+        self._background = np.empty((height, width, 3), dtype=np.uint8)
+        self._background[:, :, 0] = np.linspace(0, 255, width, dtype=np.uint8)[None, :]
+        self._background[:, :, 1] = np.linspace(0, 255, height, dtype=np.uint8)[:, None]
+        self._background[:, :, 2] = 64
+        self._frame = np.empty_like(self._background)
+
+    def read(self):
+        if self.frames is not None and self.count >= self.frames:
+            self.finished = True
+            return False, None
+        self._pace()
+        # Один буфер на всі кадри: FrameBus копіює кадр у своє кільце
+        frame = self._frame
+        np.copyto(frame, self._background)
+        size = min(self.width, self.height) // 4
+        x = (self.count * 7) % max(1, self.width - size)
+        y = (self.count * 3) % max(1, self.height - size)
+        frame[y:y + size, x:x + size] = 255
+        self.count += 1
+        return True, frame
+
+def create_frame_source(spec, paced=True, fps=30.0):
+    # spec: індекс камери (0 або "0"), "synthetic[:WxH[@FPS]]", тека чи glob-шаблон зображень, або відеофайл
+    if isinstance(spec, int) or (isinstance(spec, str) and spec.strip().isdigit()):
+        return CaptureSource(int(spec), paced=paced)
+    if spec.startswith("synthetic"):
+        width, height = 640, 480
+        params = spec.partition(":")[2]
+        if params:
+            size, _, rate = params.partition("@")
+            if size:
+                width, height = (int(v) for v in size.lower().split("x"))
+            if rate:
+                fps = float(rate)
+        return SyntheticSource(width, height, fps=fps, paced=paced)
+    if os.path.isdir(spec) or any(c in spec for c in "*?["):
+        return ImageSequenceSource(spec, fps=fps, paced=paced)
+    return CaptureSource(spec, paced=paced)
+
+# ----------------- Адаптивний планувальник розпізнавання -----------------
+class TrackedRegion:
+    # Область інтересу (рука чи обличчя) у координатах повного кадру
+    def __init__(self, kind, box):
+        self.kind = kind
+        self.box = box  # (x, y, w, h)
+        self.misses = 0
+
+def box_iou(a, b):
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    w = min(ax + aw, bx + bw) - max(ax, bx)
+    h = min(ay + ah, by + bh) - max(ay, by)
+    if w <= 0 or h <= 0:
+        return 0.0
+    inter = w * h
+    return inter / float(aw * ah + bw * bh - inter)
+
+class AdaptiveScheduler:
+    # Детекція на зменшеному кадрі раз на redetect_interval кадрів (або коли об'єкт втрачено),
+    # між детекціями — повна модель лише на вирізаних ROI. Масштаб детекції та частота
+    # повторної детекції підлаштовуються під config["target_fps"].
+    def __init__(self, config: GlobalConfig):
+        self.config = config
+        self.scale = ADAPTIVE_START_SCALE
+        self.base_interval = max(1, int(config.data.get("redetect_interval", 10)))
+        self.redetect_interval = self.base_interval
+        self.regions = []
+        self.frames_since_detect = None
+        self.frame_time = None  # EMA часу обробки кадру (с)
+        self.cooldown = 0
+        self.detections = 0
+        self._lock = threading.Lock()
+
+    def run(self, frame, detect, infer):
+        # detect(small) -> [{"kind", "box"}] у координатах small; infer(crop, kind) -> dict або None
+        # Повертає [(kind, box, result)] у координатах повного кадру
+        started = time.perf_counter()
+        with self._lock:
+            scale = self.scale
+            need_detect = (not self.regions or self.frames_since_detect is None
+                           or self.frames_since_detect >= self.redetect_interval)
+            regions = list(self.regions)
+        h, w = frame.shape[:2]
+        if need_detect:
+            if scale < 1.0:
+                small = cv2.resize(frame, (max(1, int(w * scale)), max(1, int(h * scale))), interpolation=cv2.INTER_AREA)
+            else:
+                small = frame
+            found = []
+            for det in detect(small) or []:
+                x, y, bw, bh = det["box"]
+                box = (int(x / scale), int(y / scale), int(bw / scale), int(bh / scale))
+                # Зберігаємо відповідність з наявними областями (для стабільності між детекціями)
+                match = max(regions, key=lambda r: box_iou(r.box, box) if r.kind == det["kind"] else -1.0, default=None)
+                if match is not None and match.kind == det["kind"] and box_iou(match.box, box) > 0.3:
+                    regions.remove(match)
+                    match.box, match.misses = box, 0
+                    found.append(match)
+                else:
+                    found.append(TrackedRegion(det["kind"], box))
+            regions = found
+
+        outputs = []
+        kept = []
+        for region in regions:
+            x, y, bw, bh = region.box
+            mx, my = int(bw * ROI_MARGIN), int(bh * ROI_MARGIN)
+            x0, y0 = max(0, x - mx), max(0, y - my)
+            x1, y1 = min(w, x + bw + mx), min(h, y + bh + my)
+            if x1 <= x0 or y1 <= y0:
+                continue
+            # Вирізка — це view масиву, без копіювання пікселів
+            result = infer(frame[y0:y1, x0:x1], region.kind)
+            if result is None:
+                region.misses += 1
+                if region.misses <= ROI_MAX_MISSES:
+                    kept.append(region)
+                continue
+            region.misses = 0
+            if result.get("box"):
+                # Трекінг: модель уточнила положення об'єкта у вирізці
+                rx, ry, rw, rh = result["box"]
+                region.box = (x0 + int(rx), y0 + int(ry), int(rw), int(rh))
+            result = dict(result, box=region.box)
+            if result.get("landmarks"):
+                result["landmarks"] = [(p[0] + x0, p[1] + y0) + tuple(p[2:]) for p in result["landmarks"]]
+            outputs.append((region.kind, region.box, result))
+            kept.append(region)
+
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self.regions = kept
+            if need_detect:
+                self.frames_since_detect = 0
+                self.detections += 1
+            else:
+                self.frames_since_detect += 1
+            self._tune(elapsed)
+        return outputs
+
+    def _tune(self, elapsed):
+        # Згладжений час кадру проти бюджету 1/target_fps; після кожної зміни — пауза (гістерезис)
+        self.frame_time = elapsed if self.frame_time is None else self.frame_time + 0.1 * (elapsed - self.frame_time)
+        if self.cooldown:
+            self.cooldown -= 1
+            return
+        budget = 1.0 / max(1.0, float(self.config.data.get("target_fps", 15)))
+        if self.frame_time > budget * 1.1:
+            if self.scale > ADAPTIVE_MIN_SCALE:
+                self.scale = max(ADAPTIVE_MIN_SCALE, self.scale * 0.8)
+            else:
+                self.redetect_interval = min(self.base_interval * 4, self.redetect_interval * 2)
+            self.cooldown = ADAPTIVE_COOLDOWN
+        elif self.frame_time < budget * 0.6:
+            if self.redetect_interval > self.base_interval:
+                self.redetect_interval = max(self.base_interval, self.redetect_interval // 2)
+            elif self.scale < 1.0:
+                self.scale = min(1.0, self.scale * 1.25)
+            self.cooldown = ADAPTIVE_COOLDOWN
+
+    def stats(self):
+        with self._lock:
+            return {
+                "scale": round(self.scale, 3),
+                "regions": len(self.regions),
+                "redetect_interval": self.redetect_interval,
+                "detections": self.detections,
+                "frame_ms": round((self.frame_time or 0.0) * 1000.0, 2),
+            }
+
 # ----------------- Модуль розпізнавання -----------------
 class RecognitionEngine:
     def __init__(self, config: GlobalConfig):
         self.config = config
         self.video_source = config.data["video_source"]
-        self.cap = None
+        self.source = None
+        self.source_finished = threading.Event()
         self.running = False
-        self.frame = None
+        self.bus = None
+        self._retired_buses = []
+        self.shared_bus = bool(config.data.get("frame_bus_shared", False))
         self.last_results = {}
+        # --- Конвеєр: потік захоплення -> слот останнього кадру -> воркери розпізнавання -> канал результатів ---
+        self.num_workers = max(1, int(config.data.get("inference_workers", 1)))
+        self.slot = FrameSlot()
+        self.result_seq = 0
+        self._result_lock = threading.Lock()
+        self._subscribers = []
+        self.results = self.subscribe()  # {"seq", "captured_at", "done_at", "results"}
+        self.threads = []
+        self.metrics = {"capture": StageMetrics(), "inference": StageMetrics(), "result": StageMetrics(), "display": StageMetrics()}
+        self.scheduler = AdaptiveScheduler(config)
         # TODO: Ініціалізувати моделі розпізнавання жестів/обличчя (mediapipe, dlib, etc.)
 
-    def start(self):
-        self.cap = cv2.VideoCapture(self.video_source)
+    def start(self, source=None, paced=True):
+        # source — готовий FrameSource; інакше створюється з config["video_source"]
+        self.source = source or create_frame_source(self.video_source, paced=paced)
+        self.source_finished.clear()
         self.running = True
-        threading.Thread(target=self._loop, daemon=True).start()
+        self.slot = FrameSlot()
+        self.threads = [threading.Thread(target=self._capture_loop, name="flashlive-capture", daemon=True)]
+        for i in range(self.num_workers):
+            self.threads.append(threading.Thread(target=self._inference_loop, name=f"flashlive-inference-{i}", daemon=True))
+        for t in self.threads:
+            t.start()
 
     def stop(self):
         self.running = False
-        if self.cap:
-            self.cap.release()
-            self.cap = None
+        self.slot.close()
+        for t in self.threads:
+            t.join(timeout=1.0)
+        self.threads = []
+        if self.source:
+            self.source.release()
+            self.source = None
+        for bus in self._retired_buses:
+            bus.close()
+        self._retired_buses = []
 
-    def _loop(self):
+    def _capture_loop(self):
+        # Лише читання кадрів: драйвер не накопичує застарілих кадрів, бо ми читаємо без пауз
+        failures = 0
         while self.running:
-            ret, frame = self.cap.read()
+            ret, frame = self.source.read()
             if not ret:
+                if self.source.finished:
+                    # Файл/послідовність закінчились: останній кадр лишається на екрані
+                    self.source_finished.set()
+                    return
+                # Без зайнятого очікування: пауза зростає, після тривалої невдачі — перевідкриття
+                failures += 1
+                time.sleep(min(0.5, 0.01 * failures))
+                if failures % CAPTURE_REOPEN_AFTER == 0 and self.running:
+                    self.source.reopen()
+                continue
+            failures = 0
+            if self.bus is None or self.bus.shape != frame.shape:
+                # Кільце під розмір кадру; seq продовжується, а старе кільце закривається, щойно його кадри відпущено
+                first_seq = 0
+                if self.bus is not None:
+                    first_seq = self.bus.latest_seq()
+                    self._retired_buses.append(self.bus)
+                self.bus = FrameBus(frame.shape, frame.dtype, shared=self.shared_bus, first_seq=first_seq)
+            if self._retired_buses:
+                self._retired_buses = [bus for bus in self._retired_buses if not bus.close(only_idle=True)]
+            captured_at = time.perf_counter()
+            seq = self.bus.publish(frame, captured_at)
+            if seq:
+                self.slot.put(seq, captured_at)
+            self.metrics["capture"].tick()
+
+    def _inference_loop(self):
+        # Воркер завжди бере найновіший кадр; якщо відстає, проміжні кадри відкидаються
+        while self.running:
+            item = self.slot.take(timeout=0.5)
+            if item is None:
                 continue
-            self.frame = frame
-            self.last_results = self.process_frame(frame)
-            time.sleep(0.01)
+            seq, captured_at = item
+            with self.bus.read(seq) as frame_item:
+                if frame_item is None:
+                    continue  # Кадр уже витіснено з кільця
+                started = time.perf_counter()
+                # Кадр читається прямо з кільця (view тільки для читання) і закріплений до кінця обробки
+                results = self.process_frame(frame_item[2])
+                done = time.perf_counter()
+            self.metrics["inference"].tick(done - started)
+            self._publish(seq, captured_at, done, results)
+
+    def _publish(self, seq, captured_at, done_at, results):
+        with self._result_lock:
+            if seq <= self.result_seq:
+                return  # Інший воркер уже видав результат для новішого кадру
+            self.result_seq = seq
+            self.last_results = results
+            # Під тим самим замком, щоб у підписників результати йшли в порядку кадрів
+            record = {"seq": seq, "captured_at": captured_at, "done_at": done_at, "results": results}
+            for channel in self._subscribers:
+                try:
+                    channel.put_nowait(record)
+                except queue.Full:
+                    # Канал не встигають читати: відкидаємо найстаріший результат
+                    try:
+                        channel.get_nowait()
+                    except queue.Empty:
+                        pass
+                    channel.put_nowait(record)
+        self.metrics["result"].tick(done_at - captured_at)
+
+    def subscribe(self, maxsize=RESULTS_QUEUE_SIZE):
+        # Окрема черга результатів для кожного споживача (логіка, запис сесії, плагіни...)
+        channel = queue.Queue(maxsize=maxsize)
+        with self._result_lock:
+            self._subscribers = self._subscribers + [channel]
+        return channel
+
+    def unsubscribe(self, channel):
+        with self._result_lock:
+            self._subscribers = [c for c in self._subscribers if c is not channel]
+
+    def get_metrics(self):
+        metrics = {name: m.snapshot() for name, m in self.metrics.items()}
+        metrics["dropped_frames"] = self.slot.dropped
+        metrics["bus"] = self.bus.stats() if self.bus is not None else {}
+        metrics["scheduler"] = self.scheduler.stats()
+        return metrics
+
+    def detect_regions(self, small):
+        # TODO: Швидкий детектор долонь/обличчя на зменшеному кадрі (напр. mediapipe palm/face detection)
+        # Повернути [{"kind": "hand"/"face", "box": (x, y, w, h)}] у координатах small
+        return []
+
+    def infer_roi(self, crop, kind):
+        # TODO: Повна модель лише на вирізаній області: landmarks і жест руки або вираз обличчя
+        # Повернути dict (координати у вирізці; "box" — уточнене положення для трекінгу) або None, якщо об'єкт втрачено
+        return None
 
     def process_frame(self, frame):
-        # TODO: Реалізувати розпізнавання рук, пальців, виразів обличчя
         # Повернути структуру: {"hands": [...], "fingers": [...], "face": {...}, "gesture": "...", "expression": "..."}
-        return {
-            "hands": [],  # [{'side': 'left'/'right', 'landmarks': [...], 'gesture': '...'}]
+        results = {
+            "hands": [],  # [{'side': 'left'/'right', 'landmarks': [...], 'gesture': '...', 'box': (x, y, w, h)}]
             "fingers": [],  # [{'side': 'left'/'right', 'positions': [...]}]
-            "face": {},     # {'expression': 'smile'/'mouth_open'/'neutral', ...}
+            "face": {},     # {'expression': 'smile'/'mouth_open'/'neutral', 'box': (x, y, w, h), ...}
             "gesture": None,
             "expression": None
         }
+        for kind, box, result in self.scheduler.run(frame, self.detect_regions, self.infer_roi):
+            if kind == "hand":
+                results["hands"].append(result)
+                if result.get("fingers"):
+                    results["fingers"].append({"side": result.get("side"), "positions": result["fingers"]})
+                if results["gesture"] is None:
+                    results["gesture"] = result.get("gesture")
+            elif kind == "face":
+                results["face"] = result
+                results["expression"] = result.get("expression")
+        return results
+
+    def latest_seq(self):
+        return self.bus.latest_seq() if self.bus is not None else 0
 
-    def get_frame_with_overlay(self):
-        # TODO: Накласти скелет рук, позиції пальців, вирази обличчя на frame
-        if self.frame is None:
-            return np.zeros((480, 640, 3), dtype=np.uint8)
-        overlay = self.frame.copy()
+    def read_frame(self, seq=None):
+        # with engine.read_frame(seq) as item: item — (seq, timestamp, view) або None; view дійсний лише всередині with
+        if self.bus is None:
+            return contextlib.nullcontext(None)
+        return self.bus.read(seq)
+
+    @property
+    def frame(self):
+        # Сумісність: копія останнього кадру (споживачам у конвеєрі краще read_frame без копіювання)
+        with self.read_frame() as item:
+            return None if item is None else item[2].copy()
+
+    def draw_overlay(self, image, scale=(1.0, 1.0)):
+        # TODO: Накласти скелет рук, позиції пальців, вирази обличчя на image (BGR, можна змінювати)
+        # scale — множники координат кадру до розміру image; результати — self.last_results
         # ... малювання ...
+        pass
+
+    def get_frame_with_overlay(self, out=None):
+        # Копія останнього кадру з накладанням; out — попередньо виділений буфер того ж розміру
+        with self.read_frame() as item:
+            if item is None:
+                if out is not None:
+                    out[:] = 0
+                    return out
+                return np.zeros((480, 640, 3), dtype=np.uint8)
+            frame = item[2]
+            if out is not None and out.shape == frame.shape:
+                np.copyto(out, frame)
+                overlay = out
+            else:
+                overlay = frame.copy()
+        self.draw_overlay(overlay)
         return overlay
 
+# ----------------- Модуль відображення відео -----------------
+class VideoPresenter:
+    # Показує BGR-кадри в одному PhotoImage без PNG-кодування: cv2 пише RGB-пікселі
+    # прямо в попередньо виділений буфер PPM (заголовок + сирі байти), а Tk розбирає PPM
+    # у вже існуючий PhotoImage. Жодних проміжних зображень на кожен кадр.
+    def __init__(self, label, size=VIDEO_SIZE):
+        self.label = label
+        self.width, self.height = size
+        header = f"P6 {self.width} {self.height} 255 ".encode("ascii")
+        self._buffer = bytearray(len(header) + self.width * self.height * 3)
+        self._buffer[:len(header)] = header
+        # RGB-вид на пікселі PPM-буфера: cvtColor пише сюди через dst=
+        self._rgb = np.frombuffer(self._buffer, dtype=np.uint8, offset=len(header)).reshape(self.height, self.width, 3)
+        self._resized = np.empty((self.height, self.width, 3), dtype=np.uint8)
+        self.photo = tk.PhotoImage(master=label, width=self.width, height=self.height)
+        label.configure(image=self.photo)
+        self.label.image = self.photo
+        self.metrics = StageMetrics()
+        self.over_budget = 0
+
+    def show(self, frame, overlay=None):
+        # frame може бути view з кільця кадрів (тільки читання): накладання малюється на власному буфері
+        started = time.perf_counter()
+        h, w = frame.shape[:2]
+        if (h, w) != (self.height, self.width):
+            cv2.resize(frame, (self.width, self.height), dst=self._resized, interpolation=cv2.INTER_LINEAR)
+            frame = self._resized
+        elif overlay is not None:
+            np.copyto(self._resized, frame)
+            frame = self._resized
+        if overlay is not None:
+            overlay(frame, (self.width / w, self.height / h))
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._rgb)
+        # _tkinter приймає лише bytes (bytearray перетворився б на рядок): одна копія memcpy
+        self.photo.configure(data=bytes(self._buffer), format="ppm")
+        elapsed = time.perf_counter() - started
+        self.metrics.tick(elapsed)
+        if elapsed * 1000.0 > DISPLAY_BUDGET_MS:
+            self.over_budget += 1
+        return elapsed
+
 # ----------------- Модуль логіки та автоматизації -----------------
 class LogicEngine:
+    # Подієва логіка: результати розпізнавання надходять через власну чергу підписки,
+    # стан (жест, вираз) проходить debounce/гістерезис, а дії з попередньо скомпільованої
+    # таблиці виконуються в окремому потоці, щоб не блокувати ні GUI, ні розпізнавання.
     def __init__(self, config: GlobalConfig, recognition: RecognitionEngine, macro_engine, automation_engine):
         self.config = config
         self.recognition = recognition
@@ -150,13 +848,116 @@ class LogicEngine:
         self.automation_engine = automation_engine
         self.active_gesture = None
         self.active_action = None
+        self.active_key = (None, None)
+        self._candidate = None
+        self._candidate_since = 0.0
+        self.dispatch = {}
+        self.events = None
+        self.actions = queue.Queue(maxsize=ACTION_QUEUE_SIZE)
+        self.running = False
+        self.threads = []
+        self.metrics = {"trigger": StageMetrics(), "action": StageMetrics()}
+        self.compile_rules()
+
+    def compile_rules(self):
+        # Таблиця (gesture, expression) -> дії. None — будь-яке значення.
+        # macros: {"fist": ..., "fist+smile": ..., "*+mouth_open": ...}
+        # automation_scripts: [{"script": "name", "gesture": "...", "expression": "..."}]
+        table = {}
+        for trigger in self.config.data.get("macros", {}) or {}:
+            gesture, _, expression = str(trigger).partition("+")
+            key = (None if gesture in ("", "*") else gesture, None if expression in ("", "*") else expression)
+            table.setdefault(key, []).append(("macro", key))
+        for script in self.config.data.get("automation_scripts", []) or []:
+            if isinstance(script, dict) and script.get("script") and (script.get("gesture") or script.get("expression")):
+                key = (script.get("gesture"), script.get("expression"))
+                table.setdefault(key, []).append(("script", script["script"]))
+        self.dispatch = {key: tuple(actions) for key, actions in table.items()}
+        self.debounce = self.config.data.get("gesture_debounce_ms", 150) / 1000.0
+        self.release = self.config.data.get("gesture_release_ms", 300) / 1000.0
+
+    def lookup(self, key):
+        # Найточніше правило виграє: (жест, вираз), потім лише жест, потім лише вираз
+        gesture, expression = key
+        return (self.dispatch.get(key)
+                or (self.dispatch.get((gesture, None)) if expression is not None else None)
+                or (self.dispatch.get((None, expression)) if gesture is not None else None)
+                or ())
+
+    def start(self):
+        self.events = self.recognition.subscribe()
+        self.running = True
+        self.threads = [
+            threading.Thread(target=self._event_loop, name="flashlive-logic", daemon=True),
+            threading.Thread(target=self._action_loop, name="flashlive-actions", daemon=True),
+        ]
+        for t in self.threads:
+            t.start()
+
+    def stop(self):
+        self.running = False
+        if self.events is not None:
+            self.recognition.unsubscribe(self.events)
+        for t in self.threads:
+            t.join(timeout=1.0)
+        self.threads = []
+
+    def _event_loop(self):
+        while self.running:
+            try:
+                record = self.events.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            self.handle(record)
+
+    def handle(self, record, dry_run=False):
+        # Один результат розпізнавання -> оновлення стану; час — мітка захоплення кадру.
+        # dry_run: лише стан (офлайн-прогін) — без дій і без метрик затримки (мітки з іншого процесу)
+        results = record["results"]
+        key = (results.get("gesture"), results.get("expression"))
+        now = record["captured_at"]
+        if key == self.active_key:
+            self._candidate = None
+            return
+        if key != self._candidate:
+            self._candidate, self._candidate_since = key, now
+            return
+        # Новий жест має протриматись debounce, а зникнення жесту — довший release (гістерезис)
+        window = self.debounce if key[0] is not None or key[1] is not None else self.release
+        if now - self._candidate_since < window:
+            return
+        self.active_key = key
+        self.active_gesture = key[0]
+        self._candidate = None
+        if dry_run:
+            return
+        actions = self.lookup(key)
+        self.metrics["trigger"].tick(time.perf_counter() - now)
+        for action in actions:
+            try:
+                self.actions.put_nowait((action, key, now))
+            except queue.Full:
+                print("Action queue full, dropping:", action)
+
+    def _action_loop(self):
+        while self.running:
+            try:
+                action, key, captured_at = self.actions.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            try:
+                if action[0] == "macro":
+                    self.active_action = self.macro_engine.run_macro_for_gesture(*key)
+                else:
+                    self.automation_engine.run_script(action[1], {"gesture": key[0], "expression": key[1]})
+                    self.active_action = f"Script {action[1]}"
+            except Exception as e:
+                print("Action error:", e)
+            # Затримка від захоплення кадру з жестом до завершення дії
+            self.metrics["action"].tick(time.perf_counter() - captured_at)
 
     def update(self):
-        results = self.recognition.last_results
-        # TODO: Реалізувати логіку визначення активного жесту/виразу та запуску дій
-        # Наприклад: gesture = results['gesture'], expression = results['expression']
-        # self.active_gesture = gesture
-        # self.active_action = self.macro_engine.run_macro_for_gesture(gesture, expression)
+        # Сумісність: логіка тепер подієва, опитування з GUI не потрібне
         pass
 
 # ----------------- Модуль макросів -----------------
@@ -179,18 +980,285 @@ class AutomationEngine:
         pass
 
 # ----------------- Модуль плагінів -----------------
+PLUGIN_WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "flashlive_plugin_worker.py")
+
+class PluginSpec:
+    # Плагін з маніфесту: модуль імпортується лише при першому виклику
+    def __init__(self, name, path, manifest):
+        self.name = name
+        self.path = path
+        self.entry = manifest.get("entry", "run")
+        self.hooks = manifest.get("hooks", [])
+        self.isolated = bool(manifest.get("isolated", False))
+        self.timeout = manifest.get("timeout_ms", PLUGIN_TIMEOUT_MS) / 1000.0
+        self.startup_timeout = manifest.get("startup_timeout_ms", PLUGIN_STARTUP_TIMEOUT_MS) / 1000.0
+        self.enabled = manifest.get("enabled", True)
+        self.func = None
+        self.executor = None
+        self.pending = None
+        self.worker = None
+        self.metrics = StageMetrics()
+        self.calls = 0
+        self.timeouts = 0
+        self.consecutive_timeouts = 0
+        self.skipped = 0
+        self.errors = 0
+
+class PluginWorker:
+    # Окремий процес для важкого плагіна (flashlive_plugin_worker.py, без імпорту головного модуля);
+    # кадри передаються через SharedMemory
+    def __init__(self, spec: PluginSpec):
+        self.spec = spec
+        self.process = None
+        self.conn = None
+        self.shm = None
+        self.call_id = 0
+
+    @property
+    def ready(self):
+        return self.conn is not None and self.process is not None and self.process.poll() is None
+
+    def start(self):
+        # Запуск і імпорт плагіна чекаємо окремо від бюджету виклику, до повідомлення "ready"
+        if self.ready:
+            return
+        self.kill()
+        authkey = secrets.token_bytes(16)
+        listener = Listener(authkey=authkey)
+        try:
+            self.process = subprocess.Popen([sys.executable, PLUGIN_WORKER_SCRIPT, listener.address, self.spec.name,
+                                             self.spec.path, self.spec.entry], stdin=subprocess.PIPE)
+            self.process.stdin.write(authkey.hex().encode("ascii") + b"\n")
+            self.process.stdin.close()
+            started = time.perf_counter()
+            self.conn = self._accept(listener, authkey, self.spec.startup_timeout)
+            remaining = self.spec.startup_timeout - (time.perf_counter() - started)
+            if self.conn is None or not self.conn.poll(max(0.0, remaining)):
+                raise RuntimeError(f"worker did not start within {self.spec.startup_timeout:.1f} s")
+            status, detail = self.conn.recv()
+            if status != "ready":
+                raise RuntimeError(detail)
+        except BaseException:
+            self.kill()
+            raise
+        finally:
+            listener.close()
+
+    def _accept(self, listener, authkey, timeout):
+        # Listener.accept() не має тайм-ауту: чекаємо його в потоці, а завислий accept розблоковуємо власним підключенням
+        accepted = []
+        def accept():
+            try:
+                accepted.append(listener.accept())
+            except Exception:
+                pass
+        thread = threading.Thread(target=accept, daemon=True)
+        thread.start()
+        thread.join(timeout)
+        if thread.is_alive():
+            with contextlib.suppress(Exception):
+                Client(listener.address, authkey=authkey).close()
+            thread.join(1.0)
+            for conn in accepted:
+                conn.close()
+            return None
+        return accepted[0] if accepted else None
+
+    def _share_frame(self, frame):
+        # Буфер перевиділяється лише коли кадр не вміщується
+        if self.shm is None or self.shm.size < frame.nbytes:
+            self._release_shm()
+            self.shm = shared_memory.SharedMemory(create=True, size=frame.nbytes)
+        np.copyto(np.ndarray(frame.shape, dtype=frame.dtype, buffer=self.shm.buf), frame)
+        return self.shm.name, frame.shape, frame.dtype.str
+
+    def call(self, frame, results, timeout, kwargs):
+        # Бюджет часу стосується лише відповіді вже запущеного процесу (див. start())
+        self.start()
+        self.call_id += 1
+        meta = self._share_frame(frame) if frame is not None else None
+        self.conn.send((self.call_id, meta, results, kwargs))
+        if not self.conn.poll(timeout):
+            # Стан процесу невідомий: зупиняємо, наступний виклик запустить його знову
+            self.kill()
+            raise TimeoutError
+        call_id, ok, value = self.conn.recv()
+        if not ok:
+            raise RuntimeError(value)
+        return value
+
+    def kill(self):
+        if self.process is not None:
+            self.process.terminate()
+            with contextlib.suppress(subprocess.TimeoutExpired):
+                self.process.wait(timeout=1.0)
+            self.process = None
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def _release_shm(self):
+        if self.shm is not None:
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+
+    def close(self):
+        if self.ready:
+            try:
+                self.conn.send(None)
+                self.process.wait(timeout=1.0)
+            except Exception:
+                pass
+        self.kill()
+        self._release_shm()
+
 class PluginManager:
+    # Плагіни описуються маніфестами в plugin_dir: <plugin_dir>/<name>/plugin.json або <plugin_dir>/<name>.json
+    # {"name": "...", "module": "plugin.py", "entry": "run", "hooks": ["frame"], "isolated": false, "timeout_ms": 50}
+    # entry(frame, results, **kwargs) -> dict/None. config["plugins"][name] перевизначає поля маніфесту.
     def __init__(self, config: GlobalConfig):
         self.config = config
         self.plugins = {}
+        self.outputs = {}
+        self.events = None
+        self.recognition = None
+        self.running = False
+        self.thread = None
 
     def load_plugins(self):
-        # TODO: Динамічно завантажити плагіни з папки/налаштувань
-        pass
+        # Лише читання маніфестів, без імпорту коду плагінів
+        folder = self.config.data.get("plugin_dir", "plugins")
+        overrides = self.config.data.get("plugins", {}) or {}
+        self.plugins = {}
+        if not os.path.isdir(folder):
+            return self.plugins
+        for entry in sorted(os.listdir(folder)):
+            full = os.path.join(folder, entry)
+            if os.path.isdir(full):
+                manifest_path = os.path.join(full, "plugin.json")
+            elif entry.endswith(".json"):
+                manifest_path = full
+            else:
+                continue
+            if not os.path.exists(manifest_path):
+                continue
+            try:
+                with open(manifest_path, "r", encoding="utf-8") as f:
+                    manifest = json.load(f)
+                name = manifest.get("name") or os.path.splitext(entry)[0]
+                default_module = "plugin.py" if os.path.isdir(full) else os.path.splitext(entry)[0] + ".py"
+                path = os.path.join(os.path.dirname(manifest_path), manifest.get("module", default_module))
+                manifest.update(overrides.get(name, {}))
+                self.plugins[name] = PluginSpec(name, path, manifest)
+            except Exception as e:
+                print(f"Plugin manifest error '{manifest_path}':", e)
+        return self.plugins
 
-    def run_plugin(self, name, *args, **kwargs):
-        # TODO: Викликати функцію плагіна
-        pass
+    def run_plugin(self, name, frame=None, results=None, **kwargs):
+        # Виклик з бюджетом часу; повертає результат плагіна або None (тайм-аут, помилка, вимкнений)
+        spec = self.plugins.get(name)
+        if spec is None or not spec.enabled:
+            return None
+        if spec.isolated and not self.start_worker(name):
+            return None
+        started = time.perf_counter()
+        try:
+            if spec.isolated:
+                value = spec.worker.call(frame, results, spec.timeout, kwargs)
+            else:
+                if spec.pending is not None and not spec.pending.done():
+                    spec.skipped += 1  # Попередній виклик ще не завершився після тайм-ауту
+                    return None
+                if spec.func is None:
+                    spec.func = getattr(import_plugin_module(name, spec.path), spec.entry)
+                    spec.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"flashlive-plugin-{name}")
+                spec.pending = spec.executor.submit(spec.func, frame, results, **kwargs)
+                value = spec.pending.result(timeout=spec.timeout)
+        except (TimeoutError, FuturesTimeout):
+            spec.timeouts += 1
+            spec.consecutive_timeouts += 1
+            if spec.consecutive_timeouts >= PLUGIN_MAX_TIMEOUTS:
+                spec.enabled = False
+                print(f"Plugin '{name}' disabled after {spec.consecutive_timeouts} timeouts")
+            return None
+        except Exception as e:
+            spec.errors += 1
+            print(f"Plugin '{name}' error:", e)
+            return None
+        spec.calls += 1
+        spec.consecutive_timeouts = 0
+        spec.metrics.tick(time.perf_counter() - started)
+        return value
+
+    def start_worker(self, name):
+        # Процес ізольованого плагіна запускається до першого виклику (або після тайм-ауту), поза бюджетом виклику
+        spec = self.plugins[name]
+        if spec.worker is None:
+            spec.worker = PluginWorker(spec)
+        if spec.worker.ready:
+            return True
+        try:
+            spec.worker.start()
+            return True
+        except Exception as e:
+            spec.errors += 1
+            spec.enabled = False
+            print(f"Plugin '{name}' failed to start:", e)
+            return False
+
+    def start(self, recognition):
+        # Плагіни з хуком "frame" отримують кожен новий результат у власному потоці, не в GUI чи розпізнаванні
+        self.recognition = recognition
+        if not any("frame" in spec.hooks for spec in self.plugins.values()):
+            return
+        self.events = recognition.subscribe(PLUGIN_QUEUE_SIZE)
+        self.running = True
+        self.thread = threading.Thread(target=self._dispatch_loop, name="flashlive-plugins", daemon=True)
+        self.thread.start()
+
+    def _dispatch_loop(self):
+        for name, spec in list(self.plugins.items()):
+            if spec.enabled and spec.isolated and "frame" in spec.hooks:
+                self.start_worker(name)
+        while self.running:
+            try:
+                record = self.events.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            # Саме той кадр, для якого отримано результат (view з кільця, закріплений на час виклику)
+            with self.recognition.read_frame(record["seq"]) as item:
+                frame = item[2] if item is not None else None
+                for name, spec in list(self.plugins.items()):
+                    if spec.enabled and "frame" in spec.hooks:
+                        value = self.run_plugin(name, frame, record["results"])
+                        if value is not None:
+                            self.outputs[name] = value
+                frame = None
+
+    def stop(self):
+        self.running = False
+        if self.events is not None:
+            self.recognition.unsubscribe(self.events)
+            self.events = None
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+            self.thread = None
+        for spec in self.plugins.values():
+            if spec.worker is not None:
+                spec.worker.close()
+                spec.worker = None
+            if spec.executor is not None:
+                spec.executor.shutdown(wait=False, cancel_futures=True)
+                spec.executor = None
+                spec.func = None
+
+    def stats(self):
+        return {
+            name: dict(spec.metrics.snapshot(), enabled=spec.enabled, isolated=spec.isolated, calls=spec.calls,
+                       timeouts=spec.timeouts, skipped=spec.skipped, errors=spec.errors)
+            for name, spec in self.plugins.items()
+        }
 
 # ----------------- Модуль API -----------------
 class FlashLiveAPI:
@@ -203,26 +1271,331 @@ class FlashLiveAPI:
 
     # TODO: Реалізувати API для плагінів, макросів, зовнішніх скриптів
 
+# ----------------- Запис і відтворення сесій -----------------
+class SessionRecorder:
+    # Потоковий запис результатів розпізнавання у стовпчикові чанки .npz (NumPy).
+    # Окремий потік-записувач читає власну обмежену чергу підписки: якщо диск не встигає,
+    # відкидаються найстаріші результати, а захоплення й розпізнавання ніколи не чекають.
+    # Теку сесії складають chunk_00000.npz, chunk_00001.npz, ... та meta.json зі словниками.
+    def __init__(self, recognition, path, chunk_frames=RECORD_CHUNK_FRAMES, flush_interval=10.0):
+        self.recognition = recognition
+        self.path = path
+        self.chunk_frames = chunk_frames
+        self.flush_interval = flush_interval
+        self.vocab = {"gesture": [None], "expression": [None], "side": [None]}  # Код 0 — None
+        self._codes = {name: {None: 0} for name in self.vocab}
+        n = chunk_frames
+        # Буфери чанка виділяються один раз і перезаписуються
+        self.columns = {
+            "seq": np.zeros(n, dtype=np.int64),
+            "captured_at": np.zeros(n, dtype=np.float64),
+            "done_at": np.zeros(n, dtype=np.float64),
+            "gesture": np.zeros(n, dtype=np.int16),
+            "expression": np.zeros(n, dtype=np.int16),
+            "hand_count": np.zeros(n, dtype=np.int8),
+            "hand_side": np.zeros((n, RECORD_MAX_HANDS), dtype=np.int16),
+            "hand_gesture": np.zeros((n, RECORD_MAX_HANDS), dtype=np.int16),
+            "hand_box": np.full((n, RECORD_MAX_HANDS, 4), np.nan, dtype=np.float32),
+            "landmarks": np.full((n, RECORD_MAX_HANDS, RECORD_MAX_LANDMARKS, 3), np.nan, dtype=np.float32),
+            "face_box": np.full((n, 4), np.nan, dtype=np.float32),
+        }
+        self.count = 0
+        self.frames = 0
+        self.chunks = 0
+        self.started_at = time.time()
+        self.channel = None
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        os.makedirs(self.path, exist_ok=True)
+        self.channel = self.recognition.subscribe(RECORD_QUEUE_SIZE)
+        self.running = True
+        self.thread = threading.Thread(target=self._loop, name="flashlive-recorder", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        if self.channel is not None:
+            self.recognition.unsubscribe(self.channel)
+        if self.thread is not None:
+            self.thread.join(timeout=5.0)
+            self.thread = None
+
+    def _loop(self):
+        last_flush = time.perf_counter()
+        while self.running or not self.channel.empty():
+            try:
+                record = self.channel.get(timeout=0.2)
+            except queue.Empty:
+                record = None
+            if record is not None:
+                self.append(record)
+            if self.count >= self.chunk_frames or (self.count and time.perf_counter() - last_flush >= self.flush_interval):
+                self.flush()
+                last_flush = time.perf_counter()
+        self.flush()
+        self._write_meta()
+
+    def _code(self, name, value):
+        codes = self._codes[name]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(self.vocab[name])
+            self.vocab[name].append(value)
+        return code
+
+    def append(self, record):
+        i = self.count
+        c = self.columns
+        results = record["results"]
+        c["seq"][i] = record["seq"]
+        c["captured_at"][i] = record["captured_at"]
+        c["done_at"][i] = record["done_at"]
+        c["gesture"][i] = self._code("gesture", results.get("gesture"))
+        c["expression"][i] = self._code("expression", results.get("expression"))
+        hands = (results.get("hands") or [])[:RECORD_MAX_HANDS]
+        c["hand_count"][i] = len(hands)
+        c["hand_side"][i] = 0
+        c["hand_gesture"][i] = 0
+        c["hand_box"][i] = np.nan
+        c["landmarks"][i] = np.nan
+        for j, hand in enumerate(hands):
+            c["hand_side"][i, j] = self._code("side", hand.get("side"))
+            c["hand_gesture"][i, j] = self._code("gesture", hand.get("gesture"))
+            if hand.get("box"):
+                c["hand_box"][i, j] = hand["box"]
+            if hand.get("landmarks"):
+                points = np.asarray(hand["landmarks"][:RECORD_MAX_LANDMARKS], dtype=np.float32)
+                c["landmarks"][i, j, :len(points), :points.shape[1]] = points[:, :3]
+        face = results.get("face") or {}
+        c["face_box"][i] = face["box"] if face.get("box") else np.nan
+        self.count += 1
+        self.frames += 1
+
+    def flush(self):
+        if not self.count:
+            return
+        n = self.count
+        name = os.path.join(self.path, f"chunk_{self.chunks:05d}.npz")
+        try:
+            np.savez(name, **{key: column[:n] for key, column in self.columns.items()})
+            self.chunks += 1
+            self._write_meta()
+        except Exception as e:
+            print("Session chunk write error:", e)
+        self.count = 0
+
+    def _write_meta(self):
+        meta = {
+            "version": 1,
+            "started_at": self.started_at,
+            "frames": self.frames,
+            "chunks": self.chunks,
+            "vocab": self.vocab,
+        }
+        try:
+            with open(os.path.join(self.path, "meta.json"), "w", encoding="utf-8") as f:
+                json.dump(meta, f, ensure_ascii=False)
+        except Exception as e:
+            print("Session meta write error:", e)
+
+def _box(values):
+    return None if np.isnan(values[0]) else tuple(float(v) for v in values)
+
+def iter_session(path):
+    # Відтворює записані результати як записи каналу розпізнавання: {"seq", "captured_at", "done_at", "results"}
+    with open(os.path.join(path, "meta.json"), "r", encoding="utf-8") as f:
+        vocab = json.load(f)["vocab"]
+    gestures, expressions, sides = vocab["gesture"], vocab["expression"], vocab["side"]
+    for name in sorted(n for n in os.listdir(path) if n.startswith("chunk_") and n.endswith(".npz")):
+        with np.load(os.path.join(path, name)) as data:
+            c = {key: data[key] for key in data.files}
+        for i in range(len(c["seq"])):
+            hands = []
+            for j in range(int(c["hand_count"][i])):
+                points = c["landmarks"][i, j]
+                points = points[~np.isnan(points[:, 0])]
+                hands.append({
+                    "side": sides[c["hand_side"][i, j]],
+                    "gesture": gestures[c["hand_gesture"][i, j]],
+                    "landmarks": [tuple(float(v) for v in p if not np.isnan(v)) for p in points],
+                    "box": _box(c["hand_box"][i, j]),
+                })
+            expression = expressions[c["expression"][i]]
+            face_box = _box(c["face_box"][i])
+            face = {"expression": expression, "box": face_box} if expression is not None or face_box else {}
+            yield {
+                "seq": int(c["seq"][i]),
+                "captured_at": float(c["captured_at"][i]),
+                "done_at": float(c["done_at"][i]),
+                "results": {
+                    "hands": hands,
+                    "fingers": [],
+                    "face": face,
+                    "gesture": gestures[c["gesture"][i]],
+                    "expression": expression,
+                },
+            }
+
+def replay_session(path, logic):
+    # Офлайн-прогін записаної сесії через LogicEngine (час береться з міток кадрів, а не реальний).
+    # Дії не виконуються (dry_run), потоки LogicEngine запускати не потрібно.
+    # Повертає список активацій [(captured_at, (gesture, expression))].
+    activations = []
+    for record in iter_session(path):
+        before = logic.active_key
+        logic.handle(record, dry_run=True)
+        if logic.active_key != before:
+            activations.append((record["captured_at"], logic.active_key))
+    return activations
+
 # ----------------- Модуль сесій -----------------
 class SessionManager:
     def __init__(self, config: GlobalConfig):
         self.config = config
+        self.recorder = None
+
+    def start_recording(self, recognition):
+        # Нова тека сесії всередині export_path; export_frequency — період скидання чанка (с)
+        if self.recorder is not None:
+            return self.recorder.path
+        name = time.strftime("session_%Y%m%d_%H%M%S")
+        path = os.path.join(self.config.data.get("export_path") or "flashlive_sessions", name)
+        self.recorder = SessionRecorder(recognition, path, flush_interval=float(self.config.data.get("export_frequency", 10)))
+        self.recorder.start()
+        return path
 
     def save_session(self):
-        # TODO: Зберегти поточну сесію (жести, дії, налаштування)
-        pass
+        # Зупиняє запис і додає сесію до історії в конфігурації
+        if self.recorder is None:
+            return None
+        recorder, self.recorder = self.recorder, None
+        recorder.stop()
+        entry = {"path": recorder.path, "started_at": recorder.started_at, "frames": recorder.frames}
+        self.config.data.setdefault("sessions", []).append(entry)
+        self.config.save()
+        return entry
 
-    def load_session(self):
-        # TODO: Завантажити сесію
-        pass
+    def load_session(self, path):
+        return iter_session(path)
 
     def clear_history(self):
-        # TODO: Очистити історію сесій
-        pass
+        # Очищує список сесій (файли записів на диску не видаляються)
+        self.config.data["sessions"] = []
+        self.config.save()
+
+# ----------------- Бенчмарк конвеєра -----------------
+class StageTimer:
+    # Збирає тривалість (wall) і процесорний час потоку (CPU) кожного виклику етапу
+    def __init__(self):
+        self.wall = []
+        self.cpu = []
+        self._lock = threading.Lock()
+
+    def call(self, fn, *args):
+        wall_start, cpu_start = time.perf_counter(), time.thread_time()
+        try:
+            return fn(*args)
+        finally:
+            cpu = time.thread_time() - cpu_start
+            wall = time.perf_counter() - wall_start
+            with self._lock:
+                self.wall.append(wall)
+                self.cpu.append(cpu)
+
+    def report(self):
+        with self._lock:
+            wall = np.asarray(self.wall) * 1000.0
+            cpu = np.asarray(self.cpu) * 1000.0
+        if not len(wall):
+            return {"calls": 0}
+        return {
+            "calls": len(wall),
+            "wall_ms_mean": round(float(wall.mean()), 3),
+            "wall_ms_p99": round(float(np.percentile(wall, 99)), 3),
+            "cpu_ms_mean": round(float(cpu.mean()), 3),
+            "cpu_ms_total": round(float(cpu.sum()), 1),
+        }
+
+def run_benchmark(source_spec="synthetic", frames=300, paced=False, workers=1, timeout=60.0):
+    # Безголовий прогін конвеєра: джерело -> process_frame -> LogicEngine.update -> накладання
+    config = GlobalConfig()
+    config.data["video_source"] = source_spec
+    config.data["inference_workers"] = workers
+    engine = RecognitionEngine(config)
+    logic = LogicEngine(config, engine, MacroEngine(config), AutomationEngine(config))
+    stages = {"process_frame": StageTimer(), "logic": StageTimer(), "overlay": StageTimer()}
+    process_frame = engine.process_frame
+    engine.process_frame = lambda frame: stages["process_frame"].call(process_frame, frame)
+    handle = logic.handle
+    logic.handle = lambda record: stages["logic"].call(handle, record)
+
+    latencies = []
+    overlay = None
+    cpu_start = time.process_time()
+    started = time.perf_counter()
+    engine.start(paced=paced)
+    logic.start()
+    try:
+        while engine.metrics["result"].count < frames and time.perf_counter() - started < timeout:
+            try:
+                record = engine.results.get(timeout=0.1)
+            except queue.Empty:
+                if engine.source_finished.is_set():
+                    break
+                continue
+            latencies.append(record["done_at"] - record["captured_at"])
+            bus = engine.bus
+            if bus is not None:
+                if overlay is None or overlay.shape != bus.shape:
+                    overlay = np.empty(bus.shape, dtype=bus.dtype)
+                stages["overlay"].call(engine.get_frame_with_overlay, overlay)
+    finally:
+        # Усе знімається до зупинки: завершення потоків не входить ні в CPU, ні в таймери етапів
+        elapsed = time.perf_counter() - started
+        cpu = time.process_time() - cpu_start
+        metrics = engine.get_metrics()
+        stage_reports = {name: timer.report() for name, timer in stages.items()}
+        action_latency = logic.metrics["action"].snapshot()["latency_ms"]
+        logic.stop()
+        engine.stop()
+    lat = np.asarray(latencies) * 1000.0
+    published = metrics["result"]["count"]
+    return {
+        "source": str(source_spec),
+        "paced": paced,
+        "workers": workers,
+        "results": published,
+        "latency_samples": len(latencies),
+        "captured": metrics["capture"]["count"],
+        "dropped_frames": metrics["dropped_frames"],
+        "bus": metrics["bus"],
+        "seconds": round(elapsed, 3),
+        "fps": round(published / elapsed, 1) if elapsed > 0 else 0.0,
+        "latency_ms": {
+            q: round(float(np.percentile(lat, int(q[1:]))), 3) if len(lat) else 0.0
+            for q in ("p50", "p90", "p99")
+        },
+        "cpu_percent": round(100.0 * cpu / elapsed, 1) if elapsed > 0 else 0.0,
+        "action_latency_ms": action_latency,
+        "stages": stage_reports,
+    }
+
+def print_benchmark(report):
+    lat = report["latency_ms"]
+    print(f"Source: {report['source']} ({'paced' if report['paced'] else 'unpaced'}, {report['workers']} worker(s))")
+    print(f"{report['results']} results in {report['seconds']:.2f}s: {report['fps']:.1f} fps end-to-end, "
+          f"{report['captured']} captured, {report['dropped_frames']} dropped, CPU {report['cpu_percent']:.0f}%")
+    print(f"Capture->result latency: p50 {lat['p50']:.2f} ms, p90 {lat['p90']:.2f} ms, p99 {lat['p99']:.2f} ms")
+    for name, st in report["stages"].items():
+        if st["calls"]:
+            print(f"  {name:<14} {st['calls']:>6} calls  wall {st['wall_ms_mean']:.3f} ms (p99 {st['wall_ms_p99']:.3f})  "
+                  f"CPU {st['cpu_ms_mean']:.3f} ms")
 
 # ----------------- Головний графічний інтерфейс -----------------
 class FlashLiveApp(tk.Tk):
-    def __init__(self):
+    def __init__(self, video_source=None):
         super().__init__()
         self.title("FlashLive – Gesture & Face Control")
         self.geometry("1200x800")
@@ -230,6 +1603,8 @@ class FlashLiveApp(tk.Tk):
 
         # --- Ініціалізація модулів ---
         self.config_module = GlobalConfig()
+        if video_source is not None:
+            self.config_module.data["video_source"] = video_source
         self.recognition = RecognitionEngine(self.config_module)
         self.macro_engine = MacroEngine(self.config_module)
         self.automation_engine = AutomationEngine(self.config_module)
@@ -240,13 +1615,22 @@ class FlashLiveApp(tk.Tk):
 
         # --- GUI ---
         self._build_gui()
+        self._last_shown = None
         self.recognition.start()
+        self.logic.start()
+        self.plugin_manager.load_plugins()
+        self.plugin_manager.start(self.recognition)
         self._update_gui_loop()
 
     def _build_gui(self):
         # --- Основна область відео ---
         self.video_panel = tk.Label(self, bg="black")
-        self.video_panel.place(x=10, y=10, width=800, height=600)
+        self.video_panel.place(x=10, y=10, width=VIDEO_SIZE[0], height=VIDEO_SIZE[1])
+        self.presenter = VideoPresenter(self.video_panel)
+
+        # --- Метрики конвеєра (режим розробника) ---
+        self.dev_label = tk.Label(self, text="", font=("Consolas", 10), fg="gray", anchor="w", justify="left")
+        self.dev_label.place(x=10, y=700, width=800, height=60)
 
         # --- Підпис активного жесту ---
         self.gesture_label = tk.Label(self, text="Active Gesture: None", font=("Consolas", 16), fg="blue")
@@ -313,6 +1697,11 @@ class FlashLiveApp(tk.Tk):
 
         # --- Кнопка збереження налаштувань ---
         tk.Button(panel, text="Save Settings", command=self.save_settings).grid(row=row, column=0, columnspan=2, pady=10)
+        row += 1
+
+        # --- Запис сесії ---
+        self.record_button = tk.Button(panel, text="Start Recording", command=self.toggle_recording)
+        self.record_button.grid(row=row, column=0, columnspan=2, pady=5)
 
     def save_settings(self):
         # TODO: Зберегти всі налаштування з панелі в self.config_module.data та викликати self.config_module.save()
@@ -325,29 +1714,88 @@ class FlashLiveApp(tk.Tk):
         self.config_module.data["enable_face"] = self.face_enable_var.get()
         self.config_module.data["active_face_expressions"] = [s.strip() for s in self.face_expr_var.get().split(",")]
         self.config_module.save()
+        self.logic.compile_rules()
         messagebox.showinfo("Settings", "Settings saved!")
 
     def _update_gui_loop(self):
         # --- Оновлення відео та підписів ---
-        frame = self.recognition.get_frame_with_overlay()
-        img = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        img = cv2.resize(img, (800, 600))
-        img_pil = tk.PhotoImage(master=self.video_panel, data=cv2.imencode('.png', img)[1].tobytes())
-        self.video_panel.configure(image=img_pil)
-        self.video_panel.image = img_pil
+        loop_started = time.perf_counter()
+        seq = self.recognition.latest_seq()
+        if seq and seq != self._last_shown:
+            # Новий кадр: читається з кільця за номером, без копії, і показується без PNG
+            self._last_shown = seq
+            with self.recognition.read_frame(seq) as item:
+                if item is not None:
+                    self.presenter.show(item[2], overlay=self.recognition.draw_overlay)
 
         # Оновлення активного жесту та дії
-        self.logic.update()
         self.gesture_label.config(text=f"Active Gesture: {self.logic.active_gesture}")
         self.action_label.config(text=f"Current Action: {self.logic.active_action}")
 
-        # TODO: Якщо режим розробника — показувати FPS, координати, статуси
-        self.after(30, self._update_gui_loop)
+        # Режим розробника: FPS і затримки етапів конвеєра
+        self.recognition.metrics["display"].tick()
+        if self.config_module.data.get("developer_mode"):
+            m = self.recognition.get_metrics()
+            p = self.presenter.metrics.snapshot()
+            bus = m["bus"]
+            self.dev_label.config(text=(
+                f"capture {m['capture']['fps']:.1f} fps | inference {m['inference']['fps']:.1f} fps, "
+                f"{m['inference']['latency_ms']:.1f} ms | capture->result {m['result']['latency_ms']:.1f} ms | "
+                f"dropped {m['dropped_frames']} | bus dropped {bus.get('dropped', 0)}, "
+                f"overwritten {bus.get('overwritten', 0)}\n"
+                f"detect scale {m['scheduler']['scale']:.2f}, every {m['scheduler']['redetect_interval']} frames, "
+                f"{m['scheduler']['regions']} ROI | "
+                f"display {m['display']['fps']:.1f} fps, {p['latency_ms']:.1f} ms/frame "
+                f"(budget {DISPLAY_BUDGET_MS:.0f} ms, over {self.presenter.over_budget}) | "
+                f"gesture->action {self.logic.metrics['action'].snapshot()['latency_ms']:.1f} ms"))
+        # Наступний кадр — з урахуванням часу, вже витраченого в цьому циклі
+        spent_ms = (time.perf_counter() - loop_started) * 1000.0
+        self.after(max(1, int(GUI_INTERVAL_MS - spent_ms)), self._update_gui_loop)
+
+    def toggle_recording(self):
+        if self.session_manager.recorder is None:
+            path = self.session_manager.start_recording(self.recognition)
+            self.record_button.config(text="Stop Recording")
+            self.action_label.config(text=f"Recording: {path}")
+        else:
+            entry = self.session_manager.save_session()
+            self.record_button.config(text="Start Recording")
+            messagebox.showinfo("Session", f"Saved {entry['frames']} frames to {entry['path']}")
 
     def on_close(self):
+        self.session_manager.save_session()
+        self.plugin_manager.stop()
+        self.logic.stop()
         self.recognition.stop()
         self.destroy()
 
+def parse_args():
+    p = argparse.ArgumentParser(description="FlashLive – gesture & face control.")
+    p.add_argument("--source", help="Camera index, video file, image folder/glob or synthetic[:WxH[@FPS]].")
+    p.add_argument("--benchmark", action="store_true", help="Run the pipeline headless and print per-stage timings.")
+    p.add_argument("--frames", type=int, default=300, help="Results to collect in benchmark mode.")
+    p.add_argument("--paced", action="store_true", help="Replay files at their recorded fps instead of as fast as possible.")
+    p.add_argument("--workers", type=int, default=1, help="Inference worker threads in benchmark mode.")
+    p.add_argument("--json", action="store_true", help="Print the benchmark report as JSON.")
+    p.add_argument("--replay", metavar="SESSION_DIR", help="Replay a recorded session through the logic engine and print activations.")
+    return p.parse_args()
+
 if __name__ == "__main__":
-    app = FlashLiveApp()
-    app.mainloop()
+    args = parse_args()
+    if args.replay:
+        config = GlobalConfig()
+        logic = LogicEngine(config, RecognitionEngine(config), MacroEngine(config), AutomationEngine(config))
+        activations = replay_session(args.replay, logic)
+        start = activations[0][0] if activations else 0.0
+        for captured_at, (gesture, expression) in activations:
+            print(f"{captured_at - start:9.3f}s  gesture={gesture}  expression={expression}  actions={len(logic.lookup((gesture, expression)))}")
+        print(f"{len(activations)} activations")
+    elif args.benchmark:
+        report = run_benchmark(args.source or "synthetic", frames=args.frames, paced=args.paced, workers=args.workers)
+        if args.json:
+            print(json.dumps(report, ensure_ascii=False))
+        else:
+            print_benchmark(report)
+    else:
+        app = FlashLiveApp(video_source=args.source)
+        app.mainloop()
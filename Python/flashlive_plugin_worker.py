@@ -0,0 +1,79 @@
+# -----------------------------------------------------------------------------
+# FlashLive – Isolated Plugin Worker
+# -----------------------------------------------------------------------------
+# Процес ізольованого плагіна для FlashLive.pyw. Запускається окремим
+# інтерпретатором, тому не імпортує головний модуль (cv2, tkinter, yaml):
+# старт займає час імпорту numpy і самого плагіна.
+#
+# Протокол (multiprocessing.connection):
+#   worker -> ("ready", None) після імпорту плагіна або ("error", repr(e))
+#   host   -> (call_id, frame_meta, results, kwargs) або None для завершення
+#   worker -> (call_id, ok, value)
+# Кадр читається з SharedMemory за frame_meta = (shm_name, shape, dtype), без копіювання через pipe.
+#
+# Usage (запускає PluginWorker, ключ автентифікації читається з stdin):
+#   python flashlive_plugin_worker.py <address> <name> <module_path> <entry>
+# -----------------------------------------------------------------------------
+import sys
+import importlib.util
+from multiprocessing import resource_tracker, shared_memory
+from multiprocessing.connection import Client
+
+import numpy as np
+
+def import_plugin_module(name, path):
+    spec = importlib.util.spec_from_file_location(f"flashlive_plugin_{name}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def attach_shared_memory(name):
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+def serve(conn, name, path, entry):
+    try:
+        func = getattr(import_plugin_module(name, path), entry)
+    except Exception as e:
+        conn.send(("error", repr(e)))
+        return
+    conn.send(("ready", None))
+    shm = None
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            break
+        if message is None:
+            break
+        call_id, frame_meta, results, kwargs = message
+        frame = None
+        try:
+            if frame_meta is not None:
+                shm_name, shape, dtype = frame_meta
+                if shm is None or shm.name != shm_name:
+                    if shm is not None:
+                        shm.close()
+                    shm = attach_shared_memory(shm_name)
+                    if sys.version_info < (3, 13):
+                        # Окремий процес має власний resource_tracker, який видалив би сегмент хоста при виході
+                        resource_tracker.unregister(shm._name, "shared_memory")
+                frame = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+            conn.send((call_id, True, func(frame, results, **kwargs)))
+        except Exception as e:
+            conn.send((call_id, False, repr(e)))
+        finally:
+            del frame  # view має зникнути до shm.close()
+    if shm is not None:
+        shm.close()
+
+def main():
+    address, name, path, entry = sys.argv[1:5]
+    authkey = bytes.fromhex(sys.stdin.readline().strip())
+    with Client(address, authkey=authkey) as conn:
+        serve(conn, name, path, entry)
+
+if __name__ == "__main__":
+    main()
@@ -20,25 +20,26 @@
 # - Configuration: Game constants (colors, sizes, FPS, etc.)
 # - Tkinter Setup: Main window and canvas
 # - File Dialog: Audio file selection
-# - Beat Detection: Async analysis with progress display
-# - Node Class: Represents a moving note
+# - Beat Detection: Cached beatmaps, or streaming analysis while playing (see fleshosu_beatmaps.py)
+# - Node Class: Pooled moving note (canvas item created once), NodePool
+# - HUD: Static scene and text items created once, frame-time overlay (F3)
 # - Game State: Variables for score, combo, nodes, etc.
-# - Audio Playback: Play audio in sync with game
-# - Controls: Keyboard event handling
-# - Main Game Loop: Spawning, updating, drawing, and feedback
-# - Cleanup: Remove temp files on exit
+# - Audio Playback: simpleaudio (WAV) or sounddevice streaming from the decoder
+# - Song Clock: Playback position from the audio sample clock (perf_counter fallback)
+# - Controls: Keyboard event handling, hit judgment by binary search over beat times
+# - Main Game Loop: Spawning, positioning from the song clock, misses, and feedback
 # -----------------------------------------------------------------------------
 import sys
 import time
+import bisect
+import argparse
+from collections import deque
 import threading
-import librosa
 import tkinter as tk
 from tkinter import filedialog, messagebox
 from tkinter import ttk
-import numpy as np
-import tempfile
 import os
-import soundfile as sf
+from fleshosu_beatmaps import BeatmapCache, StreamingBeatTracker, can_stream
 
 # === Configuration ===
 HIT_ZONE_X = 100
@@ -48,6 +49,24 @@ LINE_Y = 220
 WINDOW_WIDTH = 700
 WINDOW_HEIGHT = 400
 FPS = 60
+STRESS_COLOR = "#5A6A8A"
+# Hit windows in ms around the beat, best first: (feedback, window, points, color)
+HIT_WINDOWS = (
+    ("Perfect!", 40, 300, "#64C8FF"),
+    ("Great!", 90, 100, "#64FF64"),
+    ("Good", 140, 50, "#FFD850"),
+)
+MISS_WINDOW_MS = HIT_WINDOWS[-1][1]  # A beat not hit by then counts as a miss
+OFFSET_STEP_MS = 5
+
+# === Command Line ===
+# --stress N keeps about N extra (unscored) notes on screen to check the frame rate
+arg_parser = argparse.ArgumentParser(description="FleshOsu! rhythm game")
+arg_parser.add_argument("--stress", type=int, default=0, help="Extra unscored notes kept on screen (render stress test).")
+arg_parser.add_argument("--offset", type=float, default=0.0,
+                        help="Latency calibration in ms, positive if your hits land late (adjust in game with [ and ]).")
+cli_args = arg_parser.parse_known_args()[0]
+STRESS_NODES = max(0, cli_args.stress)
 
 # === Tkinter Setup ===
 root = tk.Tk()
@@ -73,36 +92,101 @@ if not audio_path:
 # === Async Beat Detection with Progress ===
 beat_times = []
 tempo = 0
-y = None
 sr = None
 audio_wav_path = None
+beatmap_cache = BeatmapCache()
+tracker = None      # StreamingBeatTracker when the track is analyzed while it plays
+stream_player = None
+
+# === Audio Playback Backends ===
+try:
+    import simpleaudio as sa
+    AUDIO_OK = True
+except ImportError:
+    AUDIO_OK = False
+
+try:
+    import sounddevice as sd
+    import soundfile as sf
+    STREAM_AUDIO_OK = True
+except ImportError:
+    STREAM_AUDIO_OK = False
+
+class StreamPlayer:
+    # Plays the file straight from the decoder (sounddevice), no full decode or temp WAV needed
+    def __init__(self, path):
+        self.file = sf.SoundFile(path)
+        self.samplerate = self.file.samplerate
+        self.position = 0  # Samples handed to the audio device
+        self.heard = None  # (song time of the last block, perf_counter when it reaches the speaker)
+        self.stream = sd.OutputStream(samplerate=self.file.samplerate, channels=self.file.channels,
+                                      dtype="float32", callback=self._callback)
+
+    def _callback(self, outdata, frames, time_info, status):
+        # The block's first sample is heard after the device's output delay
+        delay = time_info.outputBufferDacTime - time_info.currentTime
+        if delay <= 0:
+            delay = self.stream.latency
+        self.heard = (self.position / self.samplerate, time.perf_counter() + delay)
+        read = self.file.read(frames, dtype="float32", out=outdata)
+        self.position += len(read)
+        if len(read) < frames:
+            outdata[len(read):] = 0
+            raise sd.CallbackStop
+
+    def start(self):
+        self.stream.start()
+
+    def time(self):
+        # Song time being heard now: sample position of the last block, interpolated with
+        # perf_counter between callbacks; None until the first block was handed over
+        heard = self.heard
+        if heard is None:
+            return None
+        song_time, heard_at = heard
+        return min(song_time + time.perf_counter() - heard_at, self.position / self.samplerate)
+
+    def close(self):
+        self.stream.close()
+        self.file.close()
 
 def analyze_beats():
-    global beat_times, tempo, y, sr, audio_wav_path
-    try:
-        canvas.create_text(WINDOW_WIDTH//2, WINDOW_HEIGHT//2, text="Loading audio...", fill="white", font=("Consolas", 18), tags="loading")
-        root.update()
-        y, sr = librosa.load(audio_path, sr=None, mono=True, dtype=np.float32)
+    global beat_times, tempo, sr, audio_wav_path, tracker, stream_player
+    def show_status(text):
         canvas.delete("loading")
-        canvas.create_text(WINDOW_WIDTH//2, WINDOW_HEIGHT//2, text="Analyzing beats...", fill="white", font=("Consolas", 18), tags="loading")
+        canvas.create_text(WINDOW_WIDTH//2, WINDOW_HEIGHT//2, text=text, fill="white", font=("Consolas", 18), tags="loading")
         root.update()
-        onset_env = librosa.onset.onset_strength(y=y, sr=sr)
-        tempo, beat_frames = librosa.beat.beat_track(onset_envelope=onset_env, sr=sr, units='frames')
-        beat_times.clear()
-        beat_times.extend(librosa.frames_to_time(beat_frames, sr=sr))
-        # Convert audio to wav for simpleaudio if needed
-        if not audio_path.lower().endswith(".wav"):
-            tmp_wav = tempfile.NamedTemporaryFile(delete=False, suffix=".wav")
-            y16 = np.int16(np.clip(y, -1, 1) * 32767)
-            sf.write(tmp_wav.name, y16, sr, subtype='PCM_16')
-            audio_wav_path = tmp_wav.name
-        else:
+    try:
+        # Beatmap and decoded WAV come from the cache when this audio was analyzed before
+        show_status("Reading audio...")
+        beatmap = beatmap_cache.load(audio_path)
+        # Not cached: analyze block by block while playing, if the audio can be played without a full decode
+        playable = STREAM_AUDIO_OK or not AUDIO_OK or audio_path.lower().endswith(".wav")
+        if beatmap is None and playable and can_stream(audio_path):
+            show_status("Analyzing beats...")
+            tracker = StreamingBeatTracker.open(audio_path).start()
+            tracker.ready.wait()
+            if tracker.error:
+                raise tracker.error
+            sr = tracker.sr
+            beat_times = tracker.beat_times  # Grows while the track plays
             audio_wav_path = audio_path
-        time.sleep(0.3)
+            if STREAM_AUDIO_OK:
+                stream_player = StreamPlayer(audio_path)
+            canvas.delete("all")
+            return
+        if beatmap is None:
+            beatmap = beatmap_cache.get(audio_path, status=show_status)
+        sr = beatmap.sr
+        tempo = beatmap.tempo
+        beat_times.clear()
+        beat_times.extend(beatmap.beat_times)
+        audio_wav_path = beatmap.wav_path
         canvas.delete("loading")
-        canvas.create_text(WINDOW_WIDTH//2, WINDOW_HEIGHT//2, text=f"Detected {len(beat_times)} beats.\nTempo: {int(tempo)} BPM", fill="white", font=("Consolas", 16))
-        root.update()
-        time.sleep(1)
+        if not beatmap.cached:
+            canvas.create_text(WINDOW_WIDTH//2, WINDOW_HEIGHT//2, text=f"Detected {len(beat_times)} beats.\nTempo: {int(tempo)} BPM", fill="white", font=("Consolas", 16))
+            root.update()
+            time.sleep(1)
         canvas.delete("all")
     except Exception as e:
         messagebox.showerror("Error", f"Failed to analyze audio:\n{e}")
@@ -117,28 +201,128 @@ while analyze_thread.is_alive():
 
 # === Node Class ===
 class Node:
-    def __init__(self, spawn_time):
-        self.spawn_time = spawn_time
+    # Pooled note: its canvas oval is created once and only moved/recolored afterwards
+    def __init__(self):
+        self.item = canvas.create_oval(0, 0, 0, 0, fill=NODE_COLOR, outline="#FFF", width=2, state="hidden", tags="node")
+        self.color = NODE_COLOR
+        canvas.tag_raise("hud")
+
+    def reset(self, beat_time, beat_idx=None, dummy=False):
+        self.beat_time = beat_time  # Song time at which the note is in the hit zone
+        self.beat_idx = beat_idx
         self.x = WINDOW_WIDTH
         self.y = LINE_Y
         self.hit = False
         self.miss = False
+        self.dummy = dummy  # Stress-test node, ignored by scoring
 
-    def update(self, dt, speed):
-        self.x -= speed * dt
+    def update(self, song_time, speed):
+        # Position follows the song clock, so slipped frames never make notes drift from the audio
+        self.x = HIT_ZONE_X + (self.beat_time - song_time) * speed
 
     def draw(self):
-        color = NODE_COLOR if not self.hit else "#64FF64"
+        color = STRESS_COLOR if self.dummy else NODE_COLOR if not self.hit else "#64FF64"
         if self.miss:
             color = "#C04040"
-        canvas.create_oval(
+        if color != self.color:
+            canvas.itemconfigure(self.item, fill=color)
+            self.color = color
+        canvas.coords(
+            self.item,
             self.x - NODE_RADIUS, self.y - NODE_RADIUS,
-            self.x + NODE_RADIUS, self.y + NODE_RADIUS,
-            fill=color, outline="#FFF", width=2
+            self.x + NODE_RADIUS, self.y + NODE_RADIUS
         )
 
+class NodePool:
+    # Recycles Node objects and their canvas items instead of creating new ones per beat
+    def __init__(self):
+        self.free = []
+
+    def acquire(self, beat_time, beat_idx=None, dummy=False):
+        node = self.free.pop() if self.free else Node()
+        node.reset(beat_time, beat_idx, dummy)
+        node.draw()
+        canvas.itemconfigure(node.item, state="normal")
+        return node
+
+    def release(self, node):
+        canvas.itemconfigure(node.item, state="hidden")
+        self.free.append(node)
+
+# === HUD (drawn once, updated only when a value changes) ===
+class HudText:
+    def __init__(self, x, y, text="", **options):
+        self.item = canvas.create_text(x, y, text=text, tags="hud", **options)
+        self.text = text
+        self.fill = options.get("fill")
+
+    def set(self, text, fill=None):
+        if text != self.text:
+            canvas.itemconfigure(self.item, text=text)
+            self.text = text
+        if fill is not None and fill != self.fill:
+            canvas.itemconfigure(self.item, fill=fill)
+            self.fill = fill
+
+class FrameStats:
+    # Frame-time overlay: FPS, frame interval and time spent inside game_loop
+    def __init__(self):
+        self.intervals = deque(maxlen=FPS * 2)
+        self.work = deque(maxlen=FPS * 2)
+        self.last = None
+        self.next_update = 0.0
+
+    def frame(self, started, finished):
+        if self.last is not None:
+            self.intervals.append(started - self.last)
+        self.last = started
+        self.work.append(finished - started)
+
+    def text(self, node_count):
+        if not self.intervals:
+            return ""
+        avg = sum(self.intervals) / len(self.intervals)
+        return (f"{1.0 / avg:5.1f} FPS  frame {avg * 1000:4.1f} ms (max {max(self.intervals) * 1000:4.1f})  "
+                f"loop {sum(self.work) / len(self.work) * 1000:4.1f} ms  nodes {node_count}")
+
+def create_static_scene():
+    # Line, hit zone and help text never change: created once, below the notes
+    canvas.create_line(0, LINE_Y, WINDOW_WIDTH, LINE_Y, fill="#DDD", width=2)
+    canvas.create_rectangle(HIT_ZONE_X-8, LINE_Y-32, HIT_ZONE_X+8, LINE_Y+32, fill="#7CE77C", outline="#50B850", width=2)
+    help_lines = [
+        "Controls:",
+        "Z / X / SPACE - Hit",
+        "UP/DOWN - Change speed",
+        "[ / ] - Latency offset",
+        "F3 - Frame stats",
+        "ESC - Quit"
+    ]
+    for i, line in enumerate(help_lines):
+        canvas.create_text(WINDOW_WIDTH-20, WINDOW_HEIGHT-120 + i*20, anchor="e", text=line, fill="#BBB", font=("Consolas", 11), tags="hud")
+    return {
+        "score": HudText(20, 20, anchor="w", fill="#FFF", font=("Consolas", 18, "bold")),
+        "combo": HudText(20, 50, anchor="w", fill="#FF5050", font=("Consolas", 16, "bold")),
+        "max_combo": HudText(20, 75, anchor="w", fill="#FFD850", font=("Consolas", 12)),
+        "misses": HudText(20, 100, anchor="w", fill="#FF5050", font=("Consolas", 12)),
+        "speed": HudText(WINDOW_WIDTH-20, 20, anchor="e", fill="#FFF", font=("Consolas", 14)),
+        "tempo": HudText(WINDOW_WIDTH-20, 45, anchor="e", fill="#B0B0FF", font=("Consolas", 14)),
+        "offset": HudText(WINDOW_WIDTH-20, 70, anchor="e", fill="#BBB", font=("Consolas", 11)),
+        "feedback": HudText(WINDOW_WIDTH//2, LINE_Y-60, fill="#64FF64", font=("Consolas", 32, "bold")),
+        "stats": HudText(10, WINDOW_HEIGHT-12, anchor="w", fill="#888", font=("Consolas", 10)),
+    }
+
 # === Game State ===
-nodes = []
+nodes = []          # Nodes on screen, oldest first
+beat_nodes = {}     # Beat index -> its node while on screen
+judged = set()      # Beats already hit, from next_miss_idx on
+next_miss_idx = 0   # Beats before it are judged (hit or missed)
+hit_errors = deque(maxlen=32)  # Recent hit errors in ms, shown to help calibrate the offset
+latency_offset = cli_args.offset
+node_pool = NodePool()
+frame_stats = FrameStats()
+show_stats = True
+next_deadline = 0.0
+next_stress_time = 0.0
 next_beat_idx = 0
 speed = 220.0
 score = 0
@@ -146,57 +330,100 @@ combo = 0
 max_combo = 0
 misses = 0
 feedback = ""
-feedback_timer = 0
+feedback_color = "#64FF64"
+feedback_until = 0.0
 game_started = False
-start_time = 0
+clock_start = None  # perf_counter at song time 0, used when there is no sample clock
+last_song_time = 0.0
 audio_playing = False
 
 # === Audio Playback (tkinter-only, no pygame) ===
-try:
-    import simpleaudio as sa
-    AUDIO_OK = True
-except ImportError:
-    AUDIO_OK = False
-
 def play_audio():
     global audio_playing
-    if AUDIO_OK:
+    if stream_player is not None:
+        try:
+            stream_player.start()
+            audio_playing = True
+        except Exception as e:
+            messagebox.showinfo("Audio", f"Audio playback failed: {e}")
+    elif AUDIO_OK:
         try:
             # Wait until audio_wav_path is ready and file exists
             while not audio_wav_path or not os.path.exists(audio_wav_path):
                 time.sleep(0.01)
             wave_obj = sa.WaveObject.from_wave_file(audio_wav_path)
-            audio_playing = True
             wave_obj.play()
+            restart_clock()
+            audio_playing = True
         except Exception as e:
             messagebox.showinfo("Audio", f"Audio playback failed: {e}")
     else:
-        messagebox.showinfo("Audio", "simpleaudio not installed, no sound will play.")
+        messagebox.showinfo("Audio", "Neither sounddevice nor simpleaudio is installed, no sound will play.")
+
+# === Song Clock ===
+def restart_clock():
+    global clock_start
+    clock_start = time.perf_counter()
+
+def song_time():
+    # Playback position in seconds, read from the audio device's sample clock when streaming,
+    # otherwise perf_counter since playback started; never integrated from frame times
+    global last_song_time
+    t = stream_player.time() if stream_player is not None and audio_playing else None
+    if t is None:
+        t = time.perf_counter() - clock_start
+    last_song_time = max(last_song_time, t)  # The clock never runs backwards
+    return last_song_time
+
+def set_feedback(text, color):
+    global feedback, feedback_color, feedback_until
+    feedback = text
+    feedback_color = color
+    feedback_until = time.perf_counter() + 0.5
+
+def register_miss():
+    global combo, misses
+    combo = 0
+    misses += 1
+    set_feedback("Miss!", "#FF5050")
+
+def judge_press(press_time):
+    # Nearest unjudged beat within the widest window, found by binary search over beat_times
+    global score, combo, max_combo
+    window = MISS_WINDOW_MS / 1000.0
+    lo = max(bisect.bisect_left(beat_times, press_time - window), next_miss_idx)
+    hi = bisect.bisect_right(beat_times, press_time + window)
+    candidates = [i for i in range(lo, hi) if i not in judged]
+    if not candidates:
+        register_miss()
+        return
+    idx = min(candidates, key=lambda i: abs(beat_times[i] - press_time))
+    error_ms = (press_time - beat_times[idx]) * 1000.0
+    label, _, points, color = next(w for w in HIT_WINDOWS if abs(error_ms) <= w[1])
+    judged.add(idx)
+    hit_errors.append(error_ms)
+    score += points
+    combo += 1
+    max_combo = max(max_combo, combo)
+    set_feedback(label, color)
+    node = beat_nodes.get(idx)
+    if node is not None:
+        node.hit = True
 
 # === Controls ===
 def on_key(event):
-    global speed, combo, max_combo, misses, score, feedback, feedback_timer
+    global speed, latency_offset
     if event.keysym in ("Up", "w"):
         speed += 30
     elif event.keysym in ("Down", "s"):
         speed = max(50, speed - 30)
     elif event.keysym in ("z", "x", "space"):
-        hit_this = False
-        for node in nodes:
-            if not node.hit and not node.miss and abs(node.x - HIT_ZONE_X) < NODE_RADIUS + 10:
-                node.hit = True
-                score += 100
-                combo += 1
-                max_combo = max(max_combo, combo)
-                feedback = "Great!"
-                feedback_timer = 0.5
-                hit_this = True
-                break
-        if not hit_this:
-            combo = 0
-            misses += 1
-            feedback = "Miss!"
-            feedback_timer = 0.5
+        # Calibrated press time: subtracts the player's input/audio latency
+        judge_press(song_time() - latency_offset / 1000.0)
+    elif event.keysym == "bracketleft":
+        latency_offset -= OFFSET_STEP_MS
+    elif event.keysym == "bracketright":
+        latency_offset += OFFSET_STEP_MS
     elif event.keysym == "Escape":
         root.destroy()
 
@@ -204,80 +431,101 @@ root.bind("<Key>", on_key)
 
 # === Main Game Loop ===
 def game_loop():
-    global next_beat_idx, feedback, feedback_timer, start_time, game_started
+    global next_beat_idx, next_miss_idx, feedback, game_started, tempo, next_deadline, next_stress_time
 
-    now = time.time()
+    loop_started = time.perf_counter()
     if not game_started:
-        start_time = now
-        if AUDIO_OK:
-            threading.Thread(target=play_audio, daemon=True).start()
+        restart_clock()
+        next_deadline = loop_started
+        threading.Thread(target=play_audio, daemon=True).start()
         game_started = True
 
-    dt = 1.0 / FPS
-    current_time = now - start_time
+    current_time = song_time()
+    # Seconds a note needs from the right edge to the hit zone
+    lead_time = (WINDOW_WIDTH + NODE_RADIUS - HIT_ZONE_X) / speed
+    if tracker is not None:
+        # Streaming analysis runs a bounded distance ahead of the notes being spawned
+        tracker.advance(current_time + lead_time)
+        tempo = tracker.tempo
 
-    # Spawn nodes
-    while next_beat_idx < len(beat_times) and beat_times[next_beat_idx] <= current_time:
-        nodes.append(Node(beat_times[next_beat_idx]))
+    # Spawn nodes early enough to reach the hit zone on their beat
+    while next_beat_idx < len(beat_times) and beat_times[next_beat_idx] <= current_time + lead_time:
+        node = node_pool.acquire(beat_times[next_beat_idx], next_beat_idx)
+        nodes.append(node)
+        beat_nodes[next_beat_idx] = node
         next_beat_idx += 1
+    if STRESS_NODES:
+        # Enough extra notes to keep about STRESS_NODES of them on screen
+        interval = (WINDOW_WIDTH + NODE_RADIUS * 2) / speed / STRESS_NODES
+        while next_stress_time <= current_time + lead_time:
+            nodes.append(node_pool.acquire(next_stress_time, dummy=True))
+            next_stress_time += interval
+
+    # Beats past the miss window that were never hit
+    late = current_time - latency_offset / 1000.0 - MISS_WINDOW_MS / 1000.0
+    while next_miss_idx < len(beat_times) and beat_times[next_miss_idx] < late:
+        if next_miss_idx in judged:
+            judged.discard(next_miss_idx)
+        else:
+            register_miss()
+            node = beat_nodes.get(next_miss_idx)
+            if node is not None:
+                node.miss = True
+        next_miss_idx += 1
 
     # Update nodes
     for node in nodes:
-        node.update(dt, speed)
-        if not node.hit and not node.miss and node.x < HIT_ZONE_X - NODE_RADIUS:
-            node.miss = True
-            global combo, misses
-            combo = 0
-            misses += 1
-            feedback = "Miss!"
-            feedback_timer = 0.5
-
-    # Remove nodes that are far left
-    nodes[:] = [n for n in nodes if n.x > -NODE_RADIUS*2 or not n.hit]
-
-    # Drawing
-    canvas.delete("all")
-    # Draw line
-    canvas.create_line(0, LINE_Y, WINDOW_WIDTH, LINE_Y, fill="#DDD", width=2)
-    # Draw hit zone
-    canvas.create_rectangle(HIT_ZONE_X-8, LINE_Y-32, HIT_ZONE_X+8, LINE_Y+32, fill="#7CE77C", outline="#50B850", width=2)
-    # Draw nodes
+        node.update(current_time, speed)
+
+    # Recycle nodes that left the screen
+    if nodes and nodes[0].x <= -NODE_RADIUS*2:
+        for node in nodes:
+            if node.x <= -NODE_RADIUS*2:
+                node_pool.release(node)
+                beat_nodes.pop(node.beat_idx, None)
+        nodes[:] = [n for n in nodes if n.x > -NODE_RADIUS*2]
+
+    # Drawing: only moves/updates the existing canvas items
     for node in nodes:
         node.draw()
-    # Draw score, combo, etc.
-    canvas.create_text(20, 20, anchor="w", text=f"Score: {score}", fill="#FFF", font=("Consolas", 18, "bold"))
-    canvas.create_text(20, 50, anchor="w", text=f"Combo: {combo}", fill="#FFD850" if combo > 0 else "#FF5050", font=("Consolas", 16, "bold"))
-    canvas.create_text(20, 75, anchor="w", text=f"Max Combo: {max_combo}", fill="#FFD850", font=("Consolas", 12))
-    canvas.create_text(20, 100, anchor="w", text=f"Misses: {misses}", fill="#FF5050", font=("Consolas", 12))
-    canvas.create_text(WINDOW_WIDTH-20, 20, anchor="e", text=f"Speed: {int(speed)} px/s", fill="#FFF", font=("Consolas", 14))
-    canvas.create_text(WINDOW_WIDTH-20, 45, anchor="e", text=f"Tempo: {int(tempo)} BPM", fill="#B0B0FF", font=("Consolas", 14))
+    hud["score"].set(f"Score: {score}")
+    hud["combo"].set(f"Combo: {combo}", "#FFD850" if combo > 0 else "#FF5050")
+    hud["max_combo"].set(f"Max Combo: {max_combo}")
+    hud["misses"].set(f"Misses: {misses}")
+    hud["speed"].set(f"Speed: {int(speed)} px/s")
+    hud["tempo"].set(f"Tempo: {int(tempo)} BPM")
+    avg_error = f"  (avg hit {sum(hit_errors) / len(hit_errors):+.0f} ms)" if hit_errors else ""
+    hud["offset"].set(f"Offset: {latency_offset:+.0f} ms{avg_error}")
 
     # Feedback
-    if feedback and feedback_timer > 0:
-        fb_color = "#64FF64" if feedback == "Great!" else "#FF5050"
-        canvas.create_text(WINDOW_WIDTH//2, LINE_Y-60, text=feedback, fill=fb_color, font=("Consolas", 32, "bold"))
-        feedback_timer -= dt
-        if feedback_timer <= 0:
-            feedback = ""
-
-    # Controls help
-    help_lines = [
-        "Controls:",
-        "Z / X / SPACE - Hit",
-        "UP/DOWN - Change speed",
-        "ESC - Quit"
-    ]
-    for i, line in enumerate(help_lines):
-        canvas.create_text(WINDOW_WIDTH-20, WINDOW_HEIGHT-80 + i*20, anchor="e", text=line, fill="#BBB", font=("Consolas", 11))
+    if feedback and loop_started < feedback_until:
+        hud["feedback"].set(feedback, feedback_color)
+    else:
+        feedback = ""
+        hud["feedback"].set("")
+
+    # Frame-time overlay (text refreshed 4 times per second)
+    finished = time.perf_counter()
+    frame_stats.frame(loop_started, finished)
+    if show_stats and finished >= frame_stats.next_update:
+        hud["stats"].set(frame_stats.text(len(nodes)))
+        frame_stats.next_update = finished + 0.25
 
-    root.after(int(1000/FPS), game_loop)
+    # Next frame on a fixed 1/FPS grid, so the loop's own work does not lower the frame rate
+    next_deadline = max(next_deadline + 1.0 / FPS, finished)
+    root.after(max(1, int(round((next_deadline - time.perf_counter()) * 1000))), game_loop)
 
+def toggle_stats(event=None):
+    global show_stats
+    show_stats = not show_stats
+    hud["stats"].set("")
+
+hud = create_static_scene()
+root.bind("<F3>", toggle_stats)
 game_loop()
 root.mainloop()
 
-# Clean up temp wav file if created
-if audio_wav_path and audio_wav_path != audio_path:
-    try:
-        os.remove(audio_wav_path)
-    except Exception:
-        pass
+if tracker is not None:
+    tracker.stop()
+if stream_player is not None:
+    stream_player.close()
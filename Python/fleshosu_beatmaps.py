@@ -0,0 +1,360 @@
+# -----------------------------------------------------------------------------
+# FleshOsu! - Beatmap Cache
+# -----------------------------------------------------------------------------
+# Precomputed beat analysis for fleshosu.py. A beatmap (beat times, tempo, onset
+# envelope) and the decoded 16-bit PCM WAV are stored under the SHA-1 of the
+# audio file content, so a track that was played (or precomputed) once starts
+# instantly, even if it was renamed or moved. StreamingBeatTracker analyzes an
+# uncached track block by block while it plays.
+#
+# Usage:
+#   python fleshosu_beatmaps.py ~/Music                 # precompute a whole library
+#   python fleshosu_beatmaps.py song.mp3 -j 4 --force   # re-analyze with 4 processes
+# -----------------------------------------------------------------------------
+import argparse
+import hashlib
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+AUDIO_EXTENSIONS = (".wav", ".mp3", ".ogg", ".flac", ".m4a", ".aac", ".aiff", ".wma")
+CACHE_DIR = os.environ.get("FLESHOSU_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "fleshosu"))
+HOP_LENGTH = 512
+CACHE_VERSION = 1
+STREAM_BLOCK = 16384            # Samples decoded per block in streaming mode
+STREAM_LOOKAHEAD = 6.0          # Seconds the streaming analysis may run ahead of the playhead
+STREAM_WARMUP = 3.0             # Seconds of audio before the first tempo estimate
+STREAM_ENVELOPE_SECONDS = 8.0   # Onset envelope history used for tempo (fixed-size ring)
+MIN_BPM = 60.0
+MAX_BPM = 200.0
+
+
+def audio_hash(path, chunk_size=1 << 20):
+    # SHA-1 of the file content, read in chunks
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class Beatmap:
+    def __init__(self, beat_times, tempo, onset_env, sr, hop_length, wav_path, cached=False):
+        self.beat_times = beat_times
+        self.tempo = tempo
+        self.onset_env = onset_env
+        self.sr = sr
+        self.hop_length = hop_length
+        self.wav_path = wav_path
+        self.cached = cached  # True when loaded from the cache without analysis
+
+
+def analyze_file(path, hop_length=HOP_LENGTH):
+    # Full analysis of one file: returns (PCM float32, sr, onset envelope, tempo, beat times)
+    import librosa
+    y, sr = librosa.load(path, sr=None, mono=True, dtype=np.float32)
+    onset_env = librosa.onset.onset_strength(y=y, sr=sr, hop_length=hop_length)
+    tempo, beat_frames = librosa.beat.beat_track(onset_envelope=onset_env, sr=sr, hop_length=hop_length, units="frames")
+    beat_times = librosa.frames_to_time(beat_frames, sr=sr, hop_length=hop_length)
+    return y, sr, onset_env.astype(np.float32), float(np.atleast_1d(tempo)[0]), beat_times.astype(np.float64)
+
+
+class BeatmapCache:
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = cache_dir
+
+    def paths(self, key):
+        return os.path.join(self.cache_dir, key + ".npz"), os.path.join(self.cache_dir, key + ".wav")
+
+    def load(self, path, key=None):
+        # Cached beatmap for this file, or None
+        key = key or audio_hash(path)
+        npz_path, wav_path = self.paths(key)
+        if not os.path.exists(npz_path):
+            return None
+        try:
+            with np.load(npz_path) as data:
+                if int(data["version"]) != CACHE_VERSION:
+                    return None
+                if not path.lower().endswith(".wav"):
+                    if not os.path.exists(wav_path):
+                        return None
+                else:
+                    wav_path = path
+                return Beatmap(data["beat_times"], float(data["tempo"]), data["onset_env"],
+                               int(data["sr"]), int(data["hop_length"]), wav_path, cached=True)
+        except Exception as e:
+            print(f"Broken beatmap cache entry {npz_path}: {e}")
+            return None
+
+    def analyze(self, path, key=None, hop_length=HOP_LENGTH):
+        # Analyzes the file and stores the beatmap (and the WAV for non-WAV input)
+        import soundfile as sf
+        key = key or audio_hash(path)
+        npz_path, wav_path = self.paths(key)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        y, sr, onset_env, tempo, beat_times = analyze_file(path, hop_length)
+        if path.lower().endswith(".wav"):
+            wav_path = path
+        else:
+            tmp = f"{wav_path}.{os.getpid()}.tmp"
+            sf.write(tmp, np.int16(np.clip(y, -1, 1) * 32767), sr, subtype="PCM_16", format="WAV")
+            os.replace(tmp, wav_path)
+        # Written under a temporary name and renamed, so a crash never leaves half an entry
+        tmp = f"{npz_path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            np.savez(f, version=CACHE_VERSION, beat_times=beat_times, tempo=tempo, onset_env=onset_env,
+                     sr=sr, hop_length=hop_length, source=os.path.basename(path))
+        os.replace(tmp, npz_path)
+        return Beatmap(beat_times, tempo, onset_env, sr, hop_length, wav_path)
+
+    def get(self, path, status=None):
+        # Cached beatmap, analyzing the file on a miss. status(text) reports progress
+        if status:
+            status("Reading audio...")
+        key = audio_hash(path)
+        beatmap = self.load(path, key)
+        if beatmap is None:
+            if status:
+                status("Analyzing beats...")
+            beatmap = self.analyze(path, key)
+        return beatmap
+
+
+def stream_blocks(path, block_size=STREAM_BLOCK):
+    # Decodes the file block by block (mono float32); only one block is in memory at a time
+    import soundfile as sf
+    for block in sf.blocks(path, blocksize=block_size, dtype="float32", always_2d=True):
+        yield block.mean(axis=1) if block.shape[1] > 1 else block[:, 0]
+
+
+def can_stream(path):
+    try:
+        import soundfile as sf
+        sf.info(path)
+        return True
+    except Exception:
+        return False
+
+
+class StreamingBeatTracker:
+    # Incremental onset/beat detection over decoded blocks, running in its own thread.
+    # Onset strength is spectral flux per hop; the tempo is re-estimated every second from the
+    # autocorrelation of the last few seconds of onset envelope (kept in a fixed ring buffer),
+    # and beats are predicted one period ahead and snapped to the strongest nearby onset.
+    # Analysis stays at most `lookahead` seconds ahead of the playhead (see advance()), so
+    # memory and CPU per second of audio are constant regardless of track length.
+    def __init__(self, blocks, sr, lookahead=STREAM_LOOKAHEAD, n_fft=2048, hop_length=HOP_LENGTH):
+        self.blocks = blocks
+        self.sr = sr
+        self.lookahead = lookahead
+        self.n_fft = n_fft
+        self.hop_length = hop_length
+        self.frame_rate = sr / hop_length
+        self.beat_times = []
+        self.tempo = 0.0
+        self.analyzed_time = 0.0
+        self.finished = False
+        self.error = None
+        self.ready = threading.Event()  # First beats known (or analysis finished)
+        self._playhead = 0.0
+        self._cond = threading.Condition()
+        self._running = False
+        self._thread = None
+        self._window = np.hanning(n_fft).astype(np.float32)
+        self._tail = np.zeros(0, dtype=np.float32)
+        self._prev_spectrum = None
+        self._env = np.zeros(int(STREAM_ENVELOPE_SECONDS * self.frame_rate), dtype=np.float32)
+        self._frames = 0          # Onset frames computed so far
+        self._period = None       # Beat period in frames
+        self._next_beat = None    # Predicted frame of the next beat
+        self._next_tempo_update = int(STREAM_WARMUP * self.frame_rate)
+
+    @classmethod
+    def open(cls, path, **kwargs):
+        import soundfile as sf
+        return cls(stream_blocks(path), sf.info(path).samplerate, **kwargs)
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="beat-tracker", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+
+    def advance(self, playhead):
+        # Called by the game with the current playback time; lets the analysis continue
+        with self._cond:
+            self._playhead = playhead
+            self._cond.notify_all()
+
+    def _run(self):
+        try:
+            for block in self.blocks:
+                with self._cond:
+                    self._cond.wait_for(lambda: not self._running or self.analyzed_time < self._playhead + self.lookahead)
+                    if not self._running:
+                        return
+                self._process(block)
+            self._finish()
+        except Exception as e:
+            self.error = e
+        finally:
+            self.finished = True
+            self.ready.set()
+
+    # --- Onset envelope ---
+
+    def _env_at(self, frames):
+        return self._env[np.asarray(frames) % len(self._env)]
+
+    def _process(self, block):
+        buf = np.concatenate((self._tail, block.astype(np.float32, copy=False)))
+        count = (len(buf) - self.n_fft) // self.hop_length + 1 if len(buf) >= self.n_fft else 0
+        if count > 0:
+            frames = np.lib.stride_tricks.sliding_window_view(buf, self.n_fft)[::self.hop_length][:count]
+            spectrum = np.log1p(100.0 * np.abs(np.fft.rfft(frames * self._window, axis=1)))
+            prev = spectrum[0] if self._prev_spectrum is None else self._prev_spectrum
+            flux = np.diff(np.vstack((prev, spectrum)), axis=0)
+            onset = np.maximum(flux, 0.0).mean(axis=1)
+            self._prev_spectrum = spectrum[-1]
+            idx = np.arange(self._frames, self._frames + count) % len(self._env)
+            self._env[idx] = onset
+            self._frames += count
+            buf = buf[count * self.hop_length:]
+        self._tail = buf
+        self.analyzed_time = self._frames * self.hop_length / self.sr
+        while self._frames >= self._next_tempo_update:
+            self._estimate_tempo()
+            self._next_tempo_update += int(self.frame_rate)
+        self._track(self._frames - 1)
+
+    # --- Tempo and beats ---
+
+    def _recent_envelope(self):
+        length = min(self._frames, len(self._env))
+        start = self._frames - length
+        return start, self._env_at(np.arange(start, self._frames))
+
+    def _estimate_tempo(self):
+        start, env = self._recent_envelope()
+        env = env - env.mean()
+        n = len(env)
+        spectrum = np.fft.rfft(env, 2 * n)
+        ac = np.fft.irfft(spectrum * np.conj(spectrum))[:n]
+        lags = np.arange(int(60.0 * self.frame_rate / MAX_BPM), min(n - 1, int(60.0 * self.frame_rate / MIN_BPM)) + 1)
+        if len(lags) < 3 or ac[0] <= 0:
+            return
+        bpm = 60.0 * self.frame_rate / lags
+        # Log-normal prior around 120 BPM (same idea as librosa's beat tracker)
+        score = ac[lags] * np.exp(-0.5 * np.log2(bpm / 120.0) ** 2)
+        i = int(np.argmax(score))
+        period = float(lags[i])
+        if 0 < i < len(lags) - 1:
+            a, b, c = score[i - 1], score[i], score[i + 1]
+            if a - 2 * b + c < 0:
+                period += 0.5 * (a - c) / (a - 2 * b + c)
+        self._period = period
+        self.tempo = 60.0 * self.frame_rate / period
+        if self._next_beat is None:
+            # Phase: the offset whose beat grid collects the most onset energy in the window
+            steps = np.arange(0, n, period)
+            phases = np.arange(int(period))
+            totals = [env[np.minimum((steps + p).astype(int), n - 1)].sum() for p in phases]
+            self._next_beat = start + float(phases[int(np.argmax(totals))])
+
+    def _track(self, last_frame):
+        # Places every predicted beat whose search window is fully analyzed
+        if self._period is None:
+            return
+        tolerance = max(1, int(0.15 * self._period))
+        while self._next_beat + tolerance <= last_frame:
+            center = int(round(self._next_beat))
+            window = np.arange(max(0, center - tolerance, self._frames - len(self._env)), center + tolerance + 1)
+            if len(window):
+                # Nearby onsets attract the beat; a weak or missing onset keeps the predicted grid
+                weights = np.exp(-0.5 * ((window - self._next_beat) / (tolerance / 2.0)) ** 2)
+                beat = float(window[int(np.argmax(self._env_at(window) * weights))])
+            else:
+                beat = self._next_beat
+            self._emit(beat)
+            self._next_beat = beat + self._period
+
+    def _emit(self, frame):
+        t = (frame * self.hop_length + self.n_fft / 2) / self.sr
+        if not self.beat_times or t > self.beat_times[-1]:
+            self.beat_times.append(t)
+            self.ready.set()
+
+    def _finish(self):
+        if self._period is None and self._frames:
+            self._estimate_tempo()
+        self._track(self._frames - 1)
+
+
+def expand_library(paths):
+    # Audio files from files and folders (searched recursively)
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for dirpath, _, filenames in os.walk(path):
+                files.extend(os.path.join(dirpath, name) for name in sorted(filenames)
+                             if name.lower().endswith(AUDIO_EXTENSIONS))
+        elif os.path.exists(path):
+            files.append(path)
+        else:
+            print(f"Not found: {path}")
+    return list(dict.fromkeys(files))
+
+
+def _precompute_job(path, cache_dir, force):
+    cache = BeatmapCache(cache_dir)
+    started = time.perf_counter()
+    key = audio_hash(path)
+    if not force and cache.load(path, key) is not None:
+        return path, "cached", 0.0, 0
+    beatmap = cache.analyze(path, key)
+    return path, "analyzed", time.perf_counter() - started, len(beatmap.beat_times)
+
+
+def precompute(paths, cache_dir=CACHE_DIR, jobs=None, force=False):
+    files = expand_library(paths)
+    if not files:
+        print("No audio files found.")
+        return 0
+    jobs = jobs or os.cpu_count() or 1
+    print(f"{len(files)} files, {jobs} processes, cache: {cache_dir}")
+    failed = 0
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {pool.submit(_precompute_job, path, cache_dir, force): path for path in files}
+        for done, future in enumerate(as_completed(futures), 1):
+            try:
+                path, state, seconds, beats = future.result()
+                detail = f"{beats} beats, {seconds:.1f}s" if state == "analyzed" else state
+                print(f"[{done}/{len(files)}] {os.path.basename(path)}: {detail}")
+            except Exception as e:
+                failed += 1
+                print(f"[{done}/{len(files)}] {os.path.basename(futures[future])}: failed: {e}")
+    return failed
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Precompute FleshOsu! beatmaps for a music library.")
+    p.add_argument("paths", nargs="+", help="Audio files or folders.")
+    p.add_argument("-j", "--jobs", type=int, default=None, help="Worker processes (default: CPU count).")
+    p.add_argument("--cache-dir", default=CACHE_DIR, help="Beatmap cache folder.")
+    p.add_argument("--force", action="store_true", help="Re-analyze files that are already cached.")
+    return p.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    sys.exit(1 if precompute(args.paths, args.cache_dir, args.jobs, args.force) else 0)